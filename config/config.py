@@ -4,7 +4,7 @@ import yaml
 class Config:
 
     def __init__(self):
-        self.__config_file_path = Path(__file__).parent.parent.parent / 'config.yml'
+        self.__config_file_path = Path(__file__).parent.parent / 'config.yml'
         self.__config_data = self._load_config(self.__config_file_path)
     
     @staticmethod
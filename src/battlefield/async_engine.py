@@ -0,0 +1,178 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from langchain_core.messages import BaseMessage
+
+from config.logging import logger
+from src.pokemon.moves.moves import Moves
+from src.battlefield.battle_engine import DECISION_ERRORS, BattleEngine
+from src.battlefield.battle_pokemon import BattlePokemon
+
+
+class AsyncBattleEngine(BattleEngine):
+    """
+    `BattleEngine` whose LLM calls are awaited (`chain.ainvoke`) instead of blocking a thread, so many battles
+    can share one event loop. Battle rules, policies and the decision cache are the ones of `BattleEngine`.
+
+    Deadlines, hedging with `fallback_llm` and the local `fallback_policy` work as in `BattleEngine`, except that
+    calls that lose the race or miss the deadline are cancelled instead of left running.
+    """
+
+    async def start_ai_battle(self):
+        who_starts, who_follows = self.begin_battle()
+        round_count = 1
+        while True:
+            logger.info(f"Moving to round #{round_count}")
+            if self.simultaneous:
+                moves = await asyncio.gather(
+                    self.achoose_move(who_starts, who_follows), self.achoose_move(who_follows, who_starts)
+                )
+                is_over, who_starts, who_follows = self.run_simultaneous_round(who_starts, who_follows, *moves, round_count)
+                if is_over:
+                    break
+                round_count += 1
+                continue
+            who_starts, who_follows = await self.run_pokemon_turn(who_starts, who_follows)
+            if not who_follows.is_alive:
+                self.end_battle(who_starts, who_follows, round_count)
+                break
+            who_follows, who_starts = await self.run_pokemon_turn(who_follows, who_starts)
+            if not who_starts.is_alive:
+                self.end_battle(who_starts, who_follows, round_count)
+                break
+            is_over, who_starts, who_follows = self.end_round(who_starts, who_follows, round_count)
+            if is_over:
+                break
+            round_count += 1
+
+    async def run_pokemon_turn(self, attacker: BattlePokemon, defender: BattlePokemon) -> List[BattlePokemon]:
+        move = await self.achoose_move(attacker, defender)
+        return self.resolve_move(attacker, defender, move)
+
+    async def achoose_move(self, attacker: BattlePokemon, defender: BattlePokemon) -> Moves:
+        if self.policy_for(attacker) is not None:
+            # Local policies are CPU-bound and fast, nothing to await
+            return self.choose_move(attacker, defender)
+        screened = self.screen_moves(attacker, defender)
+        if screened.move is not None:
+            return screened.move
+        cache_key, move_pick = self.get_cached_decision(attacker, defender, screened.candidates)
+        if move_pick is None:
+            move_pick = await self.arequest_decision(
+                attacker, defender, self.build_prompt(attacker, defender, screened.candidates), screened.candidates
+            )
+            if move_pick is None:
+                move_pick = self.local_fallback(attacker, defender)
+        return self.accept_decision(attacker, move_pick, cache_key)
+
+    async def arequest_decision(self, attacker: BattlePokemon, defender: BattlePokemon, prompt: Dict[str, str],
+                                moves: List[Moves]) -> Any:
+        started = time.perf_counter()
+        if self.llm_timeout is None and self.fallback_llm is None:
+            move_pick = await self.aask_model(attacker, prompt, self.llm, moves)
+        else:
+            move_pick = await self.ahedged_decision(attacker, defender, prompt, moves)
+        self.record_decision_time(started)
+        return move_pick
+
+    async def aask_model(self, attacker: BattlePokemon, prompt: Dict[str, str], llm: Any, moves: List[Moves]) -> Any:
+        feedback: List[BaseMessage] = []
+        started = time.perf_counter()
+        try:
+            for attempt in range(self.max_decision_retries + 1):
+                try:
+                    move_pick = await self.abind_model_response_to_move_name_and_explanation(prompt, feedback, llm)
+                    return self.validate_decision(move_pick, moves)
+                except DECISION_ERRORS as error:
+                    if attempt == self.max_decision_retries:
+                        raise
+                    feedback = self.invalid_decision_feedback(attacker, error, moves)
+        finally:
+            # Failed and cancelled calls count too, so the hedge delay is not biased towards fast answers
+            if llm is self.llm:
+                self.latency_tracker.record(time.perf_counter() - started)
+
+    async def ahedged_decision(self, attacker: BattlePokemon, defender: BattlePokemon, prompt: Dict[str, str],
+                               moves: List[Moves]) -> Any:
+        started = time.perf_counter()
+        deadline = None if self.llm_timeout is None else started + self.llm_timeout
+        hedge_at = None if self.fallback_llm is None else started + self.current_hedge_delay()
+        if hedge_at is not None and deadline is not None and hedge_at >= deadline:
+            hedge_at = None
+        tasks = {asyncio.ensure_future(self.aask_model(attacker, prompt, self.llm, moves)): "primary"}
+        errors: List[BaseException] = []
+        try:
+            while tasks or hedge_at is not None:
+                wake_up = min((moment for moment in (hedge_at, deadline) if moment is not None), default=None)
+                timeout = None if wake_up is None else max(0.0, wake_up - time.perf_counter())
+                done = set()
+                if tasks:
+                    done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    model = tasks.pop(task)
+                    if task.exception() is not None:
+                        logger.warning(f"The {model} model could not decide for {attacker.name.upper()}: {task.exception()!r}")
+                        errors.append(task.exception())
+                        continue
+                    return self.hedge_won(model, task.result())
+                if hedge_at is not None and (time.perf_counter() >= hedge_at or not tasks):
+                    tasks[asyncio.ensure_future(self.aask_model(attacker, prompt, self.fallback_llm, moves))] = "fallback"
+                    self.start_hedge(attacker)
+                    hedge_at = None
+                elif deadline is not None and time.perf_counter() >= deadline:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+        self.missed_deadline(attacker, errors)
+        return None
+
+    async def abind_model_response_to_move_name_and_explanation(self, prompt: Dict[str, str],
+                                                              feedback: Optional[List[BaseMessage]] = None,
+                                                              llm: Any = None) -> Any:
+        chain = self.chain_for(self.llm if llm is None else llm)
+        decision = await chain.ainvoke({**prompt, "feedback": feedback or []}, config={"callbacks": [self.token_usage]})
+        logger.debug("LLM request ran successfully.")
+        return decision
+
+
+@dataclass
+class BattleOutcome:
+    engine: AsyncBattleEngine
+    elapsed: float
+    error: Optional[BaseException] = None
+
+    @property
+    def winner(self) -> Optional[str]:
+        return None if self.engine.winner is None else self.engine.winner.name
+
+
+async def run_battles(engines: Iterable[AsyncBattleEngine],
+                      max_concurrency: int = 32,
+                      battle_timeout: Optional[float] = None) -> List[BattleOutcome]:
+    """
+    Run battles concurrently on the current event loop, at most `max_concurrency` at a time.
+
+    A battle that fails or exceeds `battle_timeout` seconds is reported in its `BattleOutcome.error`
+    without affecting the others. Outcomes are returned in the order of `engines`.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(engine: AsyncBattleEngine) -> BattleOutcome:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(engine.start_ai_battle(), battle_timeout)
+            except Exception as error:
+                logger.warning(f"Battle between {engine.user_pokemon.name} and {engine.foe_pokemon.name} failed: {error!r}")
+                return BattleOutcome(engine, time.perf_counter() - started, error)
+            return BattleOutcome(engine, time.perf_counter() - started)
+
+    return list(await asyncio.gather(*(run_one(engine) for engine in engines)))
+
+
+def run_battles_sync(engines: Iterable[AsyncBattleEngine], **kwargs: Any) -> List[BattleOutcome]:
+    """`run_battles` for callers without an event loop."""
+    return asyncio.run(run_battles(engines, **kwargs))
@@ -1,9 +1,15 @@
 
-from typing import List, Any
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ThreadPoolExecutor, wait
+from typing import Dict, List, Any, Optional, Tuple
 
-import numpy as np
 from pydantic import BaseModel, Field
-from langchain_core.prompts import ChatPromptTemplate
+from pydantic import ValidationError
+from langchain_core.messages import BaseMessage, HumanMessage
+from langchain_core.exceptions import OutputParserException
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_openai.chat_models.base import ChatOpenAI
 from langchain_core.output_parsers import PydanticOutputParser
 
@@ -12,19 +18,124 @@ from src.pokemon.pokemon import Pokemon
 from src.pokemon.moves.moves import Moves
 from src.battlefield.status import NVStatus
 from src.battlefield.battle_pokemon import BattlePokemon
-from src.battlefield.prompts import POKEMON_TRAINER
+from src.battlefield.prompts import (
+    DECISION_FORMAT_REQUEST, DECISION_REQUEST, INVALID_DECISION, POKEMON_TRAINER,
+    TRAINER_BATTLE_SETUP, TRAINER_CANDIDATE_MOVES, TRAINER_RULES, TRAINER_TURN_STATE,
+)
+from src.battlefield.policies import MovePolicy
+from src.battlefield.search_trainer import SearchTrainer
+from src.battlefield.rng import BattleRNG, Seed, default_rng
+from src.battlefield.decision_cache import DecisionCache
+from src.battlefield.token_usage import TokenUsageTracker
+from src.battlefield.move_screen import MoveScreener, ScreenResult
+from src.battlefield.hedging import LatencyTracker
+from src.battlefield.history import SEPARATOR, HistoryLog, approximate_tokens, render_round
+
+
+class UnknownMoveError(ValueError):
+    """Raised when a decision names a move the pokemon does not know."""
+
+
+class MoveDecision(BaseModel):
+    move: str = Field(description="The exact name of the move to use")
+    explanation: str = Field(description="Clear tactical reason for choosing this move")
+
+
+class FallbackDecision(MoveDecision):
+    """
+    Decision not made by the primary model: the fallback model's answer, or the local `fallback_policy`'s pick when
+    no model answered in time. Never cached, since the cache stands for what the primary model would say.
+    """
+
+
+PROMPT_LAYOUTS = ("classic", "cached")
+
+# Answers worth asking the model again for; anything else (network errors, timeouts) is raised right away
+DECISION_ERRORS = (OutputParserException, ValidationError, UnknownMoveError)
 
 
 class BattleEngine:
     def __init__(self, user_pokemon: Pokemon | BattlePokemon,
                  foe_pokemon: Pokemon | BattlePokemon,
-                 llm: ChatOpenAI | Any) -> None:
+                 llm: ChatOpenAI | Any = None,
+                 policy: Optional[MovePolicy] = None,
+                 foe_policy: Optional[MovePolicy] = None,
+                 max_rounds: Optional[int] = None,
+                 seed: Seed = None,
+                 decision_cache: Optional[DecisionCache] = None,
+                 simultaneous: bool = False,
+                 history_token_budget: Optional[int] = None,
+                 max_decision_retries: int = 2,
+                 prompt_layout: str = "classic",
+                 move_screener: Optional[MoveScreener] = None,
+                 llm_timeout: Optional[float] = None,
+                 fallback_llm: Any = None,
+                 hedge_delay: Optional[float] = None,
+                 fallback_policy: Optional[MovePolicy] = None,
+                 latency_tracker: Optional[LatencyTracker] = None) -> None:
+        """
+        Moves are chosen by `policy` when one is given (headless battles), otherwise by `llm`.
+        `foe_policy`, if given, picks the foe's moves instead (e.g. an LLM trainer against a `SearchTrainer`).
+        `max_rounds` ends the battle without a winner once reached (a draw), e.g. when neither side can deal damage.
+        Every roll comes from the battle's own `BattleRNG`, so the same `seed` (and moves) replays the same battle.
+        `decision_cache` reuses earlier LLM decisions for equivalent situations instead of calling the model again.
+        `simultaneous` makes both trainers pick their moves at the same time from the pre-round state (LLM calls run
+        in parallel); moves then resolve by `Moves.priority` and, on equal priority, by speed. A `SearchTrainer` plans
+        for a known turn order, so it cannot be used in simultaneous rounds.
+        `history_token_budget` caps each pokemon's battle history in the prompt: recent rounds stay verbatim, older
+        ones are summarized. The approximate size of every prompt sent is recorded in `prompt_tokens`.
+        An LLM answer that cannot be parsed or names an unknown move is asked again, with the list of valid moves,
+        up to `max_decision_retries` times before the error is raised.
+        `prompt_layout="cached"` puts the rules and everything fixed for the battle (species, base stats, moves) in a
+        system message that stays identical every turn and sends only the current state after it, so providers can
+        serve the prefix from their prompt cache. Reported cached/uncached input tokens are kept in `token_usage`.
+        `move_screener` answers obvious turns without the LLM and narrows the others down to the best candidates.
+        Tail latency: `llm_timeout` is the deadline in seconds for one decision. With a `fallback_llm`, a second,
+        hedged request goes to it once the first has taken `hedge_delay` seconds (by default the p95 latency seen by
+        `latency_tracker`), unless that is already past the deadline, and the first valid answer wins; the losing call
+        is not retried. When no model answers before the deadline,
+        `fallback_policy` (ideally deterministic, e.g. `greedy_policy`) picks the move; without one the error is raised.
+        """
+        if llm is None and policy is None:
+            raise ValueError("BattleEngine needs either an llm or a move-selection policy")
+        if prompt_layout not in PROMPT_LAYOUTS:
+            raise ValueError(f"Unknown prompt layout '{prompt_layout}', choose one of: {', '.join(PROMPT_LAYOUTS)}")
+        if simultaneous and any(isinstance(p, SearchTrainer) for p in (policy, foe_policy, fallback_policy)):
+            raise ValueError("SearchTrainer needs to know who moves first and cannot pick moves in simultaneous rounds")
         self.user_pokemon = BattlePokemon.from_pokemon_class(user_pokemon) if isinstance(user_pokemon, Pokemon) else user_pokemon
         self.foe_pokemon = BattlePokemon.from_pokemon_class(foe_pokemon) if isinstance(foe_pokemon, Pokemon) else foe_pokemon
         if self.user_pokemon.name == self.foe_pokemon.name:
             self.user_pokemon.name += " 1"
             self.foe_pokemon.name += " 2"
         self.llm = llm
+        self.policy = policy
+        self.foe_policy = foe_policy
+        self.max_rounds = max_rounds
+        self.rng = BattleRNG(seed)
+        self.decision_cache = decision_cache
+        self.simultaneous = simultaneous
+        self.history_token_budget = history_token_budget
+        self.history_logs: Dict[str, HistoryLog] = {}
+        self.prompt_tokens: List[int] = []
+        self.max_decision_retries = max_decision_retries
+        self.decision_retries = 0
+        self._decision_chains: Dict[int, Any] = {}
+        self.prompt_layout = prompt_layout
+        self.token_usage = TokenUsageTracker()
+        self._battle_setups: Dict[str, str] = {}
+        self.move_screener = move_screener
+        self.llm_timeout = llm_timeout
+        self.fallback_llm = fallback_llm
+        self.hedge_delay = hedge_delay
+        self.fallback_policy = fallback_policy
+        self.latency_tracker = latency_tracker or LatencyTracker()
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        self.local_fallbacks = 0
+        # LLM decisions run on worker threads (simultaneous rounds, hedged calls): guards the counters and chains
+        self._lock = threading.Lock()
+        self.winner: Optional[BattlePokemon] = None
+        self.rounds_played = 0
 
     def start_battle(self):
         # TODO
@@ -33,6 +144,83 @@ class BattleEngine:
 
         
     def start_ai_battle(self):
+        who_starts, who_follows = self.begin_battle()
+        round_count = 1
+        while True:
+            logger.info(f"Moving to round #{round_count}")
+            if self.simultaneous:
+                moves = self.choose_moves_simultaneously(who_starts, who_follows)
+                is_over, who_starts, who_follows = self.run_simultaneous_round(who_starts, who_follows, *moves, round_count)
+                if is_over:
+                    break
+                round_count += 1
+                continue
+            # First pokemon runs its turn
+            who_starts, who_follows = self.run_pokemon_turn(who_starts, who_follows)
+            if not who_follows.is_alive:
+                self.end_battle(who_starts, who_follows, round_count)
+                break
+            # Second pokemon runs its turn
+            who_follows, who_starts = self.run_pokemon_turn(who_follows, who_starts)
+            if not who_starts.is_alive:
+                self.end_battle(who_starts, who_follows, round_count)
+                break
+            is_over, who_starts, who_follows = self.end_round(who_starts, who_follows, round_count)
+            if is_over:
+                break
+            round_count += 1
+
+    def choose_moves_simultaneously(self, who_starts: BattlePokemon, who_follows: BattlePokemon) -> Tuple[Moves, Moves]:
+        """Both trainers' moves for this round, decided from the same state; pending LLM calls run in parallel."""
+        pairs = ((who_starts, who_follows), (who_follows, who_starts))
+        moves: List[Optional[Moves]] = [None, None]
+        pending = {}
+        for index, (attacker, defender) in enumerate(pairs):
+            if self.policy_for(attacker) is not None:
+                moves[index] = self.choose_move(attacker, defender)
+                continue
+            screened = self.screen_moves(attacker, defender)
+            if screened.move is not None:
+                moves[index] = screened.move
+                continue
+            cache_key, move_pick = self.get_cached_decision(attacker, defender, screened.candidates)
+            if move_pick is not None:
+                moves[index] = self.accept_decision(attacker, move_pick)
+            else:
+                pending[index] = (cache_key, self.build_prompt(attacker, defender, screened.candidates), screened.candidates)
+        if pending:
+            with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+                futures = {
+                    index: pool.submit(self.request_decision, *pairs[index], message, candidates)
+                    for index, (_, message, candidates) in pending.items()
+                }
+            for index, future in futures.items():
+                move_pick = future.result()
+                if move_pick is None:
+                    move_pick = self.local_fallback(*pairs[index])
+                moves[index] = self.accept_decision(pairs[index][0], move_pick, pending[index][0])
+        return moves[0], moves[1]
+
+    def run_simultaneous_round(self, who_starts: BattlePokemon, who_follows: BattlePokemon,
+                               starts_move: Moves, follows_move: Moves,
+                               round_count: int) -> Tuple[bool, BattlePokemon, BattlePokemon]:
+        """Resolve two already chosen moves: higher priority first, the faster pokemon (`who_starts`) on ties."""
+        first, second, first_move, second_move = who_starts, who_follows, starts_move, follows_move
+        if follows_move.priority > starts_move.priority:
+            first, second, first_move, second_move = who_follows, who_starts, follows_move, starts_move
+            logger.info(f"{first.name.upper()} moves first thanks to the priority of '{first_move.name}'")
+        first, second = self.resolve_move(first, second, first_move)
+        if not second.is_alive:
+            self.end_battle(first, second, round_count)
+            return True, who_starts, who_follows
+        second, first = self.resolve_move(second, first, second_move)
+        if not first.is_alive:
+            self.end_battle(first, second, round_count)
+            return True, who_starts, who_follows
+        return self.end_round(who_starts, who_follows, round_count)
+
+    def begin_battle(self) -> List[BattlePokemon]:
+        """Announce the battle, record round 0 and return (who_starts, who_follows)."""
         logger.info("Battle has started!")
         logger.info(f"Battle is between {self.user_pokemon.name.upper()} and {self.foe_pokemon.name.upper()}")
         logger.info(
@@ -50,33 +238,30 @@ class BattleEngine:
         who_starts = self.user_pokemon if self.user_pokemon.stats.speed > self.foe_pokemon.stats.speed else self.foe_pokemon
         who_follows =  self.user_pokemon if self.user_pokemon.stats.speed <= self.foe_pokemon.stats.speed else self.foe_pokemon
         logger.info(f"{who_starts.name.upper()} moves first")
+        logger.debug(f"Battle RNG entropy: {self.rng.entropy}, spawn key: {self.rng.seed_sequence.spawn_key}")
         self.update_history(self.user_pokemon, self.foe_pokemon, n_rounds=0)
-        round_count = 1
-        while True:
-            logger.info(f"Moving to round #{round_count}")
-            # First pokemon runs its turn
-            who_starts, who_follows = self.run_pokemon_turn(who_starts, who_follows)
-            if not who_follows.is_alive:
-                self.end_battle(who_starts, who_follows, round_count)
-                break
-            # Second pokemon runs its turn
-            who_follows, who_starts = self.run_pokemon_turn(who_follows, who_starts)
-            if not who_starts.is_alive:
-                self.end_battle(who_starts, who_follows, round_count)
-                break
-            # Execute condition consequences
-            who_starts, who_follows = self.execute_status_consequences(who_starts, who_follows)
-            if not who_starts.is_alive or not who_follows.is_alive:
-                self.end_battle(who_starts, who_follows, round_count)
-                break
-            who_starts, who_follows = self.update_status_condition(who_starts, who_follows)
-            who_starts, who_follows = self.update_who_starts_first(who_starts, who_follows)
-            logger.info(
-                f"End of round - {self.user_pokemon.name.upper()} has {self.user_pokemon.current_hp} HP left "
-                f"and {self.foe_pokemon.name.upper()} has {self.foe_pokemon.current_hp} HP left"
-            )
-            who_starts, who_follows = self.update_history(who_starts, who_follows, n_rounds=round_count)
-            round_count += 1
+        return who_starts, who_follows
+
+    def end_round(self, who_starts: BattlePokemon, who_follows: BattlePokemon, round_count: int) -> Tuple[bool, BattlePokemon, BattlePokemon]:
+        """Status damage, status recovery and turn order once both pokemon have moved; returns whether the battle is over."""
+        # Execute condition consequences
+        who_starts, who_follows = self.execute_status_consequences(who_starts, who_follows)
+        if not who_starts.is_alive or not who_follows.is_alive:
+            self.end_battle(who_starts, who_follows, round_count)
+            return True, who_starts, who_follows
+        who_starts, who_follows = self.update_status_condition(who_starts, who_follows, rng=self.rng)
+        who_starts, who_follows = self.update_who_starts_first(who_starts, who_follows)
+        logger.info(
+            f"End of round - {self.user_pokemon.name.upper()} has {self.user_pokemon.current_hp} HP left "
+            f"and {self.foe_pokemon.name.upper()} has {self.foe_pokemon.current_hp} HP left"
+        )
+        who_starts, who_follows = self.update_history(who_starts, who_follows, n_rounds=round_count)
+        if self.max_rounds is not None and round_count >= self.max_rounds:
+            logger.info(f"No winner after {round_count} rounds, the battle ends in a draw")
+            self.assign_pokemons_to_trainers(who_starts, who_follows)
+            self.rounds_played = round_count
+            return True, who_starts, who_follows
+        return False, who_starts, who_follows
     
     def assign_pokemons_to_trainers(self, *args: BattlePokemon) -> None:
         for pkmn in args:
@@ -105,11 +290,12 @@ class BattleEngine:
         return updated_pokemon_list
 
     @staticmethod
-    def update_status_condition(*args: BattlePokemon) -> List[BattlePokemon]:
+    def update_status_condition(*args: BattlePokemon, rng: Optional[BattleRNG] = None) -> List[BattlePokemon]:
+        rng = rng or default_rng()
         updated_pokemon_list = []
         for pkmn in args:
             if pkmn.nvstatus != NVStatus.NONE:
-                reset_conditions = bool(np.random.choice([True, False], p=[.25, .75]))
+                reset_conditions = rng.chance(.25)
                 pkmn.nvstatus = NVStatus.NONE if reset_conditions else pkmn.nvstatus
                 if reset_conditions:
                     logger.info(f"{pkmn.name.upper()} is no longer {pkmn.nvstatus.value}!")
@@ -123,28 +309,290 @@ class BattleEngine:
         name = name.strip().lower()
         move = next((move for move in moves if move.name == name), None)
         if move is None:
-            ValueError("Move returned by LLM does not match with any of the pokemon's moves")
+            raise UnknownMoveError(
+                f"'{name}' does not match any of the moves to choose from ({', '.join(move.name for move in moves)})"
+            )
         return move
     
     def run_pokemon_turn(self, attacker: BattlePokemon, defender: BattlePokemon) -> List[BattlePokemon]:
-        updated_trainer_info = POKEMON_TRAINER.format(
+        move = self.choose_move(attacker, defender)
+        return self.resolve_move(attacker, defender, move)
+
+    def resolve_move(self, attacker: BattlePokemon, defender: BattlePokemon, move: Moves) -> List[BattlePokemon]:
+        defender = attacker.attack(defender, move, self.rng)
+        attacker.moves_used.append(move)
+        return attacker, defender
+
+    def policy_for(self, attacker: BattlePokemon) -> Optional[MovePolicy]:
+        if self.foe_policy is not None and attacker is self.foe_pokemon:
+            return self.foe_policy
+        return self.policy
+
+    def choose_move(self, attacker: BattlePokemon, defender: BattlePokemon) -> Moves:
+        policy = self.policy_for(attacker)
+        if policy is not None:
+            move = policy(attacker, defender, self.rng)
+            logger.info(f"{attacker.name.upper()} has chosen to attack with '{move.name}'")
+            return move
+        screened = self.screen_moves(attacker, defender)
+        if screened.move is not None:
+            return screened.move
+        cache_key, move_pick = self.get_cached_decision(attacker, defender, screened.candidates)
+        if move_pick is None:
+            move_pick = self.request_decision(attacker, defender, self.build_prompt(attacker, defender, screened.candidates),
+                                              screened.candidates)
+            if move_pick is None:
+                move_pick = self.local_fallback(attacker, defender)
+        return self.accept_decision(attacker, move_pick, cache_key)
+
+    def screen_moves(self, attacker: BattlePokemon, defender: BattlePokemon) -> ScreenResult:
+        """The `move_screener` verdict; without a screener every move goes to the LLM."""
+        if self.move_screener is None:
+            return ScreenResult(None, attacker.moves, {})
+        screened = self.move_screener(attacker, defender)
+        if screened.move is not None:
+            logger.info(f"{attacker.name.upper()} has chosen to attack with '{screened.move.name}' (clearly the best move)")
+        return screened
+
+    def request_decision(self, attacker: BattlePokemon, defender: BattlePokemon, prompt: Dict[str, str],
+                         moves: List[Moves]) -> Any:
+        """
+        The LLM's choice among `moves`, within `llm_timeout` and hedged with `fallback_llm` when they are set.
+        None when no model answered in time and `fallback_policy` is to pick instead: it draws from the battle's RNG,
+        so the caller runs `local_fallback` on its own thread.
+        """
+        started = time.perf_counter()
+        if self.llm_timeout is None and self.fallback_llm is None:
+            move_pick = self.ask_model(attacker, prompt, self.llm, moves)
+        else:
+            move_pick = self.hedged_decision(attacker, defender, prompt, moves)
+        self.record_decision_time(started)
+        return move_pick
+
+    def ask_model(self, attacker: BattlePokemon, prompt: Dict[str, str], llm: Any, moves: List[Moves],
+                  stop: Optional[threading.Event] = None) -> Any:
+        """
+        Ask one model for one of `moves`, asking again (up to `max_decision_retries` times) while the answer is invalid.
+        Once `stop` is set, no further attempt is made.
+        """
+        feedback: List[BaseMessage] = []
+        started = time.perf_counter()
+        try:
+            for attempt in range(self.max_decision_retries + 1):
+                if stop is not None and stop.is_set():
+                    raise CancelledError(f"The decision for {attacker.name.upper()} is no longer needed")
+                try:
+                    move_pick = self.bind_model_response_to_move_name_and_explanation(prompt, feedback, llm)
+                    return self.validate_decision(move_pick, moves)
+                except DECISION_ERRORS as error:
+                    if attempt == self.max_decision_retries:
+                        raise
+                    feedback = self.invalid_decision_feedback(attacker, error, moves)
+        finally:
+            # Failures count too, or the hedge delay would only see the fast calls; abandoned calls are recorded
+            # by `hedged_decision` when it gives up on them
+            if llm is self.llm and not (stop is not None and stop.is_set()):
+                self.latency_tracker.record(time.perf_counter() - started)
+
+    def hedged_decision(self, attacker: BattlePokemon, defender: BattlePokemon, prompt: Dict[str, str],
+                        moves: List[Moves]) -> Any:
+        started = time.perf_counter()
+        deadline = None if self.llm_timeout is None else started + self.llm_timeout
+        hedge_at = None if self.fallback_llm is None else started + self.current_hedge_delay()
+        if hedge_at is not None and deadline is not None and hedge_at >= deadline:
+            hedge_at = None
+        # A call in flight cannot be interrupted: the pool is left without waiting and its answer is dropped,
+        # while `stop` keeps the losing calls from retrying
+        stop = threading.Event()
+        pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="llm-hedge")
+        futures = {pool.submit(self.ask_model, attacker, prompt, self.llm, moves, stop): "primary"}
+        errors: List[BaseException] = []
+        try:
+            while futures or hedge_at is not None:
+                wake_up = min((moment for moment in (hedge_at, deadline) if moment is not None), default=None)
+                timeout = None if wake_up is None else max(0.0, wake_up - time.perf_counter())
+                done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED) if futures else (set(), set())
+                for future in done:
+                    model = futures.pop(future)
+                    try:
+                        move_pick = future.result()
+                    except Exception as error:
+                        logger.warning(f"The {model} model could not decide for {attacker.name.upper()}: {error!r}")
+                        errors.append(error)
+                        continue
+                    return self.hedge_won(model, move_pick)
+                if hedge_at is not None and (time.perf_counter() >= hedge_at or not futures):
+                    futures[pool.submit(self.ask_model, attacker, prompt, self.fallback_llm, moves, stop)] = "fallback"
+                    self.start_hedge(attacker)
+                    hedge_at = None
+                elif deadline is not None and time.perf_counter() >= deadline:
+                    break
+        finally:
+            stop.set()
+            if "primary" in futures.values():
+                # Given up on while still running: its latency is at least this long
+                self.latency_tracker.record(time.perf_counter() - started)
+            pool.shutdown(wait=False, cancel_futures=True)
+        self.missed_deadline(attacker, errors)
+        return None
+
+    def current_hedge_delay(self) -> float:
+        return self.hedge_delay if self.hedge_delay is not None else self.latency_tracker.hedge_delay()
+
+    def start_hedge(self, attacker: BattlePokemon) -> None:
+        with self._lock:
+            self.hedged_requests += 1
+        logger.info(f"The decision for {attacker.name.upper()} is slow, also asking the fallback model")
+
+    def hedge_won(self, model: str, move_pick: Any) -> Any:
+        if model != "fallback":
+            return move_pick
+        with self._lock:
+            self.hedge_wins += 1
+        logger.info("The fallback model answered first")
+        return FallbackDecision(move=move_pick.move, explanation=move_pick.explanation)
+
+    def missed_deadline(self, attacker: BattlePokemon, errors: List[BaseException]) -> None:
+        """No model answered in time: raise the last error (or a timeout) unless `fallback_policy` can pick."""
+        if self.fallback_policy is None:
+            if errors:
+                raise errors[-1]
+            raise TimeoutError(f"No LLM decision for {attacker.name.upper()} within {self.llm_timeout} seconds")
+
+    def local_fallback(self, attacker: BattlePokemon, defender: BattlePokemon) -> Any:
+        """The `fallback_policy`'s pick; call it on the battle's thread only, as it draws from the battle's RNG."""
+        with self._lock:
+            self.local_fallbacks += 1
+        move = self.fallback_policy(attacker, defender, self.rng)
+        logger.warning(f"No LLM decision for {attacker.name.upper()} in time, falling back to '{move.name}'")
+        return FallbackDecision(move=move.name, explanation="No model answered before the deadline")
+
+    def record_decision_time(self, started: float) -> None:
+        if self.move_screener is not None:
+            self.move_screener.record_llm_decision(time.perf_counter() - started)
+
+    def validate_decision(self, move_pick: Any, moves: List[Moves]) -> Any:
+        """`move_pick` if it names one of `moves`, the moves the model was asked to choose from."""
+        if move_pick is None:
+            # Structured output yields None when the model does not call the schema tool
+            raise OutputParserException("The answer did not contain a decision")
+        self.get_move_by_name(moves, move_pick.move)
+        return move_pick
+
+    def invalid_decision_feedback(self, attacker: BattlePokemon, error: Exception, moves: List[Moves]) -> List[BaseMessage]:
+        with self._lock:
+            self.decision_retries += 1
+        logger.warning(f"Invalid decision for {attacker.name.upper()}, asking again: {error}")
+        return [HumanMessage(content=INVALID_DECISION.format(
+            error=str(error).splitlines()[0], moves=", ".join(move.name for move in moves)
+        ))]
+
+    def build_prompt(self, attacker: BattlePokemon, defender: BattlePokemon,
+                     moves: Optional[List[Moves]] = None) -> Dict[str, str]:
+        """
+        Inputs of the decision chain: the system message and the per-turn state sent after it.
+        `moves` narrows the choice down to some of the attacker's moves.
+        """
+        if self.prompt_layout == "cached":
+            prompt = {
+                "trainer_message": self.build_battle_setup(attacker, defender),
+                "turn_state": TRAINER_TURN_STATE.format(
+                    user_stats = attacker.stats,
+                    foe_stats = defender.stats,
+                    user_nvstatus = attacker.nvstatus.value,
+                    foe_nvstatus = defender.nvstatus.value,
+                    user_battle_history = self.history_for_llm(attacker),
+                    foe_battle_history = self.history_for_llm(defender),
+                ),
+            }
+            if moves is not None and len(moves) < len(attacker.moves):
+                # The move list is part of the cached prefix, so the narrowing goes with the turn state
+                prompt["turn_state"] += TRAINER_CANDIDATE_MOVES.format(moves=", ".join(move.name for move in moves))
+        else:
+            prompt = {"trainer_message": self.build_trainer_message(attacker, defender, moves), "turn_state": ""}
+        self.prompt_tokens.append(sum(approximate_tokens(text) for text in prompt.values()))
+        logger.debug(f"Prompt for {attacker.name.upper()} is about {self.prompt_tokens[-1]} tokens")
+        return prompt
+
+    def build_battle_setup(self, attacker: BattlePokemon, defender: BattlePokemon) -> str:
+        """Rules plus the attacker's battle constants, rendered once per battle so the text is identical every turn."""
+        if attacker.name not in self._battle_setups:
+            self._battle_setups[attacker.name] = TRAINER_RULES + TRAINER_BATTLE_SETUP.format(
+                user_pokemon = attacker.name,
+                foe_pokemon = defender.name,
+                user_level = attacker.level,
+                foe_level = defender.level,
+                user_types = "/".join(pkmn_type.value for pkmn_type in attacker.types),
+                foe_types = "/".join(pkmn_type.value for pkmn_type in defender.types),
+                user_base_stats = attacker.base_stats,
+                foe_base_stats = defender.base_stats,
+                moves = attacker.moves,
+            )
+        return self._battle_setups[attacker.name]
+
+    def build_trainer_message(self, attacker: BattlePokemon, defender: BattlePokemon,
+                              moves: Optional[List[Moves]] = None) -> str:
+        return POKEMON_TRAINER.format(
             user_pokemon = attacker.name,
             foe_pokemon = defender.name,
             user_stats = attacker.stats,
             foe_stats = defender.stats,
             user_nvstatus = attacker.nvstatus.value,
             foe_nvstatus = defender.nvstatus.value,
-            moves = attacker.moves,
-            user_battle_history = self.format_history_for_llm_natural(attacker.history),
-            foe_battle_history = self.format_history_for_llm_natural(defender.history),
+            moves = attacker.moves if moves is None else moves,
+            user_battle_history = self.history_for_llm(attacker),
+            foe_battle_history = self.history_for_llm(defender),
+        )
+
+    def history_for_llm(self, pkmn: BattlePokemon) -> str:
+        """The pokemon's battle history as prompt text, rendered incrementally and kept within the token budget."""
+        history_log = self.history_logs.get(pkmn.name)
+        if history_log is None:
+            history_log = self.history_logs[pkmn.name] = HistoryLog(self.history_token_budget)
+        history_log.sync(pkmn.history)
+        return history_log.render()
+
+    def get_cached_decision(self, attacker: BattlePokemon, defender: BattlePokemon,
+                            moves: List[Moves]) -> Tuple[Optional[str], Any]:
+        """
+        (cache key, cached decision or None) for a choice among `moves`; the key is None when the engine has no
+        decision cache. A cached move that is not among `moves` counts as a miss.
+        """
+        if self.decision_cache is None:
+            return None, None
+        cache_key = self.decision_cache.key(
+            attacker, defender,
+            round_count=len(attacker.history["Round"]),
+            history=f"{self.history_for_llm(attacker)} | {self.history_for_llm(defender)}"
+            if self.decision_cache.include_history else None,
+            namespace=self.decision_namespace(moves),
         )
-        move_pick = self.bind_model_response_to_move_name_and_explanation(updated_trainer_info, self.llm)
+        move_pick = self.decision_cache.get(cache_key)
+        if move_pick is not None and move_pick.move.strip().lower() not in {move.name for move in moves}:
+            logger.debug(f"Ignoring cached decision '{move_pick.move}', which is not among the moves to choose from")
+            return cache_key, None
+        if move_pick is not None:
+            logger.debug("Reusing a cached decision for an equivalent situation")
+            # Already stored, so it must not be stored again
+            return None, move_pick
+        return cache_key, None
+
+    def decision_namespace(self, moves: List[Moves]) -> str:
+        """Everything besides the battle situation that shapes the model's answer: model, prompt and offered moves."""
+        return json.dumps({
+            "model": str(getattr(self.llm, "model_name", None) or getattr(self.llm, "model", None)),
+            "prompt_layout": self.prompt_layout,
+            "history_token_budget": self.history_token_budget,
+            "moves": sorted(move.name for move in moves),
+        }, sort_keys=True)
+
+    def accept_decision(self, attacker: BattlePokemon, move_pick: Any, cache_key: Optional[str] = None) -> Moves:
         logger.info(f"{attacker.name.upper()} has chosen to attack with '{move_pick.move}'")
         logger.debug(f"Reason: '{move_pick.explanation}'")
         move = self.get_move_by_name(attacker.moves, move_pick.move)
-        defender = attacker.attack(defender, move)
-        attacker.moves_used.append(move)
-        return attacker, defender
+        if cache_key is not None and not isinstance(move_pick, FallbackDecision):
+            self.decision_cache.put(cache_key, move_pick.move, move_pick.explanation)
+        return move
 
     @staticmethod
     def execute_status_consequences(*args: BattlePokemon) -> List[BattlePokemon]:
@@ -167,31 +615,52 @@ class BattleEngine:
             logger.info(f"{now_second_place.name.upper()} now moves second! {who_follows.name.upper()} moves first.")
         return who_starts, who_follows
     
-    @staticmethod
-    def bind_model_response_to_move_name_and_explanation(triner_message: str, llm: ChatOpenAI) -> Any:
-
-        class MoveDecision(BaseModel):
-            move: str = Field(description="The exact name of the move to use")
-            explanation: str = Field(description="Clear tactical reason for choosing this move")
-
-        parser = PydanticOutputParser(pydantic_object=MoveDecision)
-        
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                ("system", triner_message),
-                ("human", """You MUST respond with valid JSON that matches this schema:
-                            {format_instructions}
-
-                            Your response must contain ONLY the JSON object, nothing else.
-                            """.strip()),
-            ]
+    def bind_model_response_to_move_name_and_explanation(self, prompt: Dict[str, str],
+                                                         feedback: Optional[List[BaseMessage]] = None,
+                                                         llm: Any = None) -> Any:
+        decision = self.chain_for(self.llm if llm is None else llm).invoke(
+            {**prompt, "feedback": feedback or []}, config={"callbacks": [self.token_usage]}
         )
-        chain = prompt | llm | parser
-        decision = chain.invoke({"format_instructions": parser.get_format_instructions()})
         logger.debug("LLM request ran successfully.")
         
         return decision
-        
+
+    @property
+    def decision_chain(self) -> Any:
+        """The engine's decision chain, built on first use and reused for every turn."""
+        return self.chain_for(self.llm)
+
+    def chain_for(self, llm: Any) -> Any:
+        with self._lock:
+            if id(llm) not in self._decision_chains:
+                self._decision_chains[id(llm)] = self.build_decision_chain(llm)
+            return self._decision_chains[id(llm)]
+
+    @staticmethod
+    def build_decision_chain(llm: ChatOpenAI) -> Any:
+        """
+        Chain from {"trainer_message", "turn_state", "feedback"} to a `MoveDecision`. Uses the model's native structured output
+        (tool calling / JSON schema) when it has one, otherwise JSON format instructions and a `PydanticOutputParser`.
+        """
+        try:
+            structured_llm = llm.with_structured_output(MoveDecision)
+        except NotImplementedError:
+            structured_llm = None
+        if structured_llm is not None:
+            prompt = ChatPromptTemplate.from_messages([
+                ("system", "{trainer_message}"),
+                ("human", "{turn_state}" + DECISION_REQUEST),
+                MessagesPlaceholder("feedback", optional=True),
+            ])
+            return prompt | structured_llm
+
+        parser = PydanticOutputParser(pydantic_object=MoveDecision)
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", "{trainer_message}"),
+            ("human", "{turn_state}" + DECISION_FORMAT_REQUEST),
+            MessagesPlaceholder("feedback", optional=True),
+        ]).partial(format_instructions=parser.get_format_instructions())
+        return prompt | llm | parser
 
     def end_battle(self, who_starts: BattlePokemon, who_follows: BattlePokemon, n_rounds: int) -> None:
         winner = who_starts if who_starts.is_alive else who_follows
@@ -200,19 +669,12 @@ class BattleEngine:
         logger.info(f"{winner.name.upper()} wins!")
         self.update_history(who_starts, who_follows, n_rounds=n_rounds)
         self.assign_pokemons_to_trainers(who_starts, who_follows)
+        self.winner = winner
+        self.rounds_played = n_rounds
         logger.info(f"Battle has concluded")
 
     @staticmethod
     def format_history_for_llm_natural(history_dict):
         """Format as natural language narrative."""
         num_rounds = len(next(iter(history_dict.values())))
-        
-        narrative = []
-        for i in range(num_rounds):
-            parts = [f"Round {i}:"]
-            for key, values in history_dict.items():
-                if key != 'Round':
-                    parts.append(f"{key} was {values[i]}")
-            narrative.append(", ".join(parts) + ".")
-        
-        return " || ".join(narrative)
+        return SEPARATOR.join(render_round(history_dict, i) for i in range(num_rounds))
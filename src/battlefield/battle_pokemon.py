@@ -1,9 +1,12 @@
-import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from pydantic import Field
 
 from src.pokemon.pokemon import Pokemon
+from src.pokemon.stats import Stats
 from src.pokemon.moves.moves import Moves
 from src.battlefield.status import NVStatus, VStatus
+from src.battlefield.rng import BattleRNG, default_rng
 from src.pokemon.moves.effectiveness import effectiveness
 from config.logging import logger
 
@@ -13,14 +16,14 @@ class BattlePokemon(Pokemon):
     nvstatus: NVStatus = NVStatus.NONE
     vstatus: VStatus = VStatus.NONE
     _is_alive: bool = True
-    moves_used: List[Moves] = []
-    history: Dict[str, List] = {}
+    moves_used: List[Moves] = Field(default_factory=list)
+    history: Dict[str, List] = Field(
+        default_factory=lambda: {"Round": [], "HP": [], "Status": [], "Attacked with": [], "Attacked by": []}
+    )
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.current_hp = self.stats.hp
-        self.history = {"Round": [], "HP": [], "Status": [], "Attacked with": [], "Attacked by": []}
-        self.moves_used = []
 
     @property
     def is_alive(self) -> bool:
@@ -28,37 +31,40 @@ class BattlePokemon(Pokemon):
 
     @classmethod
     def from_pokemon_class(cls, pokemon_inst: Pokemon):
-        kwargs = pokemon_inst.__dict__
+        # Fresh stats: the battle changes them (e.g. paralysis), which must not leak into the source pokemon
+        kwargs = {**pokemon_inst.__dict__, "stats": Stats()}
         return cls(**kwargs)
     
     def change_alive_status(self) -> None:
         self._is_alive= False
 
-    def attack(self, defender: "BattlePokemon", move: Moves) -> "BattlePokemon":
-        can_move = self.is_pokemon_able_to_move()
+    def attack(self, defender: "BattlePokemon", move: Moves, rng: Optional[BattleRNG] = None) -> "BattlePokemon":
+        rng = rng or default_rng()
+        can_move = self.is_pokemon_able_to_move(rng)
         logger.debug(f"Pokemon is able to move?: {can_move}")
-        is_damage_inflicted = bool(np.random.choice([True, False], p=[move.accuracy/100, 1 - (move.accuracy/100)]))
+        is_damage_inflicted = rng.chance(move.accuracy / 100)
         logger.debug(f"Is damage inflicted?: {is_damage_inflicted}")
-        damage = self.compute_damage(defender, move) if (is_damage_inflicted and can_move) else 0
+        damage = self.compute_damage(defender, move, rng) if (is_damage_inflicted and can_move) else 0
         logger.info(f"Total damage caused to {defender.name.upper()}: {-damage} HP")
-        defender = self.apply_ailment_if_move_allows(move, defender)
+        defender = self.apply_ailment_if_move_allows(move, defender, rng)
         defender.current_hp -= damage
         if defender.current_hp <= 0:
             defender.current_hp = 0
             defender.change_alive_status()
         return defender
 
-    def compute_damage(self, defender: "BattlePokemon", move: Moves) -> int:
+    def compute_damage(self, defender: "BattlePokemon", move: Moves, rng: Optional[BattleRNG] = None) -> int:
         if move.damage_class in ("physical", "special"):
+            rng = rng or default_rng()
             is_attacker_burnt = self.nvstatus == NVStatus.BURNT
             criticality = (2 * self.level + 5) / (self.level + 5)
-            critical_hit = bool(np.random.choice([True, False], p=[1/16, 15/16]))
+            critical_hit = rng.chance(1 / 16)
             critical_mtpl = criticality * critical_hit +  1 * (not critical_hit)
             is_stab = 1.5 if move.type in defender.types else 1
             burnt_modifier = 0.5 if (is_attacker_burnt and move.damage_class == "physical") else 1
             attack_power = self.stats.attack if move.damage_class == "physical" else self.stats.special_attack
             defense_power = defender.stats.defense if move.damage_class == "physical" else defender.stats.special_defense
-            random_mtpl = np.random.uniform(85, 100) / 100
+            random_mtpl = rng.uniform(85, 100) / 100
             base = (((2 * self.level / 5 + 2) * move.power * attack_power / defense_power) / 50) * burnt_modifier
             modifiers = critical_mtpl * is_stab * effectiveness(move, defender.types) * random_mtpl
             damage = int(base * modifiers)
@@ -67,11 +73,11 @@ class BattlePokemon(Pokemon):
         return damage
     
     @staticmethod
-    def apply_ailment_if_move_allows(move: Moves, defender: "BattlePokemon") -> "BattlePokemon":
+    def apply_ailment_if_move_allows(move: Moves, defender: "BattlePokemon", rng: Optional[BattleRNG] = None) -> "BattlePokemon":
         if move.ailment_name != NVStatus.NONE:
             logger.debug(f"Move '{move.name}' has a possibility to leave the foe's pokemon {move.ailment_name.value}!")
             cond_prob = move.ailment_prob
-            is_condition_applying = bool(np.random.choice([True, False], p=[cond_prob, 1 - cond_prob]))
+            is_condition_applying = (rng or default_rng()).chance(cond_prob)
             logger.debug(f"Probability to leave the foe {move.ailment_name.value}: {cond_prob * 100}%")
             logger.debug("Condition applies" if is_condition_applying else "Condition did not apply")
             if is_condition_applying:
@@ -79,9 +85,9 @@ class BattlePokemon(Pokemon):
                 logger.info(f"{defender.name.upper()} has been {defender.nvstatus.value}!")
         return defender
     
-    def is_pokemon_able_to_move(self) -> bool:
+    def is_pokemon_able_to_move(self, rng: Optional[BattleRNG] = None) -> bool:
         if self.nvstatus == NVStatus.PARALIZED:
-            can_move = bool(np.random.choice([False, True], p=[.25, .75]))
+            can_move = not (rng or default_rng()).chance(.25)
         elif self.nvstatus == NVStatus.FROZEN or self.nvstatus == NVStatus.ASLEEP:
             can_move = False
         else:
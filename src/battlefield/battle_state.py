@@ -0,0 +1,143 @@
+from typing import List, Optional, Sequence, Tuple
+
+from src.pokemon.moves.moves import Moves
+from src.battlefield.status import NVSTATUS_ORDER, NVStatus
+from src.battlefield.battle_pokemon import BattlePokemon
+
+USER, FOE = 0, 1
+MAX_MOVES = 4
+STAGE_NAMES = ("attack", "defense", "special_attack", "special_defense", "speed", "accuracy", "evasion")
+
+# Layout of one side in the flat value list
+HP, STATUS, SPEED = 0, 1, 2
+STAGES = 3
+PP = STAGES + len(STAGE_NAMES)
+SIDE_SIZE = PP + MAX_MOVES
+# Battle-wide values, after both sides
+FIRST = 2 * SIDE_SIZE
+ROUND = FIRST + 1
+STATE_SIZE = ROUND + 1
+
+
+class BattleState:
+    """
+    Mutable part of a battle, packed into one flat list of numbers so that lookahead can copy it cheaply.
+
+    Per side: current HP, status code (`NVStatus.code`), current speed, stat stages and remaining PP for each move
+    slot. Battle-wide: which side moves first and the round number. Everything that never changes during a
+    battle (names, types, base stats, moves) stays on the two `BattlePokemon` in `pokemon`, which every clone
+    shares. `clone` and `restore` are a single list copy.
+    """
+    __slots__ = ("values", "pokemon")
+
+    def __init__(self, values: List[float], pokemon: Tuple[BattlePokemon, BattlePokemon]) -> None:
+        self.values = values
+        self.pokemon = pokemon
+
+    @classmethod
+    def from_battle_pokemon(cls, user: BattlePokemon, foe: BattlePokemon,
+                            first: Optional[int] = None, round_count: int = 0) -> "BattleState":
+        """Snapshot two `BattlePokemon`; `first` defaults to `BattleEngine`'s speed rule (ties go to the foe)."""
+        values = [0.0] * STATE_SIZE
+        for side, pkmn in enumerate((user, foe)):
+            offset = side * SIDE_SIZE
+            values[offset + HP] = pkmn.current_hp
+            values[offset + STATUS] = pkmn.nvstatus.code
+            values[offset + SPEED] = pkmn.stats.speed
+            for slot, move in enumerate(pkmn.moves[:MAX_MOVES]):
+                values[offset + PP + slot] = move.pp - sum(1 for used in pkmn.moves_used if used is move)
+        values[FIRST] = first if first is not None else (USER if user.stats.speed > foe.stats.speed else FOE)
+        values[ROUND] = round_count
+        return cls(values, (user, foe))
+
+    def clone(self) -> "BattleState":
+        return BattleState(self.values[:], self.pokemon)
+
+    def restore(self, snapshot: "BattleState") -> None:
+        self.values[:] = snapshot.values
+
+    def hp(self, side: int) -> float:
+        return self.values[side * SIDE_SIZE + HP]
+
+    def set_hp(self, side: int, hp: float) -> None:
+        self.values[side * SIDE_SIZE + HP] = hp
+
+    def status(self, side: int) -> NVStatus:
+        return NVSTATUS_ORDER[int(self.values[side * SIDE_SIZE + STATUS])]
+
+    def set_status(self, side: int, status: NVStatus) -> None:
+        self.values[side * SIDE_SIZE + STATUS] = status.code
+
+    def speed(self, side: int) -> float:
+        return self.values[side * SIDE_SIZE + SPEED]
+
+    def set_speed(self, side: int, speed: float) -> None:
+        self.values[side * SIDE_SIZE + SPEED] = speed
+
+    def stage(self, side: int, stat: str) -> int:
+        return int(self.values[side * SIDE_SIZE + STAGES + STAGE_NAMES.index(stat)])
+
+    def change_stage(self, side: int, stat: str, delta: int) -> None:
+        index = side * SIDE_SIZE + STAGES + STAGE_NAMES.index(stat)
+        self.values[index] = max(-6, min(6, self.values[index] + delta))
+
+    def pp(self, side: int, slot: int) -> int:
+        return int(self.values[side * SIDE_SIZE + PP + slot])
+
+    def use_pp(self, side: int, slot: int) -> None:
+        self.values[side * SIDE_SIZE + PP + slot] -= 1
+
+    def moves(self, side: int) -> List[Moves]:
+        return self.pokemon[side].moves[:MAX_MOVES]
+
+    def usable_moves(self, side: int) -> List[int]:
+        """Move slots with PP left."""
+        return [slot for slot in range(len(self.moves(side))) if self.pp(side, slot) > 0]
+
+    @property
+    def first(self) -> int:
+        return int(self.values[FIRST])
+
+    @first.setter
+    def first(self, side: int) -> None:
+        self.values[FIRST] = side
+
+    @property
+    def round_count(self) -> int:
+        return int(self.values[ROUND])
+
+    @round_count.setter
+    def round_count(self, round_count: int) -> None:
+        self.values[ROUND] = round_count
+
+    def is_alive(self, side: int) -> bool:
+        return self.hp(side) > 0
+
+    @property
+    def is_terminal(self) -> bool:
+        return not (self.is_alive(USER) and self.is_alive(FOE))
+
+    def apply_to(self, user: Optional[BattlePokemon] = None, foe: Optional[BattlePokemon] = None) -> Sequence[BattlePokemon]:
+        """Write HP, status and speed back into `BattlePokemon` (by default the ones the state was taken from)."""
+        targets = (user or self.pokemon[USER], foe or self.pokemon[FOE])
+        for side, pkmn in enumerate(targets):
+            pkmn.current_hp = max(0, int(self.hp(side)))
+            pkmn.nvstatus = self.status(side)
+            pkmn.stats.speed = self.speed(side)
+            # Restoring an earlier snapshot can bring a fainted pokemon back
+            pkmn._is_alive = self.is_alive(side)
+        return targets
+
+    def to_battle_pokemon(self) -> Tuple[BattlePokemon, BattlePokemon]:
+        """Independent `BattlePokemon` copies carrying this state."""
+        return tuple(self.apply_to(*(pkmn.model_copy(deep=True) for pkmn in self.pokemon)))
+
+    def __eq__(self, other: object) -> bool:
+        return (isinstance(other, BattleState) and self.values == other.values
+                and all(mine is theirs for mine, theirs in zip(self.pokemon, other.pokemon)))
+
+    def __repr__(self) -> str:
+        sides = ", ".join(
+            f"{pkmn.name}: {self.hp(side):g} HP, {self.status(side).value}" for side, pkmn in enumerate(self.pokemon)
+        )
+        return f"BattleState(round {self.round_count}, {sides})"
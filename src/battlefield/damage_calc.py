@@ -0,0 +1,118 @@
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.pokemon.moves.moves import Moves
+from src.battlefield.status import NVStatus
+from src.battlefield.battle_pokemon import BattlePokemon
+from src.pokemon.moves.effectiveness import DUAL_TYPE_TABLE, type_codes
+
+CRITICAL_HIT_PROB = 1 / 16
+# `compute_damage` draws its random multiplier from uniform(85, 100) / 100
+ROLL_LOW, ROLL_HIGH = 0.85, 1.0
+
+
+@dataclass(frozen=True)
+class DamageDistribution:
+    """Exact distribution of the damage one use of a move deals: `probabilities[i]` is P(damage == damages[i])."""
+    damages: Tuple[int, ...]
+    probabilities: Tuple[float, ...]
+
+    @property
+    def mean(self) -> float:
+        return float(np.dot(self.damages, self.probabilities))
+
+    @property
+    def max(self) -> int:
+        return self.damages[-1]
+
+    def probability_of_at_least(self, damage: int) -> float:
+        return float(sum(p for d, p in zip(self.damages, self.probabilities) if d >= damage))
+
+    def ko_probability(self, hp: int, n_hits: int = 1) -> float:
+        """Probability that `n_hits` independent uses of the move deal at least `hp` damage in total."""
+        return _ko_probability(self, int(hp), n_hits)
+
+    def ko_probabilities(self, hp: int, max_hits: int = 4) -> List[float]:
+        """KO probability within 1, 2, ..., `max_hits` uses."""
+        return [self.ko_probability(hp, n_hits) for n_hits in range(1, max_hits + 1)]
+
+
+def damage_distribution(attacker: BattlePokemon, defender: BattlePokemon, move: Moves,
+                        attacker_status: Optional[NVStatus] = None) -> DamageDistribution:
+    """
+    Enumerate every damage value `BattlePokemon.attack` can deal with `move` against `defender`, and its probability.
+
+    Accounts for whether the attacker can move at all under its current status, accuracy, the 1/16 critical hit,
+    the 85-100% random roll (floored, as `compute_damage` does), STAB, type effectiveness and burn. Results are
+    memoized on the numbers that determine them, so repeated queries for the same matchup are free.
+    `attacker_status` overrides `attacker.nvstatus`, e.g. for hypothetical states during a search.
+    """
+    status = attacker.nvstatus if attacker_status is None else attacker_status
+    if status == NVStatus.FROZEN or status == NVStatus.ASLEEP:
+        can_move_prob = 0.0
+    elif status == NVStatus.PARALIZED:
+        can_move_prob = 0.75
+    else:
+        can_move_prob = 1.0
+    hit_prob = can_move_prob * move.accuracy / 100
+    if move.damage_class not in ("physical", "special") or hit_prob == 0:
+        return _NO_DAMAGE
+    physical = move.damage_class == "physical"
+    return _damage_distribution(
+        level=attacker.level,
+        power=move.power,
+        attack_power=attacker.stats.attack if physical else attacker.stats.special_attack,
+        defense_power=defender.stats.defense if physical else defender.stats.special_defense,
+        burnt_modifier=0.5 if (status == NVStatus.BURNT and physical) else 1,
+        multiplier=(1.5 if move.type in defender.types else 1) * float(DUAL_TYPE_TABLE[(move.type.code, *type_codes(defender.types))]),
+        hit_prob=hit_prob,
+    )
+
+
+@lru_cache(maxsize=16384)
+def _damage_distribution(level: int, power: int, attack_power: float, defense_power: float,
+                         burnt_modifier: float, multiplier: float, hit_prob: float) -> DamageDistribution:
+    base = (((2 * level / 5 + 2) * power * attack_power / defense_power) / 50) * burnt_modifier
+    criticality = (2 * level + 5) / (level + 5)
+    probabilities: Dict[int, float] = {0: 1 - hit_prob}
+    for critical_mtpl, branch_prob in ((1, 1 - CRITICAL_HIT_PROB), (criticality, CRITICAL_HIT_PROB)):
+        for damage, roll_prob in _floored_roll(base * critical_mtpl * multiplier).items():
+            probabilities[damage] = probabilities.get(damage, 0.0) + hit_prob * branch_prob * roll_prob
+    damages = tuple(sorted(d for d, p in probabilities.items() if p > 0))
+    return DamageDistribution(damages, tuple(probabilities[d] for d in damages))
+
+
+def _floored_roll(scaled: float) -> Dict[int, float]:
+    """P(int(scaled * r) == k) for r ~ uniform(ROLL_LOW, ROLL_HIGH): the share of the roll interval mapping to k."""
+    if scaled <= 0:
+        return {0: 1.0}
+    low, high = scaled * ROLL_LOW, scaled * ROLL_HIGH
+    return {
+        damage: (min(damage + 1, high) - max(damage, low)) / (high - low)
+        for damage in range(math.floor(low), math.ceil(high))
+        if min(damage + 1, high) > max(damage, low)
+    }
+
+
+@lru_cache(maxsize=16384)
+def _ko_probability(distribution: DamageDistribution, hp: int, n_hits: int) -> float:
+    if hp <= 0:
+        return 1.0
+    # Total damage so far, capped at hp: index hp collects every KO
+    pmf = np.zeros(hp + 1)
+    for damage, probability in zip(distribution.damages, distribution.probabilities):
+        pmf[min(damage, hp)] += probability
+    total = np.zeros(hp + 1)
+    total[0] = 1.0
+    for _ in range(n_hits):
+        convolved = np.convolve(total, pmf)
+        total = convolved[:hp + 1]
+        total[hp] += convolved[hp + 1:].sum()
+    return float(total[hp])
+
+
+_NO_DAMAGE = DamageDistribution((0,), (1.0,))
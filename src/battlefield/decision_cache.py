@@ -0,0 +1,148 @@
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from src.battlefield.battle_pokemon import BattlePokemon
+
+
+@dataclass(frozen=True)
+class CachedDecision:
+    move: str
+    explanation: str
+
+
+class DecisionCache:
+    """
+    Cache of LLM move decisions keyed by a canonical description of the battle situation.
+
+    Two situations share a key when both pokemon have the same species (dex id), level, moves, status and HP
+    bucket, and, depending on the options, the same round and battle history. Names are left out so mirror-match
+    suffixes and renamed pokemon still hit.
+
+    - max_entries: in-memory LRU size.
+    - hp_buckets: HP is rounded up to 1/hp_buckets of the maximum (10 means 10% steps).
+    - include_round / include_history: make the key stricter by adding the round or the full battle history.
+    - persistent: also keep decisions in SQLite at `path` (POKEMON_DECISION_CACHE_PATH env var or
+      './cache/decisions.sqlite' by default), so they survive restarts.
+    """
+
+    def __init__(self, max_entries: int = 1024,
+                 hp_buckets: int = 10,
+                 include_round: bool = True,
+                 include_history: bool = False,
+                 persistent: bool = False,
+                 path: Optional[Union[str, Path]] = None) -> None:
+        self.max_entries = max_entries
+        self.hp_buckets = hp_buckets
+        self.include_round = include_round
+        self.include_history = include_history
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CachedDecision]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if persistent:
+            if path is None:
+                path = os.environ.get("POKEMON_DECISION_CACHE_PATH", "./cache/decisions.sqlite")
+            self.path = Path(path)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS decisions (key TEXT PRIMARY KEY, move TEXT NOT NULL, "
+                "explanation TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def key(self, attacker: BattlePokemon, defender: BattlePokemon,
+            round_count: Optional[int] = None, history: Optional[str] = None, namespace: Optional[str] = None) -> str:
+        """
+        Canonical key; `namespace` separates decisions of different models or prompts, and must cover every setting
+        that changes what the model is asked (e.g. `BattleEngine.decision_namespace`).
+        """
+        canonical: Dict[str, Any] = {
+            "attacker": self._canonical_pokemon(attacker),
+            "defender": self._canonical_pokemon(defender),
+            "namespace": namespace,
+        }
+        if self.include_round:
+            canonical["round"] = round_count
+        if self.include_history:
+            canonical["history"] = history
+        return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _canonical_pokemon(self, pkmn: BattlePokemon) -> Dict[str, Any]:
+        return {
+            "id": pkmn.id,
+            "level": pkmn.level,
+            "moves": sorted(move.name for move in pkmn.moves),
+            "status": pkmn.nvstatus.value,
+            "hp_bucket": math.ceil(max(pkmn.current_hp, 0) / pkmn.stats.hp * self.hp_buckets),
+        }
+
+    def get(self, key: str) -> Optional[CachedDecision]:
+        with self._lock:
+            decision = self._entries.get(key)
+            if decision is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return decision
+            if self._conn is not None:
+                row = self._conn.execute("SELECT move, explanation FROM decisions WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    decision = CachedDecision(*row)
+                    self._remember(key, decision)
+                    self.hits += 1
+                    self.persistent_hits += 1
+                    return decision
+            self.misses += 1
+            return None
+
+    def put(self, key: str, move: str, explanation: str) -> None:
+        decision = CachedDecision(move, explanation)
+        with self._lock:
+            self._remember(key, decision)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO decisions (key, move, explanation, created_at) VALUES (?, ?, ?, ?)",
+                    (key, move, explanation, time.time()),
+                )
+                self._conn.commit()
+
+    def _remember(self, key: str, decision: CachedDecision) -> None:
+        self._entries[key] = decision
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "persistent_hits": self.persistent_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM decisions")
+                self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
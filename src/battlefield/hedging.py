@@ -0,0 +1,36 @@
+import threading
+from collections import deque
+from typing import Deque
+
+import numpy as np
+
+
+class LatencyTracker:
+    """
+    Rolling window of LLM call latencies, used to decide when to hedge a slow call.
+
+    `hedge_delay()` is the `percentile` of the last `window` latencies once `min_samples` are known, and
+    `initial_delay` before that.
+    """
+
+    def __init__(self, window: int = 200, percentile: float = 95, min_samples: int = 20,
+                 initial_delay: float = 2.0) -> None:
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def hedge_delay(self) -> float:
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial_delay
+            return float(np.percentile(self._latencies, self.percentile))
+
+    def __len__(self) -> int:
+        return len(self._latencies)
+
@@ -0,0 +1,99 @@
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+TokenCounter = Callable[[str], int]
+
+SEPARATOR = " || "
+
+
+def approximate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token for English prose), cheap enough to run on every prompt."""
+    return (len(text) + 3) // 4
+
+
+def render_round(history: Dict[str, List], index: int) -> str:
+    """One round of a `BattlePokemon.history`, worded as `BattleEngine.format_history_for_llm_natural` does."""
+    parts = [f"Round {index}:"]
+    for key, values in history.items():
+        if key != "Round":
+            parts.append(f"{key} was {values[index]}")
+    return ", ".join(parts) + "."
+
+
+class HistoryLog:
+    """
+    Rendered battle history of one pokemon, kept up to date one round at a time.
+
+    `sync` renders only the rounds added since the last call, so building a prompt no longer re-renders the whole
+    battle. Without a `token_budget`, `render` returns the same text as `format_history_for_llm_natural`. With one,
+    the most recent rounds that fit stay verbatim and older rounds are folded into a single summary line
+    (HP trend, moves used and received, statuses seen). The latest round is always kept, even over budget.
+    """
+
+    def __init__(self, token_budget: Optional[int] = None, token_counter: TokenCounter = approximate_tokens) -> None:
+        self.token_budget = token_budget
+        self.token_counter = token_counter
+        self.lines: List[str] = []
+        self.line_tokens: List[int] = []
+        self._rows: List[Dict[str, object]] = []
+        # Rounds before this index are summarized; it only ever moves forward
+        self._first_verbatim = 0
+        self._hp_start: Optional[object] = None
+        self._hp_end: Optional[object] = None
+        self._attacked_with: Counter = Counter()
+        self._attacked_by: Counter = Counter()
+        self._statuses: Dict[str, None] = {}
+
+    def sync(self, history: Dict[str, List]) -> None:
+        """Render the rounds of `history` that are not in the log yet."""
+        for index in range(len(self.lines), len(history["Round"])):
+            line = render_round(history, index)
+            self.lines.append(line)
+            self.line_tokens.append(self.token_counter(line))
+            self._rows.append({key: values[index] for key, values in history.items()})
+
+    def render(self) -> str:
+        if self.token_budget is None:
+            return SEPARATOR.join(self.lines)
+        first = max(self._first_verbatim, self._fitting_start())
+        self._fold(first)
+        summary = self.summary()
+        verbatim = SEPARATOR.join(self.lines[self._first_verbatim:])
+        return f"{summary}{SEPARATOR}{verbatim}" if summary and verbatim else summary or verbatim
+
+    def _fitting_start(self) -> int:
+        """First round to keep verbatim so that the recent rounds plus the summary fit the budget."""
+        # Room for the summary line, which is about as long as one round
+        summary_tokens = max(self.token_counter(self.summary()), self.line_tokens[0] if self.line_tokens else 0)
+        start, used = len(self.lines), 0
+        while start > 0:
+            candidate = start - 1
+            needed = used + self.line_tokens[candidate] + (summary_tokens if candidate > 0 else 0)
+            if needed > self.token_budget and start < len(self.lines):
+                break
+            used += self.line_tokens[candidate]
+            start = candidate
+        return start
+
+    def _fold(self, first: int) -> None:
+        for row in self._rows[self._first_verbatim:first]:
+            if self._hp_start is None:
+                self._hp_start = row.get("HP")
+            self._hp_end = row.get("HP")
+            for key, counter in (("Attacked with", self._attacked_with), ("Attacked by", self._attacked_by)):
+                if row.get(key, "N/A") != "N/A":
+                    counter[row[key]] += 1
+            self._statuses[str(row.get("Status"))] = None
+        self._first_verbatim = max(self._first_verbatim, first)
+
+    def summary(self) -> str:
+        """One line standing for the rounds that are no longer verbatim ('' while there are none)."""
+        if self._first_verbatim == 0:
+            return ""
+        parts = [f"Rounds 0-{self._first_verbatim - 1} (summarized):", f"HP went from {self._hp_start} to {self._hp_end}"]
+        if self._attacked_with:
+            parts.append("attacked with " + ", ".join(f"{move} x{n}" for move, n in self._attacked_with.most_common()))
+        if self._attacked_by:
+            parts.append("attacked by " + ", ".join(f"{move} x{n}" for move, n in self._attacked_by.most_common()))
+        parts.append("statuses: " + ", ".join(self._statuses))
+        return parts[0] + " " + ", ".join(parts[1:]) + "."
@@ -0,0 +1,85 @@
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+from src.pokemon.moves.moves import Moves
+from src.battlefield.battle_pokemon import BattlePokemon
+from src.battlefield.damage_calc import damage_distribution
+
+DAMAGING_CLASSES = ("physical", "special")
+
+
+@dataclass(frozen=True)
+class ScreenResult:
+    """`move` is set when one move clearly dominates; otherwise the LLM picks among `candidates`."""
+    move: Optional[Moves]
+    candidates: List[Moves]
+    scores: Dict[str, float]
+
+
+class MoveScreener:
+    """
+    Cheap pre-decision stage for LLM trainers: scores every move with the exact damage distribution
+    (`damage_calc`, i.e. the engine's damage formula, type effectiveness, accuracy and status) and answers
+    without the LLM when the choice is obvious.
+
+    A move dominates when it knocks the defender out with probability >= `ko_threshold`, or when its expected
+    damage is at least `margin` times that of the runner-up (which covers one damaging move against status
+    moves). Otherwise the LLM is offered the `top_k` damaging moves by expected damage plus every status move:
+    moves that deal no damage are never picked locally, so their strategic value is left to the LLM whenever
+    nothing dominates.
+
+    One screener can be shared by several engines; `stats()` reports the share of turns answered locally and
+    the LLM time that saved, estimated from the mean latency of the LLM decisions that were made.
+    """
+
+    def __init__(self, margin: float = 2.0, ko_threshold: float = 0.9, top_k: int = 2) -> None:
+        self.margin = margin
+        self.ko_threshold = ko_threshold
+        self.top_k = top_k
+        self.local_decisions = 0
+        self.llm_decisions = 0
+        self.llm_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, attacker: BattlePokemon, defender: BattlePokemon) -> ScreenResult:
+        distributions = {move.name: damage_distribution(attacker, defender, move) for move in attacker.moves}
+        scores = {name: distribution.mean for name, distribution in distributions.items()}
+        ranked = sorted(attacker.moves, key=lambda move: scores[move.name], reverse=True)
+        move = self._dominant(ranked, scores, {
+            name: distribution.ko_probability(defender.current_hp) for name, distribution in distributions.items()
+        })
+        if move is not None:
+            with self._lock:
+                self.local_decisions += 1
+        damaging = [move for move in ranked if move.damage_class in DAMAGING_CLASSES][:self.top_k]
+        status = [move for move in attacker.moves if move.damage_class not in DAMAGING_CLASSES]
+        return ScreenResult(move, damaging + status, scores)
+
+    def _dominant(self, ranked: List[Moves], scores: Dict[str, float], ko_probabilities: Dict[str, float]) -> Optional[Moves]:
+        best_ko = max(ranked, key=lambda move: ko_probabilities[move.name])
+        if scores[best_ko.name] > 0 and ko_probabilities[best_ko.name] >= self.ko_threshold:
+            return best_ko
+        best = ranked[0]
+        runner_up = scores[ranked[1].name] if len(ranked) > 1 else 0.0
+        if scores[best.name] > 0 and scores[best.name] >= self.margin * runner_up:
+            return best
+        return None
+
+    def record_llm_decision(self, seconds: float) -> None:
+        with self._lock:
+            self.llm_decisions += 1
+            self.llm_seconds += seconds
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        with self._lock:
+            turns = self.local_decisions + self.llm_decisions
+            mean_llm_seconds = self.llm_seconds / self.llm_decisions if self.llm_decisions else 0.0
+            return {
+                "turns": turns,
+                "local_decisions": self.local_decisions,
+                "llm_decisions": self.llm_decisions,
+                "local_fraction": self.local_decisions / turns if turns else 0.0,
+                "mean_llm_seconds": mean_llm_seconds,
+                "estimated_seconds_saved": self.local_decisions * mean_llm_seconds,
+            }
@@ -0,0 +1,67 @@
+from typing import Callable, Dict, List, Union
+
+from src.pokemon.moves.moves import Moves
+from src.battlefield.status import NVStatus
+from src.battlefield.rng import BattleRNG
+from src.battlefield.battle_pokemon import BattlePokemon
+from src.pokemon.moves.effectiveness import effectiveness
+
+# A move-selection policy picks the attacker's move for the current turn without calling an LLM.
+# It gets the battle's RNG so that randomized policies stay replayable.
+MovePolicy = Callable[[BattlePokemon, BattlePokemon, BattleRNG], Moves]
+
+
+def expected_damage(attacker: BattlePokemon, defender: BattlePokemon, move: Moves) -> float:
+    """Mean of `BattlePokemon.compute_damage` over crits and random rolls, weighted by the move's accuracy."""
+    if move.damage_class not in ("physical", "special"):
+        return 0.0
+    criticality = (2 * attacker.level + 5) / (attacker.level + 5)
+    expected_critical_mtpl = criticality / 16 + 15 / 16
+    is_stab = 1.5 if move.type in defender.types else 1
+    burnt_modifier = 0.5 if (attacker.nvstatus == NVStatus.BURNT and move.damage_class == "physical") else 1
+    attack_power = attacker.stats.attack if move.damage_class == "physical" else attacker.stats.special_attack
+    defense_power = defender.stats.defense if move.damage_class == "physical" else defender.stats.special_defense
+    base = (((2 * attacker.level / 5 + 2) * move.power * attack_power / defense_power) / 50) * burnt_modifier
+    mean_random_mtpl = 0.925
+    return base * expected_critical_mtpl * is_stab * effectiveness(move, defender.types) * mean_random_mtpl * move.accuracy / 100
+
+
+def random_policy(attacker: BattlePokemon, defender: BattlePokemon, rng: BattleRNG) -> Moves:
+    return rng.choice(attacker.moves)
+
+
+def greedy_policy(attacker: BattlePokemon, defender: BattlePokemon, rng: BattleRNG) -> Moves:
+    """Always picks the move with the highest expected damage (ties go to the first listed move)."""
+    return max(attacker.moves, key=lambda move: expected_damage(attacker, defender, move))
+
+
+def search_policy() -> MovePolicy:
+    # Imported here so that loading the stateless policies does not pull in the search stack
+    from src.battlefield.search_trainer import SearchTrainer
+    return SearchTrainer()
+
+
+# Stateless policies, shared by every caller
+POLICIES: Dict[str, MovePolicy] = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+}
+
+# Policies that keep state between turns; `get_policy` builds a fresh one on every call
+POLICY_FACTORIES: Dict[str, Callable[[], MovePolicy]] = {
+    "search": search_policy,
+}
+
+
+def policy_names() -> List[str]:
+    return [*POLICIES, *POLICY_FACTORIES]
+
+
+def get_policy(policy: Union[str, MovePolicy]) -> MovePolicy:
+    if callable(policy):
+        return policy
+    if policy in POLICY_FACTORIES:
+        return POLICY_FACTORIES[policy]()
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy '{policy}'. Choose one of {policy_names()} or pass a callable.")
+    return POLICIES[policy]
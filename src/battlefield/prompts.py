@@ -1,9 +1,4 @@
-POKEMON_TRAINER = """
-You are a Pokemon trainer. Your objective is winning this battle against another trainer and his/her Pokemon.
-Your pokemon is {user_pokemon} and his/hers is {foe_pokemon}.
-The battle has just began and you need to decide what to do next.
-
-Some hints before you cast any decision:
+TRAINER_HINTS = """Some hints before you cast any decision:
 - If your pokemon faits first, you lose, if his/hers faints first, you win.
 - HP (Hit Points): This stat represents a pokemon's health. A higher HP allows a pokemon to withstand more damage before fainting.
 - Attack: This stat determines the damage a pokemon deals with its physical moves. A higher Attack stat leads to higher damage from moves like Tackle or close-range attacks.
@@ -20,7 +15,14 @@ Some hints before you cast any decision:
 - the 'damage class' in the move tells you if the movement is causing damage to your enemy ('physical', 'special), or not (<any other>).
 - If you see your previous move did not cause any damage, try to select another one.
 
-Given the above information, the below stats will help you take a move decision:
+"""
+
+POKEMON_TRAINER = """
+You are a Pokemon trainer. Your objective is winning this battle against another trainer and his/her Pokemon.
+Your pokemon is {user_pokemon} and his/hers is {foe_pokemon}.
+The battle has just began and you need to decide what to do next.
+
+""" + TRAINER_HINTS + """Given the above information, the below stats will help you take a move decision:
 
 ------------------------------------------------------------
 1) Your pokemon's stats are...
@@ -62,3 +64,74 @@ Your pokemon's four possible moves are...
 Which one do you choose? Answer in the following manner:
 '<move>': '<motivation>'
 """
+
+
+DECISION_REQUEST = "Choose your move and explain why."
+
+DECISION_FORMAT_REQUEST = """You MUST respond with valid JSON that matches this schema:
+{format_instructions}
+
+Your response must contain ONLY the JSON object, nothing else."""
+
+INVALID_DECISION = """Your previous answer was not valid: {error}
+Answer again, choosing exactly one of these moves: {moves}."""
+
+
+# Cache-friendly layout: everything that stays the same during a battle comes first, so consecutive prompts share
+# a long prefix that providers can cache; only TRAINER_TURN_STATE changes from turn to turn.
+TRAINER_RULES = """
+You are a Pokemon trainer. Your objective is winning this battle against another trainer and his/her Pokemon.
+
+""" + TRAINER_HINTS
+
+TRAINER_BATTLE_SETUP = """------------------------------------------------------------
+In this battle your pokemon is {user_pokemon} (level {user_level}, {user_types} type) and his/hers is {foe_pokemon} (level {foe_level}, {foe_types} type).
+
+Your pokemon's base stats are...
+
+<<< USER POKEMON BASE STATS >>>
+{user_base_stats}
+<<< ------------------ >>>
+
+Your foe's pokemon base stats are...
+
+<<< FOE POKEMON BASE STATS >>>
+{foe_base_stats}
+<<< ------------------ >>>
+
+Your pokemon's four possible moves are...
+
+<<< MOVES >>>
+{moves}
+<<< ----- >>>
+"""
+
+TRAINER_TURN_STATE = """This is the current state of the battle.
+
+1) Your pokemon's stats are...
+
+<<< USER POKEMON STATS >>>
+{user_stats}
+<<< ------------------ >>>
+
+2) Your foe's pokemon stats are...
+
+<<< FOE POKEMON STATS >>>
+{foe_stats}
+<<< ------------------ >>>
+
+3) Your pokemon's status is: {user_nvstatus}
+
+4) Your foe pokemon's status is: {foe_nvstatus}
+
+5) History of the battle so far. Round 0 is the initial state.
+<<< BATTLE HISTORY >>>
+- your pokemon's history: {user_battle_history}
+- foe pokemon's history: {foe_battle_history}
+------------------------------------------------------------
+
+"""
+
+TRAINER_CANDIDATE_MOVES = """Only these moves are worth considering this turn: {moves}.
+
+"""
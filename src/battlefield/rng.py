@@ -0,0 +1,65 @@
+from typing import List, Optional, Sequence, TypeVar, Union
+
+import numpy as np
+
+T = TypeVar("T")
+Seed = Union[int, np.random.SeedSequence, None]
+
+
+class BattleRNG:
+    """
+    Random source owned by a single battle.
+
+    Uniform floats are drawn from a `numpy.random.Generator` in blocks of `block_size`, so each roll during a
+    battle is a list lookup instead of a NumPy call. A battle is replayable from its seed, and `spawn` derives
+    statistically independent streams (via `SeedSequence`) for battles run in parallel.
+    """
+
+    def __init__(self, seed: Seed = None, block_size: int = 256) -> None:
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.generator = np.random.Generator(np.random.PCG64(self.seed_sequence))
+        self.block_size = block_size
+        self._block: List[float] = []
+        self._position = 0
+
+    def random(self) -> float:
+        """Uniform float in [0, 1)."""
+        if self._position == len(self._block):
+            self._block = self.generator.random(self.block_size).tolist()
+            self._position = 0
+        value = self._block[self._position]
+        self._position += 1
+        return value
+
+    def chance(self, p: float) -> bool:
+        """True with probability `p`."""
+        return self.random() < p
+
+    def uniform(self, low: float, high: float) -> float:
+        return low + (high - low) * self.random()
+
+    def integers(self, high: int) -> int:
+        """Uniform integer in [0, high)."""
+        return int(self.random() * high)
+
+    def choice(self, options: Sequence[T]) -> T:
+        return options[self.integers(len(options))]
+
+    def spawn(self, n: int) -> List["BattleRNG"]:
+        return [BattleRNG(child, self.block_size) for child in self.seed_sequence.spawn(n)]
+
+    @property
+    def entropy(self) -> Optional[int]:
+        """Root seed; with the seed sequence's `spawn_key` it identifies the stream for replays."""
+        return self.seed_sequence.entropy
+
+
+_default_rng: Optional[BattleRNG] = None
+
+
+def default_rng() -> BattleRNG:
+    """Process-wide unseeded stream for callers that do not run inside a battle with its own RNG."""
+    global _default_rng
+    if _default_rng is None:
+        _default_rng = BattleRNG()
+    return _default_rng
@@ -0,0 +1,211 @@
+import math
+import time
+from itertools import product
+from typing import Dict, List, Optional, Tuple
+
+from src.pokemon.moves.moves import Moves
+from src.battlefield.rng import BattleRNG
+from src.battlefield.status import NVStatus
+from src.battlefield.battle_pokemon import BattlePokemon
+from src.battlefield.battle_state import FOE, USER, BattleState
+from src.battlefield.damage_calc import DamageDistribution, damage_distribution
+
+Outcomes = List[Tuple[float, float]]
+
+
+class _OutOfBudget(Exception):
+    pass
+
+
+class SearchTrainer:
+    """
+    Local, LLM-free move selection by depth-limited expectiminimax over the `BattleEngine` rules.
+
+    Decision nodes alternate between the two pokemon in turn order; chance nodes cover the damage roll (exact
+    distribution from `damage_calc`, grouped into `damage_buckets` equal-probability buckets plus a miss branch),
+    whether the move's ailment lands, and end-of-round status damage and recovery. The search deepens one action
+    at a time until `time_budget` seconds or `max_nodes` nodes are spent and keeps the best move of the deepest
+    completed iteration, so a decision takes at most about `time_budget` even in complex positions.
+
+    Instances are `MovePolicy` callables, so they plug into `BattleEngine(policy=...)` or `foe_policy=...`.
+    """
+
+    def __init__(self, time_budget: float = 0.008,
+                 max_depth: int = 6,
+                 max_nodes: Optional[int] = None,
+                 damage_buckets: int = 3) -> None:
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.damage_buckets = damage_buckets
+        self.last_search: Dict[str, float] = {}
+
+    def __call__(self, attacker: BattlePokemon, defender: BattlePokemon, rng: Optional[BattleRNG] = None) -> Moves:
+        # Both sides record a move per round, so the attacker moves first exactly when neither has moved yet this round
+        attacker_moves_first = len(attacker.moves_used) == len(defender.moves_used)
+        state = BattleState.from_battle_pokemon(attacker, defender, first=USER if attacker_moves_first else FOE)
+        return attacker.moves[self.choose(state, USER, phase=0 if attacker_moves_first else 1)]
+
+    def choose(self, state: BattleState, side: int, phase: int = 0) -> int:
+        """Best move slot for `side`, which is about to act as the first (`phase=0`) or second (`phase=1`) mover."""
+        started = time.perf_counter()
+        self._me = side
+        self._root_round = state.round_count
+        self._deadline = started + self.time_budget
+        self._nodes = 0
+        self._outcome_cache: Dict[Tuple[int, int, NVStatus], Outcomes] = {}
+        self._rate_cache: Dict[Tuple[int, NVStatus], float] = {}
+        self._table: Dict[Tuple, float] = {}
+
+        slots = self._slots(state, side)
+        # Depth-0 fallback: the move with the highest expected damage
+        best = max(slots, key=lambda slot: self._mean_damage(state, side, slot, state.status(side)))
+        depth_reached = 0
+        for depth in range(1, self.max_depth + 1):
+            self._abortable = depth > 1
+            try:
+                scores = {slot: self._action_value(state, phase, side, slot, depth) for slot in slots}
+            except _OutOfBudget:
+                break
+            best = max(slots, key=lambda slot: scores[slot])
+            depth_reached = depth
+            if time.perf_counter() >= self._deadline:
+                break
+        self.last_search = {"depth": depth_reached, "nodes": self._nodes, "elapsed": time.perf_counter() - started}
+        return best
+
+    @staticmethod
+    def _slots(state: BattleState, side: int) -> List[int]:
+        # The engine does not enforce PP, so a pokemon out of PP still picks among all its moves
+        return state.usable_moves(side) or list(range(len(state.moves(side))))
+
+    def _tick(self) -> None:
+        self._nodes += 1
+        if self._abortable and (
+            (self.max_nodes is not None and self._nodes > self.max_nodes)
+            or (self._nodes % 32 == 0 and time.perf_counter() > self._deadline)
+        ):
+            raise _OutOfBudget()
+
+    def _decision(self, state: BattleState, phase: int, depth: int) -> float:
+        if depth == 0:
+            return self._evaluate(state)
+        key = (tuple(state.values), phase, depth)
+        if key in self._table:
+            return self._table[key]
+        actor = state.first if phase == 0 else 1 - state.first
+        values = [self._action_value(state, phase, actor, slot, depth) for slot in self._slots(state, actor)]
+        value = max(values) if actor == self._me else min(values)
+        self._table[key] = value
+        return value
+
+    def _action_value(self, state: BattleState, phase: int, actor: int, slot: int, depth: int) -> float:
+        self._tick()
+        target = 1 - actor
+        move = state.moves(actor)[slot]
+        ailment_prob = move.ailment_prob if move.ailment_name != NVStatus.NONE else 0
+        ailment_branches = [(lands, p) for lands, p in ((True, ailment_prob), (False, 1 - ailment_prob)) if p > 0]
+        value = 0.0
+        for damage, damage_prob in self._outcomes(state, actor, slot):
+            for lands, ailment_branch_prob in ailment_branches:
+                child = state.clone()
+                child.use_pp(actor, slot)
+                child.set_hp(target, child.hp(target) - damage)
+                if lands:
+                    child.set_status(target, move.ailment_name)
+                if not child.is_alive(target):
+                    outcome = self._win_value(actor, child)
+                elif phase == 0:
+                    outcome = self._decision(child, 1, depth - 1)
+                else:
+                    outcome = self._end_of_round(child, depth - 1)
+                value += damage_prob * ailment_branch_prob * outcome
+        return value
+
+    def _end_of_round(self, state: BattleState, depth: int) -> float:
+        """Status damage, 25% recovery chance per status, paralysis slowdown and the new turn order."""
+        first, follower = state.first, 1 - state.first
+        state = state.clone()
+        for side in (first, follower):
+            if state.status(side) in (NVStatus.BURNT, NVStatus.POISONED):
+                state.set_hp(side, state.hp(side) - int(state.pokemon[side].stats.hp / 8))
+        if not state.is_alive(first):
+            return self._win_value(follower, state)
+        if not state.is_alive(follower):
+            return self._win_value(first, state)
+
+        statused = [side for side in (first, follower) if state.status(side) != NVStatus.NONE]
+        value = 0.0
+        for recoveries in product((True, False), repeat=len(statused)):
+            child = state.clone()
+            probability = 1.0
+            for side, recovers in zip(statused, recoveries):
+                probability *= 0.25 if recovers else 0.75
+                if recovers:
+                    child.set_status(side, NVStatus.NONE)
+            for side in (first, follower):
+                if child.status(side) == NVStatus.PARALIZED:
+                    child.set_speed(side, child.speed(side) * 0.75)
+            if child.speed(first) < child.speed(follower):
+                child.first = follower
+            child.round_count += 1
+            value += probability * self._decision(child, 0, depth)
+        return value
+
+    def _win_value(self, winner: int, state: BattleState) -> float:
+        # Earlier wins (and later losses) score slightly better, so a sure knockout now beats a gamble
+        value = 1.0 - 0.01 * (state.round_count - self._root_round)
+        return value if winner == self._me else -value
+
+    def _evaluate(self, state: BattleState) -> float:
+        """Heuristic in (-1, 1): HP advantage plus who is on track to knock the other out first."""
+        me, opponent = self._me, 1 - self._me
+        hp_advantage = state.hp(me) / state.pokemon[me].stats.hp - state.hp(opponent) / state.pokemon[opponent].stats.hp
+        my_rate, opponent_rate = self._best_rate(state, me), self._best_rate(state, opponent)
+        turns_to_win = state.hp(opponent) / my_rate if my_rate > 0 else math.inf
+        turns_to_lose = state.hp(me) / opponent_rate if opponent_rate > 0 else math.inf
+        if math.isinf(turns_to_win) and math.isinf(turns_to_lose):
+            race = 0.0
+        else:
+            race = math.tanh((min(turns_to_lose, 1e6) - min(turns_to_win, 1e6)) / 2)
+        return 0.5 * hp_advantage + 0.45 * race
+
+    def _best_rate(self, state: BattleState, side: int) -> float:
+        key = (side, state.status(side))
+        if key not in self._rate_cache:
+            self._rate_cache[key] = max(
+                self._mean_damage(state, side, slot, state.status(side)) for slot in range(len(state.moves(side)))
+            )
+        return self._rate_cache[key]
+
+    def _distribution(self, state: BattleState, side: int, slot: int, status: NVStatus) -> DamageDistribution:
+        return damage_distribution(state.pokemon[side], state.pokemon[1 - side], state.moves(side)[slot], attacker_status=status)
+
+    def _mean_damage(self, state: BattleState, side: int, slot: int, status: NVStatus) -> float:
+        return self._distribution(state, side, slot, status).mean
+
+    def _outcomes(self, state: BattleState, actor: int, slot: int) -> Outcomes:
+        key = (actor, slot, state.status(actor))
+        if key not in self._outcome_cache:
+            self._outcome_cache[key] = bucket_damage(self._distribution(state, actor, slot, key[2]), self.damage_buckets)
+        return self._outcome_cache[key]
+
+
+def bucket_damage(distribution: DamageDistribution, buckets: int) -> Outcomes:
+    """Collapse a damage distribution into (damage, probability) pairs: no damage, plus `buckets` equal-mass groups."""
+    outcomes: Outcomes = []
+    no_damage = sum(p for d, p in zip(distribution.damages, distribution.probabilities) if d == 0)
+    if no_damage > 0:
+        outcomes.append((0.0, no_damage))
+    damaging = [(d, p) for d, p in zip(distribution.damages, distribution.probabilities) if d > 0]
+    mass = sum(p for _, p in damaging)
+    groups: List[List[Tuple[int, float]]] = [[] for _ in range(buckets)]
+    cumulative = 0.0
+    for damage, probability in damaging:
+        groups[min(int(cumulative / mass * buckets), buckets - 1)].append((damage, probability))
+        cumulative += probability
+    for group in groups:
+        group_mass = sum(p for _, p in group)
+        if group_mass > 0:
+            outcomes.append((sum(d * p for d, p in group) / group_mass, group_mass))
+    return outcomes
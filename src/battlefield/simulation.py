@@ -0,0 +1,216 @@
+import argparse
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from config.logging import logger
+from src.pokemon.pokemon import Pokemon
+from src.battlefield.battle_engine import BattleEngine
+from src.battlefield.battle_pokemon import BattlePokemon
+from src.battlefield.policies import MovePolicy, get_policy, policy_names
+from src.battlefield.vectorized import run_vectorized
+
+Matchup = Tuple[str, str]
+
+# Set once per worker process by `_init_worker`, so pokemon data is shipped to each worker only once
+_WORKER_ROSTER: Dict[str, Pokemon] = {}
+_WORKER_POLICY: Union[str, MovePolicy] = "random"
+
+
+@dataclass
+class MatchupResult:
+    """Aggregated outcome of many headless battles of `user` against `foe`."""
+    user: str
+    foe: str
+    battles: int = 0
+    user_wins: int = 0
+    foe_wins: int = 0
+    draws: int = 0
+    rounds: List[int] = field(default_factory=list)
+    # Sum over battles of the remaining HP fraction after each round; battles that ended early keep their final value
+    user_hp_sum: Optional[np.ndarray] = None
+    foe_hp_sum: Optional[np.ndarray] = None
+
+    @property
+    def user_win_rate(self) -> float:
+        return self.user_wins / self.battles if self.battles else 0.0
+
+    @property
+    def foe_win_rate(self) -> float:
+        return self.foe_wins / self.battles if self.battles else 0.0
+
+    @property
+    def mean_rounds(self) -> float:
+        return float(np.mean(self.rounds)) if self.rounds else 0.0
+
+    @property
+    def user_hp_curve(self) -> List[float]:
+        return self._mean_curve(self.user_hp_sum)
+
+    @property
+    def foe_hp_curve(self) -> List[float]:
+        return self._mean_curve(self.foe_hp_sum)
+
+    def _mean_curve(self, hp_sum: Optional[np.ndarray]) -> List[float]:
+        if hp_sum is None or not self.battles:
+            return []
+        return (hp_sum[:max(self.rounds) + 1] / self.battles).round(4).tolist()
+
+    def merge(self, other: "MatchupResult") -> None:
+        self.battles += other.battles
+        self.user_wins += other.user_wins
+        self.foe_wins += other.foe_wins
+        self.draws += other.draws
+        self.rounds.extend(other.rounds)
+        self.user_hp_sum = other.user_hp_sum if self.user_hp_sum is None else self.user_hp_sum + other.user_hp_sum
+        self.foe_hp_sum = other.foe_hp_sum if self.foe_hp_sum is None else self.foe_hp_sum + other.foe_hp_sum
+
+    def summary(self) -> Dict[str, Union[str, int, float, List[float]]]:
+        return {
+            "user": self.user,
+            "foe": self.foe,
+            "battles": self.battles,
+            "user_win_rate": self.user_win_rate,
+            "foe_win_rate": self.foe_win_rate,
+            "draw_rate": self.draws / self.battles if self.battles else 0.0,
+            "mean_rounds": self.mean_rounds,
+            "user_hp_curve": self.user_hp_curve,
+            "foe_hp_curve": self.foe_hp_curve,
+        }
+
+
+def _init_worker(roster: Dict[str, Pokemon], policy: Union[str, MovePolicy]) -> None:
+    global _WORKER_ROSTER, _WORKER_POLICY
+    _WORKER_ROSTER = roster
+    _WORKER_POLICY = policy
+    # Per-turn INFO logs would dominate the runtime of a batch
+    logger.setLevel(logging.WARNING)
+
+
+def _hp_curve(pokemon: BattlePokemon, length: int) -> np.ndarray:
+    curve = np.asarray(pokemon.history["HP"], dtype=float) / pokemon.stats.hp
+    return np.pad(curve, (0, length - len(curve)), mode="edge")
+
+
+def _run_chunk(matchup: Matchup, n_battles: int, seed: np.random.SeedSequence, max_rounds: int, engine: str) -> MatchupResult:
+    user_name, foe_name = matchup
+    if engine == "vectorized":
+        return run_vectorized(_WORKER_ROSTER[user_name], _WORKER_ROSTER[foe_name], n_battles,
+                              policy=_WORKER_POLICY, seed=seed, max_rounds=max_rounds)
+    policy = get_policy(_WORKER_POLICY)
+    result = MatchupResult(user=user_name, foe=foe_name,
+                           user_hp_sum=np.zeros(max_rounds + 1), foe_hp_sum=np.zeros(max_rounds + 1))
+    # Every battle gets its own independent stream, derived from the chunk's seed
+    for battle_seed in seed.spawn(n_battles):
+        battle = BattleEngine(
+            BattlePokemon.from_pokemon_class(_WORKER_ROSTER[user_name]),
+            BattlePokemon.from_pokemon_class(_WORKER_ROSTER[foe_name]),
+            policy=policy,
+            max_rounds=max_rounds,
+            seed=battle_seed,
+        )
+        battle.start_ai_battle()
+        result.battles += 1
+        if battle.winner is None:
+            result.draws += 1
+        elif battle.winner is battle.user_pokemon:
+            result.user_wins += 1
+        else:
+            result.foe_wins += 1
+        result.rounds.append(battle.rounds_played)
+        result.user_hp_sum += _hp_curve(battle.user_pokemon, max_rounds + 1)
+        result.foe_hp_sum += _hp_curve(battle.foe_pokemon, max_rounds + 1)
+    return result
+
+
+def load_roster(names: Iterable[str]) -> Dict[str, Pokemon]:
+    """Load each distinct pokemon once (random level, gender and moves, as for an interactive battle)."""
+    from src.tools.tools import get_pokemon_attributes, return_loaded_pokemon_data
+
+    names = list(dict.fromkeys(names))
+    pokemon = return_loaded_pokemon_data(get_pokemon_attributes(names))
+    return {name: pkmn for name, pkmn in zip(names, pokemon)}
+
+
+def run_batch(matchups: List[Matchup],
+              policy: Union[str, MovePolicy] = "random",
+              battles_per_matchup: int = 100,
+              n_workers: Optional[int] = None,
+              seed: Optional[int] = None,
+              roster: Optional[Dict[str, Pokemon]] = None,
+              chunk_size: int = 250,
+              max_rounds: int = 100,
+              engine: str = "scalar") -> Dict[Matchup, MatchupResult]:
+    """
+    Run `battles_per_matchup` headless battles for every (user, foe) matchup across a process pool.
+
+    Moves are picked by `policy` (a name from `policy_names()` or a picklable callable) instead of an LLM.
+    Pokémon are loaded once up front (or taken from `roster`) and shipped to each worker once; battles are
+    split into chunks of `chunk_size`, each seeded from `seed` so a batch is reproducible for a fixed chunking.
+    `n_workers=1` runs everything in the calling process.
+    `engine="vectorized"` plays each chunk in lockstep with `VectorizedBattle` (named policies only).
+    """
+    if engine == "vectorized" and not isinstance(policy, str):
+        raise ValueError("The vectorized engine only supports named policies")
+    get_policy(policy)
+    if roster is None:
+        roster = load_roster(name for matchup in matchups for name in matchup)
+    missing = {name for matchup in matchups for name in matchup} - roster.keys()
+    if missing:
+        raise ValueError(f"No pokemon data for {sorted(missing)}")
+
+    tasks = [
+        (tuple(matchup), min(chunk_size, battles_per_matchup - start))
+        for matchup in matchups
+        for start in range(0, battles_per_matchup, chunk_size)
+    ]
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+    n_workers = n_workers or os.cpu_count() or 1
+    logger.info(f"Running {battles_per_matchup * len(matchups)} battles in {len(tasks)} chunks on {n_workers} workers")
+
+    if n_workers == 1:
+        previous_level = logger.level
+        _init_worker(roster, policy)
+        try:
+            chunk_results = [_run_chunk(matchup, n, chunk_seed, max_rounds, engine) for (matchup, n), chunk_seed in zip(tasks, seeds)]
+        finally:
+            logger.setLevel(previous_level)
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(roster, policy)) as pool:
+            chunk_results = list(pool.map(
+                _run_chunk, [matchup for matchup, _ in tasks], [n for _, n in tasks], seeds,
+                [max_rounds] * len(tasks), [engine] * len(tasks),
+            ))
+
+    results: Dict[Matchup, MatchupResult] = {}
+    for chunk in chunk_results:
+        key = (chunk.user, chunk.foe)
+        if key not in results:
+            results[key] = MatchupResult(user=chunk.user, foe=chunk.foe)
+        results[key].merge(chunk)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run headless battles and report win rates.")
+    parser.add_argument("matchups", nargs="+", help="Matchups as user:foe, e.g. pikachu:squirtle")
+    parser.add_argument("--policy", default="random", choices=policy_names())
+    parser.add_argument("--battles", type=int, default=1000, help="Battles per matchup")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--engine", default="scalar", choices=["scalar", "vectorized"])
+    args = parser.parse_args()
+    batch = run_batch(
+        [tuple(matchup.split(":", 1)) for matchup in args.matchups],
+        policy=args.policy, battles_per_matchup=args.battles, n_workers=args.workers, seed=args.seed,
+        engine=args.engine,
+    )
+    for matchup_result in batch.values():
+        print(
+            f"{matchup_result.user} vs {matchup_result.foe}: {matchup_result.user_win_rate:.1%} wins, "
+            f"{matchup_result.foe_win_rate:.1%} losses, {matchup_result.mean_rounds:.1f} rounds on average"
+        )
@@ -15,6 +15,15 @@ class NVStatus(str, Enum):
     POISONED = "poisoned"
     ASLEEP = "asleep"
 
+    @property
+    def code(self) -> int:
+        """Integer index of the status for array-backed battle state; NONE is always 0."""
+        return _NVSTATUS_CODES[self]
+
+
+NVSTATUS_ORDER = list(NVStatus)
+_NVSTATUS_CODES = {status: code for code, status in enumerate(NVSTATUS_ORDER)}
+
 
 class VStatus(str, Enum):
     NONE = "not affected by any non-volatile status"
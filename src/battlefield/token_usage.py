@@ -0,0 +1,52 @@
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Union
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+
+@dataclass(frozen=True)
+class PromptUsage:
+    """Input tokens of one LLM call, as reported by the provider, and how many of them were served from its cache."""
+    input_tokens: int
+    cached_tokens: int
+
+    @property
+    def uncached_tokens(self) -> int:
+        return self.input_tokens - self.cached_tokens
+
+
+class TokenUsageTracker(BaseCallbackHandler):
+    """
+    Callback recording the `usage_metadata` of every LLM call it is attached to.
+
+    Cached tokens come from `input_token_details["cache_read"]`, which providers with prefix caching (OpenAI,
+    Anthropic, ...) fill in. Models that report no usage are not recorded.
+    """
+
+    def __init__(self) -> None:
+        self.records: List[PromptUsage] = []
+        self._lock = threading.Lock()
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if not usage:
+                    continue
+                cached = (usage.get("input_token_details") or {}).get("cache_read") or 0
+                with self._lock:
+                    self.records.append(PromptUsage(usage["input_tokens"], cached))
+
+    def summary(self) -> Dict[str, Union[int, float]]:
+        with self._lock:
+            input_tokens = sum(record.input_tokens for record in self.records)
+            cached_tokens = sum(record.cached_tokens for record in self.records)
+            return {
+                "calls": len(self.records),
+                "input_tokens": input_tokens,
+                "cached_tokens": cached_tokens,
+                "uncached_tokens": input_tokens - cached_tokens,
+                "cached_share": cached_tokens / input_tokens if input_tokens else 0.0,
+            }
@@ -0,0 +1,244 @@
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from src.pokemon.pokemon import Pokemon
+from src.battlefield.status import NVStatus
+from src.battlefield.rng import Seed
+from src.pokemon.moves.effectiveness import NO_TYPE, effectiveness_array, type_codes
+
+# Status codes for the struct-of-arrays state (see `NVStatus.code`)
+BURNT, FROZEN, PARALIZED, POISONED, ASLEEP = (
+    NVStatus.BURNT.code, NVStatus.FROZEN.code, NVStatus.PARALIZED.code, NVStatus.POISONED.code, NVStatus.ASLEEP.code,
+)
+DAMAGE_CLASS_CODES = {"physical": 1, "special": 2}
+MAX_MOVES = 4
+USER, FOE = 0, 1
+DRAW = -1
+
+
+class VectorizedBattle:
+    """
+    Advances N independent battles in lockstep, with every per-turn roll done as a NumPy vector op.
+
+    Battle `i` is `user_pokemon[i]` against `foe_pokemon[i]`. The rules are the ones of `BattleEngine` /
+    `BattlePokemon`, quirks included: STAB is checked against the defender's types, a move's ailment can land
+    even when the move misses, statuses wear off with 25% chance per round, paralysis cuts speed by 25% every
+    round it lasts, and speed ties go to the foe (then keep the current order). State is stored as arrays
+    indexed `[side, battle]` (side 0 is the user, 1 the foe), moves as `[side, battle, move_slot]`.
+
+    Only "random" and "greedy" move selection are supported, as both can be evaluated for all battles at once.
+    """
+
+    def __init__(self, user_pokemon: Sequence[Pokemon],
+                 foe_pokemon: Sequence[Pokemon],
+                 policy: str = "random",
+                 max_rounds: int = 100,
+                 seed: Seed = None) -> None:
+        if len(user_pokemon) != len(foe_pokemon):
+            raise ValueError("Need exactly one foe per user pokemon")
+        if policy not in ("random", "greedy"):
+            raise ValueError(f"Vectorized battles support the 'random' and 'greedy' policies, not '{policy}'")
+        self.policy = policy
+        self.max_rounds = max_rounds
+        self.rng = np.random.default_rng(seed)
+        self.n = n = len(user_pokemon)
+
+        shape, move_shape = (2, n), (2, n, MAX_MOVES)
+        self.max_hp = np.zeros(shape)
+        self.level = np.zeros(shape)
+        self.attack = np.zeros(shape)
+        self.defense = np.zeros(shape)
+        self.special_attack = np.zeros(shape)
+        self.special_defense = np.zeros(shape)
+        self.speed = np.zeros(shape)
+        self.n_moves = np.zeros(shape, dtype=np.int64)
+        self.power = np.zeros(move_shape)
+        self.accuracy = np.zeros(move_shape)
+        self.damage_class = np.zeros(move_shape, dtype=np.int8)
+        self.ailment = np.zeros(move_shape, dtype=np.int8)
+        self.ailment_prob = np.zeros(move_shape)
+        self.move_type = np.zeros(move_shape, dtype=np.int64)
+        self.type_1 = np.zeros(shape, dtype=np.int64)
+        self.type_2 = np.full(shape, NO_TYPE, dtype=np.int64)
+
+        # Static rows are built once per distinct matchup and then copied into every battle that uses it
+        pair_cache: Dict[Tuple[int, int], Tuple[np.ndarray, ...]] = {}
+        for i, (user, foe) in enumerate(zip(user_pokemon, foe_pokemon)):
+            key = (id(user), id(foe))
+            if key not in pair_cache:
+                pair_cache[key] = self._static_rows(user, foe)
+            for array, rows in zip(self._static_arrays(), pair_cache[key]):
+                array[:, i] = rows
+        # STAB and type multipliers never change during a battle; the defender of side s is side 1 - s
+        defender_type_1, defender_type_2 = self.type_1[::-1, :, None], self.type_2[::-1, :, None]
+        self.stab = np.where((self.move_type == defender_type_1) | (self.move_type == defender_type_2), 1.5, 1)
+        self.type_multiplier = effectiveness_array(self.move_type, defender_type_1, defender_type_2)
+
+        self.hp = self.max_hp.copy()
+        self.status = np.zeros(shape, dtype=np.int8)
+        # Who moves first in each battle; the original engine only lets the user start when strictly faster
+        self.first = np.where(self.speed[USER] > self.speed[FOE], USER, FOE)
+        self.active = np.ones(n, dtype=bool)
+        self.winner = np.full(n, DRAW, dtype=np.int8)
+        self.rounds = np.zeros(n, dtype=np.int64)
+        self.hp_history = [self.hp.copy()]
+
+    def _static_arrays(self) -> List[np.ndarray]:
+        return [
+            self.max_hp, self.level, self.attack, self.defense, self.special_attack, self.special_defense,
+            self.speed, self.n_moves, self.power, self.accuracy, self.damage_class, self.ailment,
+            self.ailment_prob, self.move_type, self.type_1, self.type_2,
+        ]
+
+    @staticmethod
+    def _static_rows(user: Pokemon, foe: Pokemon) -> Tuple[np.ndarray, ...]:
+        sides = (user, foe)
+        stat_rows = [
+            np.array([pkmn.stats.hp for pkmn in sides], dtype=float),
+            np.array([pkmn.level for pkmn in sides], dtype=float),
+            *(np.array([getattr(pkmn.stats, stat) for pkmn in sides], dtype=float)
+              for stat in ("attack", "defense", "special_attack", "special_defense", "speed")),
+        ]
+        move_rows = np.zeros((6, 2, MAX_MOVES))
+        for side, attacker in enumerate(sides):
+            for slot, move in enumerate(attacker.moves[:MAX_MOVES]):
+                move_rows[:, side, slot] = (
+                    move.power,
+                    move.accuracy,
+                    DAMAGE_CLASS_CODES.get(move.damage_class, 0),
+                    move.ailment_name.code,
+                    move.ailment_prob,
+                    move.type.code,
+                )
+        n_moves = np.array([min(len(pkmn.moves), MAX_MOVES) for pkmn in sides])
+        type_1, type_2 = np.array([type_codes(pkmn.types) for pkmn in sides]).T
+        return (*stat_rows, n_moves, *move_rows, type_1, type_2)
+
+    def run(self) -> "VectorizedBattle":
+        round_count = 1
+        while self.active.any():
+            self._run_round(round_count)
+            self.hp_history.append(self.hp.copy())
+            if round_count >= self.max_rounds:
+                # Still running: a draw, as with BattleEngine(max_rounds=...)
+                self.rounds[self.active] = round_count
+                self.active[:] = False
+            round_count += 1
+        return self
+
+    def _run_round(self, round_count: int) -> None:
+        idx = np.flatnonzero(self.active)
+        first = self.first[idx]
+        follower = 1 - first
+
+        self._turn(first, follower, idx)
+        done = self.hp[follower, idx] <= 0
+        self._finish(idx[done], first[done], round_count)
+        idx, first, follower = idx[~done], first[~done], follower[~done]
+
+        self._turn(follower, first, idx)
+        done = self.hp[first, idx] <= 0
+        self._finish(idx[done], follower[done], round_count)
+        idx, first, follower = idx[~done], first[~done], follower[~done]
+
+        # Burn and poison damage, the starter first; if both faint, the follower is declared the winner
+        for side in (first, follower):
+            hurt = (self.status[side, idx] == BURNT) | (self.status[side, idx] == POISONED)
+            self.hp[side, idx] -= np.where(hurt, np.floor(self.max_hp[side, idx] / 8), 0)
+        first_down, follower_down = self.hp[first, idx] <= 0, self.hp[follower, idx] <= 0
+        done = first_down | follower_down
+        self._finish(idx[done], np.where(first_down, follower, first)[done], round_count)
+        idx, first, follower = idx[~done], first[~done], follower[~done]
+
+        for side in (first, follower):
+            status = self.status[side, idx]
+            recovered = (status != 0) & (self.rng.random(idx.size) < 0.25)
+            self.status[side, idx] = np.where(recovered, 0, status)
+            self.speed[side, idx] *= np.where(self.status[side, idx] == PARALIZED, 0.75, 1)
+        swap = self.speed[first, idx] < self.speed[follower, idx]
+        self.first[idx] = np.where(swap, follower, first)
+
+    def _finish(self, idx: np.ndarray, winner: np.ndarray, round_count: int) -> None:
+        self.winner[idx] = winner
+        self.rounds[idx] = round_count
+        self.active[idx] = False
+        self.hp[:, idx] = np.maximum(self.hp[:, idx], 0)
+
+    def _choose_moves(self, attacker: np.ndarray, defender: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        n_moves = self.n_moves[attacker, idx]
+        if self.policy == "random":
+            return (self.rng.random(idx.size) * n_moves).astype(np.int64)
+        # Greedy: same expected damage as `policies.expected_damage`, evaluated for all move slots at once
+        damage_class = self.damage_class[attacker, idx]
+        level = self.level[attacker, idx][:, None]
+        expected_critical_mtpl = ((2 * level + 5) / (level + 5)) / 16 + 15 / 16
+        expected = (self._base_damage(attacker, defender, idx, self.power[attacker, idx], damage_class)
+                    * expected_critical_mtpl * self.stab[attacker, idx] * self.type_multiplier[attacker, idx]
+                    * 0.925 * self.accuracy[attacker, idx] / 100)
+        expected = np.where(damage_class > 0, expected, 0)
+        expected = np.where(np.arange(MAX_MOVES) < n_moves[:, None], expected, -np.inf)
+        return expected.argmax(axis=1)
+
+    def _base_damage(self, attacker: np.ndarray, defender: np.ndarray, idx: np.ndarray,
+                     power: np.ndarray, damage_class: np.ndarray) -> np.ndarray:
+        """Damage before crit, STAB, type and random multipliers, for one move per battle or for every move slot."""
+        column = (lambda array: array) if damage_class.ndim == 1 else (lambda array: array[:, None])
+        physical = damage_class == 1
+        attack_power = np.where(physical, column(self.attack[attacker, idx]), column(self.special_attack[attacker, idx]))
+        defense_power = np.where(physical, column(self.defense[defender, idx]), column(self.special_defense[defender, idx]))
+        burnt_modifier = np.where(column(self.status[attacker, idx] == BURNT) & physical, 0.5, 1)
+        level = column(self.level[attacker, idx])
+        return (((2 * level / 5 + 2) * power * attack_power / defense_power) / 50) * burnt_modifier
+
+    def _turn(self, attacker: np.ndarray, defender: np.ndarray, idx: np.ndarray) -> None:
+        if idx.size == 0:
+            return
+        moves = self._choose_moves(attacker, defender, idx)
+        rows = np.arange(idx.size)
+        pick = lambda array: array[attacker, idx][rows, moves]
+        damage_class, accuracy = pick(self.damage_class), pick(self.accuracy)
+        ailment, ailment_prob = pick(self.ailment), pick(self.ailment_prob)
+
+        status = self.status[attacker, idx]
+        can_move_roll, hit_roll, crit_roll, damage_roll, ailment_roll = self.rng.random((5, idx.size))
+        can_move = ~((status == FROZEN) | (status == ASLEEP) | ((status == PARALIZED) & (can_move_roll < 0.25)))
+        is_damage_inflicted = hit_roll < accuracy / 100
+
+        level = self.level[attacker, idx]
+        critical_mtpl = np.where(crit_roll < 1 / 16, (2 * level + 5) / (level + 5), 1)
+        random_mtpl = (85 + 15 * damage_roll) / 100
+        damage = np.floor(
+            self._base_damage(attacker, defender, idx, pick(self.power), damage_class)
+            * critical_mtpl * pick(self.stab) * pick(self.type_multiplier) * random_mtpl
+        )
+        damage = np.where((damage_class > 0) & is_damage_inflicted & can_move, damage, 0)
+
+        # The ailment roll happens whether or not the move connected, as in `BattlePokemon.attack`
+        lands = (ailment != 0) & (ailment_roll < ailment_prob)
+        self.status[defender, idx] = np.where(lands, ailment, self.status[defender, idx])
+        self.hp[defender, idx] = np.maximum(self.hp[defender, idx] - damage, 0)
+
+    def hp_curves(self) -> np.ndarray:
+        """Remaining HP fraction after each round, shape (2, rounds + 1, N); finished battles keep their last value."""
+        history = np.maximum(np.stack(self.hp_history, axis=1), 0)
+        return history / self.max_hp[:, None, :]
+
+
+def run_vectorized(user: Pokemon, foe: Pokemon, n_battles: int,
+                   policy: str = "random", seed: Seed = None, max_rounds: int = 100):
+    """Run `n_battles` of one matchup in lockstep and aggregate them like `simulation.run_batch` does."""
+    from src.battlefield.simulation import MatchupResult  # simulation imports this module
+
+    battle = VectorizedBattle([user] * n_battles, [foe] * n_battles, policy=policy, max_rounds=max_rounds, seed=seed).run()
+    curves = battle.hp_curves()
+    padded = np.pad(curves, ((0, 0), (0, max_rounds + 1 - curves.shape[1]), (0, 0)), mode="edge")
+    return MatchupResult(
+        user=user.name, foe=foe.name, battles=n_battles,
+        user_wins=int((battle.winner == USER).sum()),
+        foe_wins=int((battle.winner == FOE).sum()),
+        draws=int((battle.winner == DRAW).sum()),
+        rounds=battle.rounds.tolist(),
+        user_hp_sum=padded[USER].sum(axis=1),
+        foe_hp_sum=padded[FOE].sum(axis=1),
+    )
@@ -0,0 +1,181 @@
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import orjson
+
+from config.logging import logger
+
+DEFAULT_TTL_SECONDS = 30 * 24 * 60 * 60
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def json(self) -> Any:
+        return orjson.loads(self.body)
+
+    def revalidation_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Persistent, size-bounded HTTP response cache keyed by URL and stored in SQLite.
+
+    - path: SQLite file. If None, uses POKEMON_CACHE_PATH env var or defaults to './cache/pokeapi_cache.sqlite'.
+    - ttl_seconds: age after which an entry must be revalidated. None means entries never go stale.
+    - max_bytes: total body size kept on disk; least recently used entries are evicted beyond it.
+
+    Reads never write: access times are kept in memory and flushed in one batch before an eviction, on close, or
+    once `ACCESS_FLUSH_BATCH` of them are pending.
+    """
+
+    ACCESS_FLUSH_BATCH = 512
+
+    def __init__(self, path: Optional[Union[str, Path]] = None,
+                 ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+                 max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if path is None:
+            path = os.environ.get("POKEMON_CACHE_PATH", "./cache/pokeapi_cache.sqlite")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # url -> last access time not yet written to SQLite
+        self._pending_access: Dict[str, float] = {}
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._pending_access[url] = time.time()
+            if len(self._pending_access) >= self.ACCESS_FLUSH_BATCH:
+                self._flush_access_times()
+                self._conn.commit()
+        body, etag, last_modified, fetched_at = row
+        return CachedResponse(url=url, body=body, etag=etag, last_modified=last_modified, fetched_at=fetched_at)
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        if self.ttl_seconds is None:
+            return True
+        return time.time() - entry.fetched_at < self.ttl_seconds
+
+    def put(self, url: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self._pending_access.pop(url, None)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (url, body, etag, last_modified, fetched_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, now, now, len(body)),
+            )
+            self._total_bytes += len(body) - (previous[0] if previous else 0)
+            self._evict_if_needed()
+            self._conn.commit()
+
+    def mark_revalidated(self, url: str) -> None:
+        """Reset the age of an entry after the server answered 304 Not Modified."""
+        now = time.time()
+        with self._lock:
+            self._pending_access.pop(url, None)
+            self._conn.execute("UPDATE responses SET fetched_at = ?, last_access = ? WHERE url = ?", (now, now, url))
+            self._conn.commit()
+            self.revalidations += 1
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def _flush_access_times(self) -> None:
+        if not self._pending_access:
+            return
+        self._conn.executemany(
+            "UPDATE responses SET last_access = ? WHERE url = ?",
+            [(accessed, url) for url, accessed in self._pending_access.items()],
+        )
+        self._pending_access.clear()
+
+    def _evict_if_needed(self) -> None:
+        if self._total_bytes <= self.max_bytes:
+            return
+        # Eviction order must see the reads made since the last flush
+        self._flush_access_times()
+        rows = self._conn.execute("SELECT url, size FROM responses ORDER BY last_access ASC").fetchall()
+        for url, size in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self._total_bytes -= size
+            self.evictions += 1
+        logger.debug(f"Response cache trimmed to {self._total_bytes} bytes ({self.evictions} evictions so far)")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": self._total_bytes,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._pending_access.clear()
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_access_times()
+            self._conn.commit()
+            self._conn.close()
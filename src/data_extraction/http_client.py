@@ -0,0 +1,116 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.logging import logger
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Runs a single attempt, e.g. through `RequestScheduler.submit` so that every retry also takes a rate-limit token
+AttemptGate = Callable[[Callable[[], requests.Response]], requests.Response]
+
+
+class HttpClient:
+    """
+    Pooled HTTP client used for all PokeAPI traffic.
+
+    Keeps TCP/TLS connections alive across requests through a shared `requests.Session`, applies a
+    per-request timeout and retries connection errors, timeouts and 429/5xx answers with jittered
+    exponential backoff (honouring `Retry-After` when the server sends one).
+    """
+
+    def __init__(self, timeout: Union[float, Tuple[float, float]] = (3.05, 10),
+                 max_retries: int = 3,
+                 backoff_factor: float = 0.5,
+                 max_backoff: float = 8.0,
+                 pool_connections: int = 4,
+                 pool_maxsize: int = 16,
+                 retry_statuses: Tuple[int, ...] = RETRY_STATUSES) -> None:
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = retry_statuses
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+            gate: Optional[AttemptGate] = None) -> requests.Response:
+        """GET `url`, retrying transient errors. Each attempt, retries included, is run through `gate` when given."""
+        def send() -> requests.Response:
+            return self.session.get(url, headers=headers, timeout=self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            self._count("requests")
+            try:
+                response = send() if gate is None else gate(send)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if attempt == self.max_retries:
+                    self._count("failures")
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"Request to {url} failed ({exc.__class__.__name__}), retrying in {delay:.2f}s")
+            else:
+                if response.status_code not in self.retry_statuses or attempt == self.max_retries:
+                    if response.status_code in self.retry_statuses:
+                        self._count("failures")
+                    return response
+                delay = self._retry_after(response) or self._backoff(attempt)
+                logger.warning(f"Request to {url} answered {response.status_code}, retrying in {delay:.2f}s")
+                response.close()
+            self._count("retries")
+            time.sleep(delay)
+
+    def _backoff(self, attempt: int) -> float:
+        # "Full jitter": spreads out retries from concurrent workers hitting the same outage
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(max(delay, 0.0), self.max_backoff)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> Dict[str, int]:
+        """Request/retry counters plus connection reuse figures taken from the urllib3 pools."""
+        connections_opened = 0
+        pooled_requests = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections_opened += pool.num_connections
+            pooled_requests += pool.num_requests
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "connections_opened": connections_opened,
+            "connections_reused": max(0, pooled_requests - connections_opened),
+        }
+
+    def close(self) -> None:
+        self.session.close()
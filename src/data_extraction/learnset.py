@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from config.logging import logger
+
+
+def learnsets_by_game(raw_moves: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, str]]]:
+    """Turn the `moves` field of a `/pokemon/{name}` payload into `{game: [{"name", "url"}, ...]}` in one pass."""
+    learnsets = defaultdict(dict)
+    for move in raw_moves:
+        for detail in move["version_group_details"]:
+            learnsets[detail["version_group"]["name"]][move["move"]["name"]] = move["move"]
+    return {game: list(moves.values()) for game, moves in learnsets.items()}
+
+
+class LearnsetIndex:
+    """
+    Persistent game -> pokemon -> legal moves index.
+
+    A pokemon's learnset for every game is computed once from its raw payload and stored in SQLite,
+    after which the moves for any game are a dictionary (or, on a cold process, a primary-key) lookup.
+
+    - path: SQLite file. If None, uses POKEMON_LEARNSET_PATH env var or defaults to './cache/learnset.sqlite'.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None) -> None:
+        if path is None:
+            path = os.environ.get("POKEMON_LEARNSET_PATH", "./cache/learnset.sqlite")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._memo: Dict[str, Dict[str, List[Dict[str, str]]]] = {}
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS indexed_pokemon (pokemon TEXT PRIMARY KEY);
+            CREATE TABLE IF NOT EXISTS learnsets (
+                pokemon TEXT NOT NULL,
+                game TEXT NOT NULL,
+                moves TEXT NOT NULL,
+                PRIMARY KEY (pokemon, game)
+            ) WITHOUT ROWID;
+            """
+        )
+        self._conn.commit()
+
+    def get(self, pokemon: str, game: str) -> Optional[List[Dict[str, str]]]:
+        """Legal moves of `pokemon` in `game`, or None if the pokemon has not been indexed yet."""
+        learnsets = self._load(pokemon)
+        if learnsets is None:
+            return None
+        return learnsets.get(game, [])
+
+    def add(self, pokemon: str, raw_moves: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, str]]]:
+        learnsets = learnsets_by_game(raw_moves)
+        with self._lock:
+            self._conn.execute("DELETE FROM learnsets WHERE pokemon = ?", (pokemon,))
+            self._conn.executemany(
+                "INSERT INTO learnsets (pokemon, game, moves) VALUES (?, ?, ?)",
+                [(pokemon, game, json.dumps(moves)) for game, moves in learnsets.items()],
+            )
+            self._conn.execute("INSERT OR IGNORE INTO indexed_pokemon (pokemon) VALUES (?)", (pokemon,))
+            self._conn.commit()
+            self._memo[pokemon] = learnsets
+        return learnsets
+
+    def get_or_add(self, pokemon: str, game: str, raw_moves: Optional[List[Dict[str, Any]]]) -> List[Dict[str, str]]:
+        moves = self.get(pokemon, game)
+        if moves is None:
+            moves = self.add(pokemon, raw_moves or []).get(game, [])
+        return moves
+
+    def _load(self, pokemon: str) -> Optional[Dict[str, List[Dict[str, str]]]]:
+        if pokemon in self._memo:
+            return self._memo[pokemon]
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM indexed_pokemon WHERE pokemon = ?", (pokemon,)).fetchone() is None:
+                return None
+            rows = self._conn.execute("SELECT game, moves FROM learnsets WHERE pokemon = ?", (pokemon,)).fetchall()
+            self._memo[pokemon] = {game: json.loads(moves) for game, moves in rows}
+            return self._memo[pokemon]
+
+    def __contains__(self, pokemon: str) -> bool:
+        return self._load(pokemon) is not None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def build_learnset_index(source: str, path: Optional[Union[str, Path]] = None) -> LearnsetIndex:
+    """Index every pokemon exposed by `source` (PokeAPI's pokemon endpoint) by streaming the whole dex once."""
+    from src.data_extractor import DataExtractor
+    from src.data_extraction.scheduler import RequestPriority
+
+    index = LearnsetIndex(path)
+    extractor = DataExtractor(source=source, priority=RequestPriority.BACKGROUND)
+    n_pokemon = 0
+    for pokemon_info in extractor.extract_full_data("all", fields=["moves"]):
+        index.add(pokemon_info["name"], pokemon_info.get("moves", []))
+        n_pokemon += 1
+    logger.info(f"Learnset index written to {index.path} ({n_pokemon} pokemon)")
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute the per-game learnset index.")
+    parser.add_argument("--source", default="https://pokeapi.co/api/v2/pokemon")
+    parser.add_argument("--path", default=None, help="SQLite file to write (defaults to POKEMON_LEARNSET_PATH)")
+    args = parser.parse_args()
+    build_learnset_index(args.source, args.path)
@@ -0,0 +1,215 @@
+import argparse
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from config.logging import logger
+
+POKEMON_ATTRIBUTES = [
+    "id", "types", "stats", "species", "abilities", "cries", "height", "weight",
+    "base_experience", "sprites", "location_area_encounters",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pokemon (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, record TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS moves (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, record TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS abilities (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, record TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS species (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, record TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS learnset (
+    pokemon_id INTEGER NOT NULL,
+    version_group TEXT NOT NULL,
+    move_id INTEGER NOT NULL,
+    PRIMARY KEY (pokemon_id, version_group, move_id)
+) WITHOUT ROWID;
+"""
+
+
+# A pokemon row plus, as a JSON array, the normalized records of the moves it can learn in the given game
+POKEMON_WITH_MOVES_QUERY = """
+SELECT p.id, p.record,
+       (SELECT json_group_array(json(m.record))
+          FROM learnset l JOIN moves m ON m.id = l.move_id
+         WHERE l.pokemon_id = p.id AND l.version_group = :game)
+  FROM pokemon p
+"""
+
+
+class LocalPokedexStore:
+    """
+    Read side of the offline Pokédex: a SQLite file produced by `build_local_store`.
+
+    Pokémon records are stored already normalized (the shape `DataExtractor.extract_specific_attribute`
+    returns) and indexed by name and id, so a Pokémon together with its game-legal moves is one query.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Local Pokédex store '{self.path}' does not exist. Build it first.")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+
+    def get_pokemon(self, name_or_id: Union[str, int], game: str) -> Optional[Dict[str, Any]]:
+        column = "id" if str(name_or_id).isdigit() else "name"
+        with self._lock:
+            row = self._conn.execute(
+                f"{POKEMON_WITH_MOVES_QUERY} WHERE p.{column} = :key",
+                {"game": game, "key": int(name_or_id) if column == "id" else name_or_id},
+            ).fetchone()
+        return None if row is None else self._to_record(row)
+
+    def iter_pokemon(self, game: str, batch_size: int = 100) -> Iterator[List[Dict[str, Any]]]:
+        """Stream every pokemon (with its moves for `game`) in id order, `batch_size` records at a time."""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"{POKEMON_WITH_MOVES_QUERY} WHERE p.id > :last_id ORDER BY p.id LIMIT :batch_size",
+                    {"game": game, "last_id": last_id, "batch_size": batch_size},
+                ).fetchall()
+            if not rows:
+                return
+            yield [self._to_record(row) for row in rows]
+            last_id = rows[-1][0]
+
+    @staticmethod
+    def _to_record(row: tuple) -> Dict[str, Any]:
+        _, record, moves = row
+        record = json.loads(record)
+        record["moves"] = json.loads(moves)
+        return record
+
+    def get_moves(self, names_or_ids: List[Union[str, int]]) -> Dict[str, Dict[str, Any]]:
+        ids = [int(key) for key in names_or_ids if str(key).isdigit()]
+        names = [key for key in names_or_ids if not str(key).isdigit()]
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT record FROM moves WHERE id IN ({','.join('?' * len(ids))}) "
+                f"OR name IN ({','.join('?' * len(names))})",
+                (*ids, *names),
+            ).fetchall()
+        moves = [json.loads(row[0]) for row in rows]
+        return {move["url"]: move for move in moves}
+
+    def get_all_pokemon_names(self) -> Dict[str, str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT name, id FROM pokemon ORDER BY id").fetchall()
+        return {name: f"/api/v2/pokemon/{pokemon_id}/" for name, pokemon_id in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _resource_id(url: str) -> int:
+    return int(url.rstrip("/").split("/")[-1])
+
+
+def _resource_key(url: str) -> str:
+    # "https://pokeapi.co/api/v2/ability/65/" or "/api/v2/ability/65/" -> "ability/65"
+    return url.split("/api/v2/", 1)[-1].strip("/")
+
+
+def _dump_path(dump_dir: Path, url: str) -> Path:
+    return dump_dir / _resource_key(url) / "index.json"
+
+
+def _load_json(path: Path) -> Any:
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _iter_resources(dump_dir: Path, resource: str) -> Iterator[Any]:
+    resource_dir = dump_dir / resource
+    if not resource_dir.is_dir():
+        return
+    for entry in sorted(resource_dir.iterdir(), key=lambda p: (len(p.name), p.name)):
+        if entry.name.isdigit() and (entry / "index.json").exists():
+            yield _load_json(entry / "index.json")
+
+
+def build_local_store(dump_dir: Union[str, Path], output_path: Union[str, Path]) -> Path:
+    """
+    Ingest a PokeAPI data dump (the `api/v2` directory of PokeAPI/api-data) into a local Pokédex store.
+    """
+    from src.data_extractor import DataExtractor
+
+    dump_dir = Path(dump_dir)
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if output_path.exists():
+        output_path.unlink()
+
+    conn = sqlite3.connect(str(output_path))
+    conn.executescript(SCHEMA)
+
+    # Abilities and species are shared by many pokemon, so they are kept in memory (keyed by "<resource>/<id>")
+    shared: Dict[str, Any] = {}
+    for ability in _iter_resources(dump_dir, "ability"):
+        shared[f"ability/{ability['id']}"] = ability
+        english = [entry for entry in ability.get("effect_entries", []) if entry["language"]["name"] == "en"]
+        conn.execute(
+            "INSERT INTO abilities (id, name, record) VALUES (?, ?, ?)",
+            (ability["id"], ability["name"], json.dumps({"name": ability["name"], "effect": english[0]["effect"] if english else None})),
+        )
+    for species in _iter_resources(dump_dir, "pokemon-species"):
+        shared[f"pokemon-species/{species['id']}"] = species
+        genus = DataExtractor._english_genus(species)
+        conn.execute(
+            "INSERT INTO species (id, name, record) VALUES (?, ?, ?)",
+            (species["id"], species["name"], json.dumps({"name": species["name"], "genus": genus})),
+        )
+
+    n_moves = 0
+    for move in _iter_resources(dump_dir, "move"):
+        record = DataExtractor.normalize_move(move)
+        record["url"] = f"/api/v2/move/{move['id']}/"
+        conn.execute("INSERT INTO moves (id, name, record) VALUES (?, ?, ?)", (move["id"], move["name"], json.dumps(record)))
+        n_moves += 1
+
+    n_pokemon = 0
+    for pokemon in _iter_resources(dump_dir, "pokemon"):
+        record = {"name": pokemon["name"]}
+        for attr in POKEMON_ATTRIBUTES:
+            field_data = pokemon.get(attr)
+            # Everything the normalizer would fetch must come from the dump, never from the network
+            sub_resource_urls = DataExtractor._sub_resource_urls(field_data, attr)
+            resolved = {}
+            for url in sub_resource_urls:
+                if _resource_key(url) in shared:
+                    resolved[url] = shared[_resource_key(url)]
+                elif _dump_path(dump_dir, url).exists():
+                    resolved[url] = _load_json(_dump_path(dump_dir, url))
+            if field_data is None or len(resolved) < len(sub_resource_urls):
+                record[attr] = None
+                continue
+            try:
+                record[attr] = DataExtractor._process_json_field(field_data, attr, resolved)
+            except (KeyError, TypeError, IndexError):
+                record[attr] = None
+        conn.execute("INSERT INTO pokemon (id, name, record) VALUES (?, ?, ?)", (pokemon["id"], pokemon["name"], json.dumps(record)))
+        conn.executemany(
+            "INSERT OR IGNORE INTO learnset (pokemon_id, version_group, move_id) VALUES (?, ?, ?)",
+            [
+                (pokemon["id"], detail["version_group"]["name"], _resource_id(move["move"]["url"]))
+                for move in pokemon.get("moves", [])
+                for detail in move["version_group_details"]
+            ],
+        )
+        n_pokemon += 1
+
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    logger.info(f"Local Pokédex store written to {output_path} ({n_pokemon} pokemon, {n_moves} moves)")
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the offline Pokédex store from a PokeAPI data dump.")
+    parser.add_argument("dump_dir", help="Path to the dump's api/v2 directory")
+    parser.add_argument("output_path", help="SQLite file to create")
+    args = parser.parse_args()
+    build_local_store(args.dump_dir, args.output_path)
@@ -0,0 +1,188 @@
+import heapq
+import itertools
+import threading
+import time
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config.logging import logger
+
+
+class RequestPriority(IntEnum):
+    """Lower value is served first."""
+    INTERACTIVE = 0
+    TOOL_CALL = 1
+    BACKGROUND = 2
+
+
+class SchedulerBusyError(RuntimeError):
+    """Raised instead of queuing when a priority class already has too many waiting requests."""
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without contacting the upstream while it is considered degraded."""
+
+
+class RequestScheduler:
+    """
+    Gatekeeper for outbound PokeAPI requests.
+
+    - Token bucket: at most `rate_per_second` requests on average, with bursts of up to `burst`.
+    - Priorities: waiting requests are released strictly by `RequestPriority`, then in arrival order.
+    - Backpressure: each priority class holds at most `max_queue` waiting requests; more are rejected
+      with `SchedulerBusyError`, as are requests that wait longer than `max_wait` seconds.
+    - Circuit breaker: after `failure_threshold` consecutive failures the circuit opens and requests fail
+      fast with `CircuitOpenError` for `reset_timeout` seconds, after which a single trial is let through.
+    """
+
+    def __init__(self, rate_per_second: float = 20.0,
+                 burst: int = 20,
+                 max_queue: int = 64,
+                 max_wait: Optional[float] = 30.0,
+                 failure_threshold: int = 5,
+                 reset_timeout: float = 30.0) -> None:
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._cond = threading.Condition()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._waiting: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._queued = {priority: 0 for priority in RequestPriority}
+
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+        self._submitted = {priority: 0 for priority in RequestPriority}
+        self._rejected = {priority: 0 for priority in RequestPriority}
+        self._total_wait = {priority: 0.0 for priority in RequestPriority}
+        self._max_wait_seen = {priority: 0.0 for priority in RequestPriority}
+        self._short_circuited = 0
+
+    def submit(self, fn: Callable[[], Any],
+               priority: RequestPriority = RequestPriority.TOOL_CALL,
+               is_failure: Callable[[Any], bool] = lambda result: False) -> Any:
+        """Run `fn` once the scheduler admits it. `is_failure` flags results (e.g. 5xx responses) for the breaker."""
+        trial = self._enter_circuit()
+        try:
+            self._acquire(priority)
+        except SchedulerBusyError:
+            self._leave_circuit(success=None, trial=trial)
+            raise
+        try:
+            result = fn()
+        except Exception:
+            self._leave_circuit(success=False, trial=trial)
+            raise
+        self._leave_circuit(success=not is_failure(result), trial=trial)
+        return result
+
+    def _acquire(self, priority: RequestPriority) -> None:
+        with self._cond:
+            if self._queued[priority] >= self.max_queue:
+                self._rejected[priority] += 1
+                raise SchedulerBusyError(f"Too many {priority.name.lower()} requests waiting for PokeAPI")
+            ticket = (int(priority), next(self._sequence))
+            heapq.heappush(self._waiting, ticket)
+            self._queued[priority] += 1
+            started = time.monotonic()
+            try:
+                while True:
+                    self._refill()
+                    if self._waiting[0] == ticket and self._tokens >= 1:
+                        self._tokens -= 1
+                        heapq.heappop(self._waiting)
+                        break
+                    timeout = (1 - self._tokens) / self.rate_per_second if self._waiting[0] == ticket else None
+                    if self.max_wait is not None:
+                        remaining = self.max_wait - (time.monotonic() - started)
+                        if remaining <= 0:
+                            self._waiting.remove(ticket)
+                            heapq.heapify(self._waiting)
+                            self._rejected[priority] += 1
+                            raise SchedulerBusyError(f"Waited more than {self.max_wait}s for a PokeAPI request slot")
+                        timeout = remaining if timeout is None else min(timeout, remaining)
+                    self._cond.wait(timeout)
+            finally:
+                self._queued[priority] -= 1
+                self._cond.notify_all()
+            waited = time.monotonic() - started
+            self._submitted[priority] += 1
+            self._total_wait[priority] += waited
+            self._max_wait_seen[priority] = max(self._max_wait_seen[priority], waited)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate_per_second)
+        self._last_refill = now
+
+    def _enter_circuit(self) -> bool:
+        """Admit a request past the breaker; True when it is the half-open trial."""
+        with self._cond:
+            if self._opened_at is None:
+                return False
+            if time.monotonic() - self._opened_at >= self.reset_timeout and not self._trial_in_flight:
+                # Half-open: let exactly one request probe the upstream
+                self._trial_in_flight = True
+                return True
+            self._short_circuited += 1
+            raise CircuitOpenError("PokeAPI circuit is open after repeated failures")
+
+    def _leave_circuit(self, success: Optional[bool], trial: bool) -> None:
+        """
+        Report a request's outcome (None: it never reached the upstream). Only the trial closes or reopens an open
+        circuit; requests admitted before it opened just update the failure count.
+        """
+        with self._cond:
+            if trial:
+                self._trial_in_flight = False
+                if success:
+                    logger.info("PokeAPI circuit closed again")
+                    self._consecutive_failures = 0
+                    self._opened_at = None
+                elif success is not None:
+                    self._consecutive_failures += 1
+                    logger.warning("PokeAPI circuit opened again after a failed trial request")
+                    self._opened_at = time.monotonic()
+                return
+            if success is None:
+                return
+            if success:
+                self._consecutive_failures = 0
+                return
+            self._consecutive_failures += 1
+            if self._opened_at is None and self._consecutive_failures >= self.failure_threshold:
+                logger.warning(f"PokeAPI circuit opened after {self._consecutive_failures} consecutive failures")
+                self._opened_at = time.monotonic()
+
+    @property
+    def circuit_state(self) -> str:
+        with self._cond:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self._opened_at >= self.reset_timeout else "open"
+
+    def stats(self) -> Dict[str, Any]:
+        state = self.circuit_state
+        with self._cond:
+            return {
+                "circuit": state,
+                "short_circuited": self._short_circuited,
+                "tokens": round(self._tokens, 2),
+                **{
+                    priority.name.lower(): {
+                        "queue_depth": self._queued[priority],
+                        "submitted": self._submitted[priority],
+                        "rejected": self._rejected[priority],
+                        "avg_wait": self._total_wait[priority] / self._submitted[priority] if self._submitted[priority] else 0.0,
+                        "max_wait": self._max_wait_seen[priority],
+                    }
+                    for priority in RequestPriority
+                },
+            }
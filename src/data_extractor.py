@@ -1,48 +1,198 @@
 import copy
-from typing import Union, List, Dict, Any, Annotated
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, List, Dict, Any, Annotated, Optional, Iterable, Iterator
 
-import requests
+import orjson
 
-GAME_TO_REPLICATE = "emerald"
+from config.config import Config
+from config.logging import logger
+
+from src.data_extraction.cache import ResponseCache
+from src.data_extraction.http_client import HttpClient
+from src.data_extraction.learnset import LearnsetIndex, learnsets_by_game
+from src.data_extraction.local_store import LocalPokedexStore
+from src.data_extraction.scheduler import CircuitOpenError, RequestPriority, RequestScheduler, SchedulerBusyError
+from src.data_extraction.single_flight import SingleFlight
+
+# Version group whose learnsets are served, configurable through `GAME` in config.yml
+GAME_TO_REPLICATE = Config().get("GAME") or "emerald"
+
+# Top-level keys kept from sub-resource and move payloads; everything else is dropped right after parsing
+SUB_RESOURCE_FIELDS = ("effect_entries", "genera")
+MOVE_FIELDS = ("id", "name", "flavor_text_entries", "type", "damage_class", "accuracy",
+               "power", "pp", "priority", "stat_changes", "meta")
 
 
 class DataExtractor:
-    def __init__(self, source: str):
+    # Shared by every extractor in the process so that static helpers such as
+    # `extract_from_url` also benefit from it. Disabled (None) unless configured.
+    cache: Optional[ResponseCache] = None
+    # Pooled keep-alive client used for every request; replace it to tune timeouts, retries or pool size
+    http_client: HttpClient = HttpClient()
+    # Rate limits, prioritizes and circuit-breaks outbound requests when configured
+    scheduler: Optional[RequestScheduler] = None
+    # Coalesces identical in-flight requests coming from concurrent battles or tool calls
+    in_flight: SingleFlight = SingleFlight()
+    # Precomputed game -> pokemon -> legal moves; when None, learnsets are derived from each payload
+    learnset_index: Optional[LearnsetIndex] = None
+
+    def __init__(self, source: Union[str, LocalPokedexStore], max_workers: int = 8, game: Optional[str] = None,
+                 priority: RequestPriority = RequestPriority.TOOL_CALL):
+        # Either the PokeAPI pokemon endpoint or an offline store built with `build_local_store`
         self.source = source
+        # Version group used to decide which moves a pokemon can learn
+        self.game = game or GAME_TO_REPLICATE
+        self.local_store = source if isinstance(source, LocalPokedexStore) else None
+        # Upper bound on simultaneous requests issued by `fetch_many`
+        self.max_workers = max_workers
+        # Scheduling class of every request this extractor issues
+        self.priority = priority
 
-    def extract_full_data(self, pokemon_name: Union[str, List] = "all") -> List[str]:
-        # Placeholder for extraction logic
-        data_output = []
+    def extract_full_data(self, pokemon_name: Union[str, List] = "all",
+                          fields: Optional[List[str]] = None) -> Union[List[Dict], Iterator[Dict]]:
+        """Raw pokemon payloads, optionally pruned to the top-level `fields` as soon as they are parsed."""
         if pokemon_name == "all":
-            pass
-        elif isinstance(pokemon_name, list):
-            for name in pokemon_name:
-                response = requests.get(f"{self.source}/{name}")
-                if response.status_code == 404:
-                    raise ValueError(f"Pokemon '{name}' not found in the API. Make sure you did not misspell it.")
-                pokemon_info = response.json()
-                pokemon_info["name"] = name
-                data_output.append(pokemon_info)
+            return (pokemon_info for batch in self._iter_full_data_batches(fields=fields) for pokemon_info in batch)
+        names = pokemon_name if isinstance(pokemon_name, list) else [pokemon_name]
+        return self._extract_batch(names, fields=fields)
+
+    def _extract_batch(self, names: List[str], skip_missing: bool = False,
+                       fields: Optional[List[str]] = None) -> List[Dict]:
+        data_output = []
+        if self.local_store is not None:
+            # Records in the local store are already normalized and carry their game-legal moves
+            fetched = {name: self.local_store.get_pokemon(name, self.game) for name in dict.fromkeys(names)}
         else:
-            response = requests.get(f"{self.source}/{pokemon_name}")
-            pokemon_info = response.json()
+            by_url = self.fetch_many((f"{self.source}/{name}" for name in names), fields=fields)
+            fetched = {name: by_url[f"{self.source}/{name}"] for name in names}
+        for name in names:
+            pokemon_info = fetched[name]
+            if pokemon_info is None:
+                if skip_missing:
+                    logger.warning(f"Pokemon '{name}' is listed by the source but could not be loaded, skipping it.")
+                    continue
+                where = "local store" if self.local_store is not None else "API"
+                raise ValueError(f"Pokemon '{name}' not found in the {where}. Make sure you did not misspell it.")
+            # Shallow copy: the same payload is shared when a name is requested twice (mirror matches)
+            pokemon_info = dict(pokemon_info)
             pokemon_info["name"] = name
             data_output.append(pokemon_info)
         return data_output
-    
-    def extract_specific_attribute(self, pokemon_list: Union[str, List], attributes: List[str]) -> List[str]:
+
+    def _iter_full_data_batches(self, page_size: int = 100, fields: Optional[List[str]] = None) -> Iterator[List[Dict]]:
+        """Walk the whole dex in batches of `max_workers` pokemon, so at most one batch is held or in flight."""
+        if self.local_store is not None:
+            yield from self.local_store.iter_pokemon(self.game, batch_size=self.max_workers)
+            return
+        for page in self.iter_pokemon_name_pages(page_size):
+            names = list(page)
+            for start in range(0, len(names), self.max_workers):
+                yield self._extract_batch(names[start:start + self.max_workers], skip_missing=True, fields=fields)
+
+    def extract_specific_attribute(self, pokemon_list: Union[str, List], attributes: List[str]) -> Union[List[Dict], Iterator[Dict]]:
+        attributes = [self.__transform_attr_name(attr) for attr in attributes]
+        # Raw payloads are pruned to the requested attributes as soon as they are parsed
+        if pokemon_list == "all":
+            # Streaming mode: records are normalized and handed out batch by batch
+            return (
+                pkmn_info
+                for batch in self._iter_full_data_batches(fields=attributes)
+                for pkmn_info in self._process_batch(batch, attributes)
+            )
+        return self._process_batch(self.extract_full_data(pokemon_list, fields=attributes), attributes)
+
+    def _process_batch(self, pokemon_data: List[Dict], attributes: List[str]) -> List[Dict]:
         output = []
-        pokemon_data = self.extract_full_data(pokemon_list)
+        if self.local_store is not None:
+            return [{"name": pkmn_info["name"], **{attr: pkmn_info.get(attr) for attr in attributes}} for pkmn_info in pokemon_data]
+        # Second level of the dependency graph: resolve every sub-resource of every pokemon in one concurrent batch
+        sub_resource_urls = [
+            url
+            for pkmn_info in pokemon_data
+            for attr in attributes
+            for url in self._sub_resource_urls(pkmn_info.get(attr, None), attr)
+        ]
+        resolved = self.fetch_many(sub_resource_urls, fields=SUB_RESOURCE_FIELDS)
         for pkmn_info in pokemon_data:
             for attr in attributes:
-                attr = self.__transform_attr_name(attr)
                 attr_info = pkmn_info.get(attr, None)
-                pkmn_info[attr] = self._process_json_field(attr_info, attr)
+                if attr == "moves" and self.learnset_index is not None:
+                    pkmn_info[attr] = self.learnset_index.get_or_add(pkmn_info["name"], self.game, attr_info)
+                else:
+                    pkmn_info[attr] = self._process_json_field(attr_info, attr, resolved, self.game)
             output.append(pkmn_info)
         return output
-    
+
+    def fetch_many(self, urls: Iterable[str], fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Fetch several URLs concurrently (at most `max_workers` at a time). Returns a url -> JSON mapping.
+        If `fields` is given, JSON objects are pruned to those top-level keys.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        if len(unique_urls) <= 1:
+            return {url: self._get_json(url, fields, priority=self.priority) for url in unique_urls}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique_urls))) as executor:
+            return dict(zip(unique_urls, executor.map(lambda url: self._get_json(url, fields, priority=self.priority), unique_urls)))
+
+    def extract_moves(self, move_refs: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Return normalized move data (see `normalize_move`) for `{"name", "url"}` move references, keyed by url."""
+        move_refs = list(move_refs)
+        # Moves coming from the local store are already normalized
+        moves = {ref["url"]: ref for ref in move_refs if "damage_class" in ref}
+        pending_urls = [ref["url"] for ref in move_refs if ref["url"] not in moves]
+        for url, move_data in self.fetch_many(pending_urls, fields=MOVE_FIELDS).items():
+            moves[url] = self.normalize_move(move_data)
+        return moves
+
+    @staticmethod
+    def normalize_move(move_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Project a raw `/move/{id}` payload onto the fields used to build a `Moves` object."""
+        meta = move_data.get("meta") or {}
+        flavor_text_entries = move_data.get("flavor_text_entries") or [{}]
+        return {
+            "id": move_data.get("id"),
+            "name": move_data["name"],
+            "description": flavor_text_entries[0].get("flavor_text"),
+            "type": move_data["type"]["name"],
+            "damage_class": move_data["damage_class"]["name"],
+            "accuracy": move_data["accuracy"],
+            "power": move_data["power"],
+            "pp": move_data["pp"],
+            "priority": move_data["priority"],
+            "stat_changes": [stat_change["change"] for stat_change in move_data.get("stat_changes", [])],
+            "ailment": (meta.get("ailment") or {}).get("name"),
+            "ailment_chance": meta.get("ailment_chance", 0),
+        }
+
     @staticmethod
-    def _process_json_field(field_data: Union[str, Any], attr: str) -> Union[str, Any]:
+    def _sub_resource_urls(field_data: Union[str, Any], attr: str) -> List[str]:
+        if field_data is None:
+            return []
+        if attr == "abilities":
+            return [ability['ability']['url'] for ability in field_data]
+        if attr == "location_area_encounters":
+            return [field_data]
+        if attr == "species":
+            return [field_data['url']]
+        return []
+
+    @classmethod
+    def _resolve(cls, url: str, resolved: Optional[Dict[str, Any]] = None) -> Any:
+        if resolved is not None and url in resolved:
+            return resolved[url]
+        return cls._get_json(url)
+
+    @staticmethod
+    def _english_genus(species_response: Dict[str, Any]) -> str:
+        """English genus of a pokemon-species resource, without the trailing ' Pokémon'."""
+        species_eng = [species["genus"] for species in species_response.get('genera', [{}]) if species["language"]["name"] == "en"]
+        species_eng_name = species_eng[0] if len(species_eng) else "No species found"
+        return species_eng_name.replace(" Pokémon", "")
+
+    @classmethod
+    def _process_json_field(cls, field_data: Union[str, Any], attr: str,
+                            resolved: Optional[Dict[str, Any]] = None,
+                            game: str = GAME_TO_REPLICATE) -> Union[str, Any]:
         processed_data = None
         if attr == "id":
             processed_data = field_data
@@ -56,7 +206,7 @@ class DataExtractor:
         if attr == "abilities":
             ability_data = {ability['ability']['name']: ability['ability']['url'] for ability in field_data}
             for ability_name, ability_url in ability_data.items():
-                ability_response = requests.get(ability_url).json()
+                ability_response = cls._resolve(ability_url, resolved)
                 ability_info_list = ability_response.get('effect_entries', [{}])
                 ability_info_eng = [ability for ability in ability_info_list if ability["language"]["name"] == "en"]
                 ability_data[ability_name] = ability_info_eng[0]["effect"] if len(ability_info_eng) else None
@@ -67,21 +217,14 @@ class DataExtractor:
             # processed_data = DataExtractor.convert_decimeters_to_feet_inches(field_data)
             processed_data = round(field_data / 10, 2)
         if attr == "location_area_encounters":
-            all_locations = requests.get(field_data).json()
+            all_locations = cls._resolve(field_data, resolved)
             all_location_names = [loc['location_area']['name'].replace("-", " ").title() for loc in all_locations]
             locations = ", ".join(all_location_names) if len(all_location_names) else "This pokemon has no specific location area encounters."
             processed_data = locations
         if attr == "moves":
-            processed_data = []
-            for move in field_data:
-                is_in_game = any([game["version_group"]["name"] == GAME_TO_REPLICATE for game in move["version_group_details"]])
-                if is_in_game:
-                    processed_data.append(move['move'])
+            processed_data = learnsets_by_game(field_data).get(game, [])
         if attr == "species":
-            species_response = requests.get(field_data['url']).json()
-            species_eng = [species["genus"] for species in species_response.get('genera', [{}]) if species["language"]["name"] == "en"]
-            species_eng_name = species_eng[0] if len(species_eng) else "No species found"
-            processed_data = species_eng_name.replace(" Pokémon", "")
+            processed_data = cls._english_genus(cls._resolve(field_data['url'], resolved))
         if attr == "weight":
             # processed_data = DataExtractor.convert_hectograms_to_pounds(field_data)
             # processed_data += f" (or {DataExtractor.convert_hectograms_to_kilograms(field_data)})"
@@ -103,11 +246,23 @@ class DataExtractor:
         return attr
 
     def get_all_pokemon_names(self) -> Dict[str, str]:
-        response = requests.get(f"{self.source}?limit=100000")
-        all_pokemons = response.json()
-        pokemon_names = {pokemon['name']:pokemon['url'] for pokemon in all_pokemons.get('results', [])}
+        if self.local_store is not None:
+            return self.local_store.get_all_pokemon_names()
+        pokemon_names = {}
+        for page in self.iter_pokemon_name_pages():
+            pokemon_names.update(page)
         return pokemon_names
 
+    def iter_pokemon_name_pages(self, page_size: int = 100) -> Iterator[Dict[str, str]]:
+        """Follow PokeAPI's `next` links, yielding one `{name: url}` page at a time."""
+        next_url = f"{self.source}?limit={page_size}&offset=0"
+        while next_url:
+            page = self._get_json(next_url, priority=self.priority)
+            if page is None:
+                break
+            yield {pokemon['name']: pokemon['url'] for pokemon in page.get('results', [])}
+            next_url = page.get('next')
+
     @staticmethod
     def convert_decimeters_to_feet_inches(decimeters: float) -> str:
         total_inches = round(decimeters * 39.3701 / 10, 0)
@@ -126,7 +281,79 @@ class DataExtractor:
         kilograms = round(hectograms / 10, 2)
         return f"{kilograms} kg"
 
+    @classmethod
+    def extract_from_url(cls, url: str) -> Dict[str, Any]:
+        return cls._get_json(url)
+
+    @classmethod
+    def _get_json(cls, url: str, fields: Optional[Iterable[str]] = None,
+                  priority: RequestPriority = RequestPriority.TOOL_CALL) -> Optional[Any]:
+        """
+        Fetch `url` and decode its JSON body, going through the response cache when enabled. Returns None on 404.
+        If `fields` is given, a JSON object is pruned to those top-level keys right after parsing.
+        """
+        # Concurrent callers asking for the same URL share one fetch; each then parses its own copy of the body
+        body = cls.in_flight.do(url, lambda: cls._fetch_body(url, priority))
+        return None if body is None else cls._parse(body, fields)
+
+    @classmethod
+    def _fetch_body(cls, url: str, priority: RequestPriority = RequestPriority.TOOL_CALL) -> Optional[bytes]:
+        cached = cls.cache.get(url) if cls.cache is not None else None
+        if cached is not None and cls.cache.is_fresh(cached):
+            cls.cache.record_hit()
+            return cached.body
+
+        try:
+            response = cls._send(url, cached.revalidation_headers() if cached is not None else None, priority)
+        except (CircuitOpenError, SchedulerBusyError) as exc:
+            if cached is None:
+                raise
+            logger.warning(f"PokeAPI unavailable ({exc}), serving stale cached copy of {url}")
+            return cached.body
+        if cached is not None:
+            if response.status_code == 304:
+                cls.cache.mark_revalidated(url)
+                return cached.body
+            if cls._upstream_failed(response):
+                logger.warning(f"PokeAPI answered {response.status_code}, serving stale cached copy of {url}")
+                return cached.body
+        if cls.cache is not None:
+            cls.cache.record_miss()
+
+        if response.status_code == 404:
+            return None
+        if response.status_code not in (200, 304):
+            # Retries are spent by now: never hand a 429/5xx error page back as data
+            response.raise_for_status()
+        body = response.content
+        if cls.cache is not None and response.status_code == 200:
+            cls.cache.put(
+                url,
+                body,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return body
+
+    @classmethod
+    def _send(cls, url: str, headers: Optional[Dict[str, str]], priority: RequestPriority) -> Any:
+        if cls.scheduler is None:
+            return cls.http_client.get(url, headers=headers) if headers else cls.http_client.get(url)
+
+        # Every attempt, retries included, takes its own token and reports to the circuit breaker
+        def gate(attempt):
+            return cls.scheduler.submit(attempt, priority, is_failure=cls._upstream_failed)
+
+        return cls.http_client.get(url, headers=headers, gate=gate)
+
+    @staticmethod
+    def _upstream_failed(response: Any) -> bool:
+        """5xx answers and 429 throttling both mean PokeAPI is struggling."""
+        return response.status_code == 429 or response.status_code >= 500
+
     @staticmethod
-    def extract_from_url(url: str) -> Dict[str, Any]:
-        response = requests.get(url)
-        return response.json()
+    def _parse(body: bytes, fields: Optional[Iterable[str]] = None) -> Any:
+        data = orjson.loads(body)
+        if fields is None or not isinstance(data, dict):
+            return data
+        return {field: data[field] for field in fields if field in data}
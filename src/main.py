@@ -7,10 +7,16 @@ from huggingface_hub import InferenceClient
 from config.config import Config
 from src.prompts import system_prompt
 from src.data_extractor import DataExtractor
+from src.data_extraction.cache import ResponseCache
+from src.data_extraction.learnset import LearnsetIndex
+from src.data_extraction.scheduler import RequestScheduler
 
 client = InferenceClient()
 config = Config()
 api_url = config.get('POKEMON_API')
+DataExtractor.cache = ResponseCache()
+DataExtractor.learnset_index = LearnsetIndex()
+DataExtractor.scheduler = RequestScheduler()
 data_extractor = DataExtractor(source=api_url)
 
 
@@ -1,6 +1,7 @@
+import logging
 from typing import Dict, List, Tuple
-from functools import reduce
-import operator
+
+import numpy as np
 
 from config.logging import logger
 from src.pokemon.moves.moves import Moves
@@ -44,37 +45,51 @@ TYPE_CHART: Dict[str, Dict[str, float]] = {
                  "dark": 2, "steel": 0.5},
 }
 
+# Type codes index these tables, in `PokemonType` declaration order (see `PokemonType.code`)
+TYPE_ORDER: List[PokemonType] = list(PokemonType)
+# Code standing for "no second type" in the dual-type table
+NO_TYPE = len(TYPE_ORDER)
+
+# TYPE_MATRIX[attack_type, defender_type]
+TYPE_MATRIX = np.array(
+    [[TYPE_CHART[attacking.value].get(defending.value, 1.0) for defending in TYPE_ORDER] for attacking in TYPE_ORDER]
+)
+# DUAL_TYPE_TABLE[attack_type, defender_type_1, defender_type_2], with NO_TYPE as the second type of mono-type pokemon
+DUAL_TYPE_TABLE = np.concatenate(
+    [TYPE_MATRIX[:, :, None] * TYPE_MATRIX[:, None, :], TYPE_MATRIX[:, :, None]], axis=2
+)
+TYPE_MATRIX.flags.writeable = False
+DUAL_TYPE_TABLE.flags.writeable = False
+
+
+def type_codes(defender_types: List[PokemonType]) -> Tuple[int, int]:
+    """(type_1, type_2) codes of a pokemon for `DUAL_TYPE_TABLE`."""
+    if not 1 <= len(defender_types) <= 2:
+        raise ValueError("Defender must have 1 or 2 types.")
+    codes = [PokemonType(defender_type).code for defender_type in defender_types]
+    return codes[0], codes[1] if len(codes) == 2 else NO_TYPE
+
+
+def effectiveness_array(move_types: np.ndarray, defender_type_1: np.ndarray, defender_type_2: np.ndarray) -> np.ndarray:
+    """Multipliers for arrays of move type codes against defender type codes; the arguments broadcast together."""
+    return DUAL_TYPE_TABLE[move_types, defender_type_1, defender_type_2]
+
+
 def effectiveness(move: Moves, defender_types: List[PokemonType]) -> float:
     """
     Calculate total effectiveness of a move against a Pokémon with 1 or 2 types.
     Returns: 0, 0.25, 0.5, 1, 2, or 4 (etc.)
     """
-    move_type = move.type
-    move_type = move_type.lower()
-    multipliers = []
-    
-    for def_type in defender_types:
-        def_type = def_type.lower()
-        multipliers.append(TYPE_CHART.get(move_type, {}).get(def_type, 1.0))
-
-    if len(multipliers) > 0:
-        ValueError("No defender types provided.")
-    
-    if len(multipliers) == 1:
-        return multipliers[0]
-    
-    if len(multipliers) == 2:
-        value = reduce(operator.mul, multipliers, 1.0)
+    type_1, type_2 = type_codes(defender_types)
+    value = float(DUAL_TYPE_TABLE[PokemonType(move.type).code, type_1, type_2])
+    if type_2 != NO_TYPE and logger.isEnabledFor(logging.INFO):
         if value > 1:
             logger.info(f"{move.name} ({move.type.value}) is very effective! ({value}x)")
         if 0 < value < 1:
             logger.info(f"{move.name} ({move.type.value}) is not very effective ({value}x).")
         if value == 0:
             logger.info(f"{move.name} ({move.type.value}) did not affect at all (0x).")
-        return reduce(operator.mul, multipliers, 1.0)
-    
-    else:
-        ValueError("Defender can only have 1 or 2 types.")
+    return value
 
 
 def get_effectiveness_label(multiplier: float) -> str:
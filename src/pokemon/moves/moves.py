@@ -1,4 +1,4 @@
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, ConfigDict, model_validator
 from typing import List, Dict
 
 from src.pokemon.types import PokemonType
@@ -6,6 +6,9 @@ from src.battlefield.status import NVStatus
 
 
 class Moves(BaseModel):
+    # Instances are shared between every Pokémon that knows the move (see MoveRegistry)
+    model_config = ConfigDict(frozen=True)
+
     name: str
     description: str
     type: PokemonType
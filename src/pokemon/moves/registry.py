@@ -0,0 +1,58 @@
+import threading
+from typing import Any, Dict, Iterable
+
+from src.data_extractor import DataExtractor
+from src.pokemon.moves.moves import Moves
+from src.battlefield.status import set_nvstatus_from_api
+
+
+class MoveRegistry:
+    """
+    Process-wide registry of `Moves` objects keyed by PokeAPI move name.
+
+    Each move is fetched, normalized and validated once; afterwards every Pokémon that knows it
+    shares the same immutable instance.
+    """
+
+    def __init__(self) -> None:
+        self._moves: Dict[str, Moves] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, move_refs: Iterable[Dict[str, Any]], data_extractor: DataExtractor) -> Dict[str, Moves]:
+        """Return the `Moves` for `{"name", "url"}` references, batch-loading the ones not seen yet."""
+        move_refs = list(move_refs)
+        missing = {ref["name"]: ref for ref in move_refs if ref["name"] not in self._moves}
+        if missing:
+            move_data_by_url = data_extractor.extract_moves(missing.values())
+            built = {name: self.build_move(name, move_data_by_url[ref["url"]]) for name, ref in missing.items()}
+            with self._lock:
+                for name, move in built.items():
+                    # Another thread may have registered it meanwhile; keep the first instance so it stays shared
+                    self._moves.setdefault(name, move)
+        return {ref["name"]: self._moves[ref["name"]] for ref in move_refs}
+
+    @staticmethod
+    def build_move(move_name: str, move_data: Dict[str, Any]) -> Moves:
+        return Moves(
+            name=move_name.replace("-", " "),
+            description=move_data["description"],
+            type=move_data["type"],
+            damage_class=move_data["damage_class"],
+            accuracy=max(move_data["accuracy"] if move_data["accuracy"] is not None else 100, 20),
+            power=move_data["power"] if move_data["power"] is not None else 50,
+            pp=move_data["pp"],
+            priority=move_data["priority"],
+            stat_changes=move_data["stat_changes"],
+            ailment_name=set_nvstatus_from_api(move_data["ailment"]),
+            ailment_prob=move_data["ailment_chance"] / 100,
+        )
+
+    def __len__(self) -> int:
+        return len(self._moves)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._moves.clear()
+
+
+move_registry = MoveRegistry()
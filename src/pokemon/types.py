@@ -20,3 +20,11 @@ class PokemonType(str, Enum):
     STEEL = "steel"
     FAIRY = "fairy"
     NORMAL = "normal"
+
+    @property
+    def code(self) -> int:
+        """Integer index of the type, used to address the effectiveness tables."""
+        return _TYPE_CODES[self]
+
+
+_TYPE_CODES = {pokemon_type: code for code, pokemon_type in enumerate(PokemonType)}
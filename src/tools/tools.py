@@ -1,16 +1,29 @@
 
+import os
+from functools import lru_cache
 from typing import Dict, List
 
 import numpy as np
 from langchain.tools import tool
 
 from src.data_extractor import DataExtractor
+from src.data_extraction.local_store import LocalPokedexStore
+from src.data_extraction.scheduler import RequestPriority
 from src.pokemon.pokemon import Pokemon
 from src.pokemon.stats import IV
 from src.pokemon.stats import EV
 from src.pokemon.stats import BaseStats, Stats
-from src.pokemon.moves.moves import Moves
-from src.battlefield.status import set_nvstatus_from_api
+from src.pokemon.moves.registry import move_registry
+
+
+@lru_cache(maxsize=1)
+def _get_data_extractor() -> DataExtractor:
+    """Read from the offline Pokédex when POKEDEX_STORE_PATH is set, otherwise from PokeAPI."""
+    store_path = os.environ.get("POKEDEX_STORE_PATH")
+    if store_path:
+        return DataExtractor(source=LocalPokedexStore(store_path))
+    # Battle loads are user-facing, so they go ahead of chat tool calls and background crawls
+    return DataExtractor(source="https://pokeapi.co/api/v2/pokemon", priority=RequestPriority.INTERACTIVE)
 
 
 # @tool
@@ -21,35 +34,23 @@ def get_pokemon_attributes(pokemon_list: List[str], **kwargs) -> List:
     else:
         attributes = ["id", "types", "stats", "species", "abilities", "cries", "height", "weight", "base_experience", "moves", "sprites"]
 
-    data_extractor = DataExtractor(source="https://pokeapi.co/api/v2/pokemon")
+    data_extractor = _get_data_extractor()
 
     pokemon_list: List = data_extractor.extract_specific_attribute(pokemon_list, attributes)
     final_list = []
     if "moves" in attributes:
-        for pokemon in pokemon_list:
+        given_moves_per_pokemon = [
+            np.random.choice(pokemon["moves"], size = min(len(pokemon["moves"]), 4), replace=False)
+            if "moves" in pokemon.keys() else []
+            for pokemon in pokemon_list
+        ]
+        # Last level of the dependency graph: moves not yet in the registry are loaded in one batch
+        moves_by_name = move_registry.get_many(
+            (move for given_moves in given_moves_per_pokemon for move in given_moves), data_extractor
+        )
+        for pokemon, given_moves in zip(pokemon_list, given_moves_per_pokemon):
             if "moves" in pokemon.keys():
-                given_moves = np.random.choice(pokemon["moves"], size = min(len(pokemon["moves"]), 4), replace=False)
-                final_given_moves = []
-                for move in given_moves:
-                    move_name = move['name'].replace("-", " ")
-                    move_url = move["url"]
-                    move_data = DataExtractor.extract_from_url(move_url)
-                    ailment_info = {} if move_data["meta"] is None else move_data["meta"]
-                    move_obj = Moves(
-                        name=move_name,
-                        description=move_data["flavor_text_entries"][0]["flavor_text"],
-                        type=move_data["type"]["name"],
-                        damage_class=move_data["damage_class"]["name"],
-                        accuracy=max(move_data["accuracy"] if move_data["accuracy"] is not None else 100, 20),
-                        power=move_data["power"] if move_data["power"] is not None else 50,
-                        pp=move_data["pp"],
-                        priority=move_data["priority"],
-                        stat_changes=[stat_change["change"] for stat_change in move_data.get("stat_changes", [])],
-                        ailment_name=set_nvstatus_from_api(ailment_info.get("ailment", {}).get("name")),
-                        ailment_prob=ailment_info.get("ailment_chance", 0) / 100,
-                    )
-                    final_given_moves.append(move_obj)
-            pokemon["moves"] = final_given_moves
+                pokemon["moves"] = [moves_by_name[move["name"]] for move in given_moves]
             final_list.append(pokemon)
     return final_list
 
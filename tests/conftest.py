@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from src.pokemon.pokemon import Pokemon
+from src.pokemon.moves.moves import Moves
+from src.battlefield.status import NVStatus
+from src.pokemon.stats import IV, EV, BaseStats, Stats
+
+
+class RecordingFakeChatModel(FakeListChatModel):
+    """Fake model that keeps the messages of every call and when it started and ended."""
+    received: list = []
+    intervals: list = []
+
+    def _call(self, messages, stop=None, run_manager=None, **kwargs):
+        self.received.append(messages)
+        started = time.perf_counter()
+        try:
+            return super()._call(messages, stop, run_manager, **kwargs)
+        finally:
+            self.intervals.append((started, time.perf_counter()))
+
+
+class AsyncFakeChatModel(RecordingFakeChatModel):
+    """
+    Fake model that waits on the event loop, like a real network client, instead of in an executor thread.
+    It also records how many calls were in flight at once.
+    """
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.received.append(messages)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        started = time.perf_counter()
+        try:
+            await asyncio.sleep(self.sleep or 0)
+        finally:
+            self.in_flight -= 1
+            self.intervals.append((started, time.perf_counter()))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.responses[0]))])
+
+
+def calls_overlap(first, second):
+    """Whether two recorded (start, end) intervals were in flight at the same time."""
+    return first[0] < second[1] and second[0] < first[1]
+
+
+def make_move(name, type, damage_class="physical", power=40, accuracy=100, ailment=NVStatus.NONE, ailment_prob=0.0, priority=0):
+    return Moves(
+        name=name, description=f"{name} description", type=type, damage_class=damage_class, accuracy=accuracy,
+        power=power, pp=20, priority=priority, stat_changes=[], ailment_name=ailment, ailment_prob=ailment_prob,
+    )
+
+
+def make_pokemon(name, types, base_stats, moves, level=50, pokemon_id=1):
+    return Pokemon(
+        id=pokemon_id, name=name, gender="male", types=types, level=level, ability="none", species=name,
+        height=1.0, weight=10.0, base_stats=BaseStats(*base_stats), stats=Stats(), iv=IV(), ev=EV(),
+        base_experience=100, moves=moves, sprite_front_url="", sprite_back_url="",
+    )
+
+
+@pytest.fixture
+def roster():
+    """Two small, network-free pokemon: a fast electric attacker and a bulkier water type."""
+    return {
+        "pikachu": make_pokemon("pikachu", ["electric"], (35, 55, 40, 50, 50, 90), [
+            make_move("thunder shock", "electric", "special", power=40, ailment=NVStatus.PARALIZED, ailment_prob=0.1),
+            make_move("quick attack", "normal", power=40, priority=1),
+            make_move("growl", "normal", "status", power=50),
+            make_move("thunderbolt", "electric", "special", power=90),
+        ], pokemon_id=25),
+        "squirtle": make_pokemon("squirtle", ["water"], (44, 48, 65, 50, 64, 43), [
+            make_move("tackle", "normal", power=40),
+            make_move("water gun", "water", "special", power=40),
+            make_move("tail whip", "normal", "status", power=50),
+            make_move("bite", "dark", power=60),
+        ], pokemon_id=7),
+    }
@@ -0,0 +1,49 @@
+import asyncio
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.battlefield.async_engine import AsyncBattleEngine, run_battles_sync
+from src.battlefield.policies import greedy_policy
+from tests.conftest import AsyncFakeChatModel, calls_overlap
+
+DECISION = '{"move": "thunderbolt", "explanation": "Electric beats water"}'
+
+
+def _engine(roster, llm, **kwargs):
+    return AsyncBattleEngine(roster["pikachu"], roster["squirtle"], llm=llm, foe_policy=greedy_policy, **kwargs)
+
+def test_async_battle_uses_ainvoke(roster):
+    engine = _engine(roster, FakeListChatModel(responses=[DECISION]), seed=1)
+    asyncio.run(engine.start_ai_battle())
+
+    assert engine.winner is not None
+    assert {move.name for move in engine.user_pokemon.moves_used} == {"thunderbolt"}
+
+def test_battles_run_concurrently_under_the_cap(roster):
+    llm = AsyncFakeChatModel(responses=[DECISION], sleep=0.05)
+    engines = [_engine(roster, llm, seed=seed, max_rounds=3) for seed in range(20)]
+    outcomes = run_battles_sync(engines, max_concurrency=5)
+
+    assert all(outcome.error is None for outcome in outcomes)
+    assert 1 < llm.peak_in_flight <= 5
+
+def test_llm_timeouts_fail_only_their_battle(roster):
+    slow = _engine(roster, AsyncFakeChatModel(responses=[DECISION], sleep=1), llm_timeout=0.05, seed=0)
+    fast = _engine(roster, FakeListChatModel(responses=[DECISION]), llm_timeout=0.5, seed=0)
+    slow_outcome, fast_outcome = run_battles_sync([slow, fast], max_concurrency=2)
+
+    assert isinstance(slow_outcome.error, asyncio.TimeoutError)
+    assert fast_outcome.error is None and fast_outcome.winner is not None
+
+def test_simultaneous_async_rounds_gather_both_decisions(roster):
+    # Both sides ask the same model, so give squirtle a move with the same name
+    roster["squirtle"].moves[0] = roster["squirtle"].moves[0].model_copy(update={"name": "thunderbolt"})
+
+    llm = AsyncFakeChatModel(responses=[DECISION], sleep=0.05)
+    engine = AsyncBattleEngine(roster["pikachu"], roster["squirtle"], llm=llm, max_rounds=3, seed=0, simultaneous=True)
+    asyncio.run(engine.start_ai_battle())
+
+    assert engine.winner.name == "pikachu"
+    calls = sorted(llm.intervals)
+    assert len(calls) == 2 * engine.rounds_played
+    assert all(calls_overlap(calls[i], calls[i + 1]) for i in range(0, len(calls), 2))
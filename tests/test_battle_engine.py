@@ -0,0 +1,121 @@
+import time
+from unittest.mock import patch
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.battlefield.battle_engine import BattleEngine, UnknownMoveError
+from src.battlefield.search_trainer import SearchTrainer
+from tests.conftest import RecordingFakeChatModel, calls_overlap, make_move, make_pokemon
+
+
+def _duelists():
+    """A fast and a slow pokemon whose every hit knocks the other out; only the slow one has a priority move."""
+    fast = make_pokemon("jolteon", ["electric"], (20, 65, 40, 110, 40, 130), [
+        make_move("tackle", "normal", power=250),
+    ], pokemon_id=135)
+    slow = make_pokemon("snorlax", ["normal"], (20, 110, 40, 65, 40, 30), [
+        make_move("tackle", "normal", power=250),
+        make_move("quick attack", "normal", power=250, priority=1),
+    ], pokemon_id=143)
+    return fast, slow
+
+
+def _pick(name):
+    return lambda attacker, defender, rng: next(move for move in attacker.moves if move.name == name)
+
+
+def test_sequential_rounds_ignore_priority():
+    fast, slow = _duelists()
+    engine = BattleEngine(slow, fast, policy=_pick("tackle"), foe_policy=_pick("tackle"), seed=0)
+    engine.start_ai_battle()
+
+    assert engine.winner.name == "jolteon"
+
+def test_simultaneous_rounds_resolve_priority_before_speed():
+    fast, slow = _duelists()
+    engine = BattleEngine(slow, fast, policy=_pick("quick attack"), foe_policy=_pick("tackle"), seed=0, simultaneous=True)
+    engine.start_ai_battle()
+
+    assert engine.winner.name == "snorlax"
+    assert engine.rounds_played == 1
+
+def test_simultaneous_rounds_resolve_speed_on_equal_priority():
+    fast, slow = _duelists()
+    engine = BattleEngine(slow, fast, policy=_pick("tackle"), seed=0, simultaneous=True)
+    engine.start_ai_battle()
+
+    assert engine.winner.name == "jolteon"
+
+def test_simultaneous_rounds_request_both_llm_decisions_in_parallel():
+    user = make_pokemon("bulbasaur", ["grass"], (45, 49, 49, 65, 65, 45), [make_move("tackle", "normal", power=10)])
+    foe = make_pokemon("charmander", ["fire"], (39, 52, 43, 60, 50, 65), [make_move("tackle", "normal", power=10)])
+    llm = RecordingFakeChatModel(responses=['{"move": "tackle", "explanation": "Only move"}'], sleep=0.05)
+    engine = BattleEngine(user, foe, llm=llm, max_rounds=3, seed=0, simultaneous=True)
+    engine.start_ai_battle()
+
+    calls = sorted(llm.intervals)
+    assert len(calls) == 2 * engine.rounds_played
+    # Both decisions of a round are in flight together
+    assert all(calls_overlap(calls[i], calls[i + 1]) for i in range(0, len(calls), 2))
+
+class _AnswersWellWhenCorrected(FakeListChatModel):
+    """Answers with prose first and valid JSON once it is told its answer was not valid."""
+
+    def _call(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.sleep)
+        if "not valid" in messages[-1].content:
+            return '{"move": "tackle", "explanation": "Only sure hit"}'
+        return "I would tackle"
+
+def test_simultaneous_retries_share_the_engine_safely():
+    fast, slow = _duelists()
+    engine = BattleEngine(slow, fast, llm=_AnswersWellWhenCorrected(responses=[""], sleep=0.05), seed=0, simultaneous=True)
+    original = BattleEngine.build_decision_chain
+
+    def slow_build(llm):
+        time.sleep(0.05)
+        return original(llm)
+
+    with patch.object(BattleEngine, "build_decision_chain", side_effect=slow_build) as build:
+        starts_move, follows_move = engine.choose_moves_simultaneously(engine.user_pokemon, engine.foe_pokemon)
+
+    assert starts_move.name == follows_move.name == "tackle"
+    assert engine.decision_retries == 2
+    build.assert_called_once_with(engine.llm)
+
+def test_search_trainer_is_rejected_in_simultaneous_rounds():
+    fast, slow = _duelists()
+    with pytest.raises(ValueError, match="SearchTrainer"):
+        BattleEngine(slow, fast, policy=_pick("tackle"), foe_policy=SearchTrainer(), simultaneous=True)
+
+def _llm_engine(roster, responses, **kwargs):
+    return BattleEngine(roster["pikachu"], roster["squirtle"], llm=FakeListChatModel(responses=responses),
+                        foe_policy=_pick("tackle"), seed=0, **kwargs)
+
+def test_decision_chain_is_built_once_per_engine(roster):
+    engine = _llm_engine(roster, ['{"move": "thunderbolt", "explanation": "Strongest"}'], max_rounds=3)
+    with patch.object(BattleEngine, "build_decision_chain", wraps=BattleEngine.build_decision_chain) as build:
+        engine.start_ai_battle()
+
+    assert len(engine.user_pokemon.moves_used) > 1
+    assert {move.name for move in engine.user_pokemon.moves_used} == {"thunderbolt"}
+    build.assert_called_once_with(engine.llm)
+
+def test_invalid_answers_are_asked_again(roster):
+    engine = _llm_engine(roster, [
+        "I would use thunderbolt",
+        '{"move": "hyper beam", "explanation": "Strongest"}',
+        '{"move": "Thunderbolt ", "explanation": "Strongest"}',
+    ])
+    move = engine.choose_move(engine.user_pokemon, engine.foe_pokemon)
+
+    assert move.name == "thunderbolt"
+    assert engine.decision_retries == 2
+
+def test_unknown_moves_raise_once_retries_are_spent(roster):
+    engine = _llm_engine(roster, ['{"move": "hyper beam", "explanation": "Strongest"}'], max_decision_retries=1)
+
+    with pytest.raises(UnknownMoveError, match="hyper beam"):
+        engine.choose_move(engine.user_pokemon, engine.foe_pokemon)
+    assert engine.decision_retries == 1
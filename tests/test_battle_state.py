@@ -0,0 +1,63 @@
+from src.battlefield.status import NVStatus
+from src.battlefield.battle_pokemon import BattlePokemon
+from src.battlefield.battle_state import FOE, USER, BattleState
+
+
+def _battle_pokemon(roster):
+    return BattlePokemon.from_pokemon_class(roster["pikachu"]), BattlePokemon.from_pokemon_class(roster["squirtle"])
+
+def test_battle_pokemon_do_not_share_mutable_state(roster):
+    first, second = BattlePokemon.from_pokemon_class(roster["pikachu"]), BattlePokemon.from_pokemon_class(roster["pikachu"])
+    first.history["HP"].append(10)
+    first.moves_used.append(first.moves[0])
+    first.stats.speed *= 0.75
+
+    assert second.history["HP"] == [] and second.moves_used == []
+    assert second.stats.speed == roster["pikachu"].stats.speed != first.stats.speed
+
+def test_state_snapshot_of_battle_pokemon(roster):
+    pikachu, squirtle = _battle_pokemon(roster)
+    pikachu.moves_used.append(pikachu.moves[3])
+    squirtle.nvstatus = NVStatus.PARALIZED
+    state = BattleState.from_battle_pokemon(pikachu, squirtle)
+
+    assert state.hp(USER) == pikachu.stats.hp
+    assert state.status(FOE) == NVStatus.PARALIZED
+    assert state.first == USER
+    assert state.pp(USER, 3) == pikachu.moves[3].pp - 1
+    assert state.usable_moves(FOE) == [0, 1, 2, 3]
+    assert state.stage(USER, "attack") == 0
+
+def test_clone_and_restore_are_independent(roster):
+    state = BattleState.from_battle_pokemon(*_battle_pokemon(roster))
+    snapshot = state.clone()
+    state.set_hp(FOE, 0)
+    state.set_status(USER, NVStatus.BURNT)
+    state.change_stage(USER, "speed", 8)
+    state.use_pp(USER, 0)
+    state.round_count += 1
+
+    assert state.is_terminal and not snapshot.is_terminal
+    assert state.stage(USER, "speed") == 6
+    assert snapshot.status(USER) == NVStatus.NONE and snapshot.round_count == 0
+    assert snapshot.pokemon is state.pokemon
+    state.restore(snapshot)
+    assert state == snapshot
+
+def test_round_trip_to_battle_pokemon(roster):
+    pikachu, squirtle = _battle_pokemon(roster)
+    state = BattleState.from_battle_pokemon(pikachu, squirtle)
+    state.set_hp(FOE, -3)
+    state.set_status(USER, NVStatus.POISONED)
+    state.set_speed(USER, 10)
+
+    new_pikachu, new_squirtle = state.to_battle_pokemon()
+    assert new_pikachu is not pikachu and pikachu.nvstatus == NVStatus.NONE
+    assert new_pikachu.nvstatus == NVStatus.POISONED and new_pikachu.stats.speed == 10
+    assert new_squirtle.current_hp == 0 and not new_squirtle.is_alive
+
+    state.apply_to()
+    assert not squirtle.is_alive
+    state.restore(BattleState.from_battle_pokemon(*_battle_pokemon(roster)))
+    state.apply_to()
+    assert squirtle.is_alive and squirtle.current_hp == squirtle.stats.hp
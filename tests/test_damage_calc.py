@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from src.battlefield.rng import BattleRNG
+from src.battlefield.status import NVStatus
+from src.battlefield.battle_pokemon import BattlePokemon
+from src.battlefield.damage_calc import _damage_distribution, _floored_roll, damage_distribution
+from tests.conftest import make_move
+
+
+@pytest.fixture
+def pikachu_vs_squirtle(roster):
+    return BattlePokemon.from_pokemon_class(roster["pikachu"]), BattlePokemon.from_pokemon_class(roster["squirtle"])
+
+def test_floored_roll_is_a_distribution():
+    pmf = _floored_roll(20.0)
+    assert set(pmf) == {17, 18, 19}
+    assert pmf[17] == pytest.approx(1 / 3)
+    assert sum(pmf.values()) == pytest.approx(1)
+
+def test_distribution_matches_sampled_compute_damage(pikachu_vs_squirtle):
+    pikachu, squirtle = pikachu_vs_squirtle
+    thunderbolt = pikachu.moves[3]
+    distribution = damage_distribution(pikachu, squirtle, thunderbolt)
+    rng = BattleRNG(0)
+    samples = np.array([pikachu.compute_damage(squirtle, thunderbolt, rng) for _ in range(20000)])
+
+    assert sum(distribution.probabilities) == pytest.approx(1)
+    assert samples.max() <= distribution.max
+    assert distribution.mean == pytest.approx(samples.mean(), rel=0.01)
+    for damage, probability in zip(distribution.damages, distribution.probabilities):
+        assert (samples == damage).mean() == pytest.approx(probability, abs=0.015)
+
+def test_accuracy_status_and_burn_are_accounted_for(pikachu_vs_squirtle):
+    pikachu, squirtle = pikachu_vs_squirtle
+    inaccurate = make_move("zap", "electric", "special", power=90, accuracy=50)
+    full = damage_distribution(pikachu, squirtle, pikachu.moves[3])
+
+    assert damage_distribution(pikachu, squirtle, inaccurate).mean == pytest.approx(full.mean / 2)
+    assert damage_distribution(pikachu, squirtle, pikachu.moves[2]).damages == (0,)
+    pikachu.nvstatus = NVStatus.ASLEEP
+    assert damage_distribution(pikachu, squirtle, pikachu.moves[3]).mean == 0
+    pikachu.nvstatus = NVStatus.BURNT
+    physical = pikachu.moves[1]
+    burnt = damage_distribution(pikachu, squirtle, physical)
+    pikachu.nvstatus = NVStatus.NONE
+    assert burnt.mean < damage_distribution(pikachu, squirtle, physical).mean
+
+def test_ko_probabilities(pikachu_vs_squirtle):
+    pikachu, squirtle = pikachu_vs_squirtle
+    distribution = damage_distribution(pikachu, squirtle, pikachu.moves[3])
+
+    assert distribution.ko_probability(10) == pytest.approx(distribution.probability_of_at_least(10))
+    assert distribution.ko_probability(distribution.max + 1) == 0
+    chances = distribution.ko_probabilities(squirtle.current_hp, max_hits=4)
+    assert chances == sorted(chances)
+    # Monte Carlo check of the two-hit KO chance
+    rng = BattleRNG(1)
+    two_hits = [
+        pikachu.compute_damage(squirtle, pikachu.moves[3], rng) + pikachu.compute_damage(squirtle, pikachu.moves[3], rng)
+        for _ in range(20000)
+    ]
+    assert chances[1] == pytest.approx(np.mean(np.array(two_hits) >= squirtle.current_hp), abs=0.015)
+
+def test_distributions_are_memoized(pikachu_vs_squirtle):
+    pikachu, squirtle = pikachu_vs_squirtle
+    _damage_distribution.cache_clear()
+    first = damage_distribution(pikachu, squirtle, pikachu.moves[3])
+    second = damage_distribution(pikachu, squirtle, pikachu.moves[3])
+
+    assert first is second
+    assert _damage_distribution.cache_info().hits == 1
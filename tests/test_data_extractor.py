@@ -1,15 +1,34 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock
+
+import orjson
+import pytest
+import requests
+
 from src.data_extractor import DataExtractor
+from src.data_extraction.cache import ResponseCache
+from src.data_extraction.learnset import LearnsetIndex
+from src.data_extraction.single_flight import SingleFlight
+
+@pytest.fixture(autouse=True)
+def no_shared_stores(monkeypatch):
+    # Importing the apps (e.g. src.main) switches the process-wide cache on; these tests mock the network instead
+    monkeypatch.setattr(DataExtractor, "cache", None)
+    monkeypatch.setattr(DataExtractor, "learnset_index", None)
+    monkeypatch.setattr(DataExtractor, "in_flight", SingleFlight())
+    monkeypatch.setattr(DataExtractor, "scheduler", None)
 
 def test_data_extractor_initialization():
     source_url = "https://pokeapi.co/api/v2/pokemon"
     extractor = DataExtractor(source=source_url)
     assert extractor.source == source_url
 
-@patch('src.data_extractor.requests.get')
+@patch('src.data_extractor.HttpClient.get')
 def test_extract_full_data_all(mock_get):
     mock_response = MagicMock()
-    mock_response.json.return_value = {"name": "This is some Pikachu data"}
+    mock_response.content = orjson.dumps({"name": "This is some Pikachu data"})
     mock_get.return_value = mock_response
     extractor = DataExtractor(source="https://pokeapi.co/api/v2/pokemon")
     data_str = extractor.extract_full_data(pokemon_name="pikachu")
@@ -23,10 +42,10 @@ def test_convert_decimeters_to_feet_inches():
     output = DataExtractor.convert_decimeters_to_feet_inches(height_decimeters)
     assert output == expected_output
 
-@patch('src.data_extractor.requests.get')
+@patch('src.data_extractor.HttpClient.get')
 def test_get_all_pokemon_names(mock_get):
     mock_response = MagicMock()
-    mock_response.json.return_value = {
+    mock_response.content = orjson.dumps({
         "count": 1328,
         "next": None,
         "previous": None,
@@ -40,7 +59,7 @@ def test_get_all_pokemon_names(mock_get):
                 "url": "https://pokeapi.co/api/v2/pokemon/2/"
             }
         ]
-    }
+    })
     mock_get.return_value = mock_response
     extractor = DataExtractor(source="https://pokeapi.co/api/v2/pokemon")
     names = extractor.get_all_pokemon_names()
@@ -76,28 +95,28 @@ def test__process_stats_json_field():
     output = DataExtractor._process_json_field(stats_data, "stats")
     assert output == {'hp': 35, 'attack': 55, 'defense': 40}
 
-@patch('src.data_extractor.requests.get')
+@patch('src.data_extractor.HttpClient.get')
 def test__process_abilities_json_field(mock_get):
     mock_response = MagicMock()
-    mock_response.json.return_value = {"effect_entries":[{"effect":"Ability in German.","language":{"name":"de"}},{"effect":"Ability in English","language":{"name":"en"}}]}
+    mock_response.content = orjson.dumps({"effect_entries":[{"effect":"Ability in German.","language":{"name":"de"}},{"effect":"Ability in English","language":{"name":"en"}}]})
     mock_get.return_value = mock_response
     abilities_data = [{"ability": {"name": "static", "url": "/url/static"}}, {"ability": {"name": "lightning-rod", "url": "/url/lightning-rod"}}]
     output = DataExtractor._process_json_field(abilities_data, "abilities")
     assert output == {'static': 'Ability in English', 'lightning-rod': 'Ability in English'}
 
-@patch('src.data_extractor.requests.get')
+@patch('src.data_extractor.HttpClient.get')
 def test__location_area_encounters_json_field(mock_get):
     response_mock = MagicMock()
-    response_mock.json.return_value = [{'location_area': {'name': 'kanto-route-1'}}, {'location_area': {'name': 'trophy-garden-area'}}]
+    response_mock.content = orjson.dumps([{'location_area': {'name': 'kanto-route-1'}}, {'location_area': {'name': 'trophy-garden-area'}}])
     mock_get.return_value = response_mock
-    location_area_encounters_data = {"location_area_encounters": "https://pokeapi.co/api/v2/pokemon/1/encounters"}
+    location_area_encounters_data = "https://pokeapi.co/api/v2/pokemon/1/encounters"
     output = DataExtractor._process_json_field(location_area_encounters_data, "location_area_encounters")
     assert output == "Kanto Route 1, Trophy Garden Area"
 
-@patch('src.data_extractor.requests.get')
+@patch('src.data_extractor.HttpClient.get')
 def test__process_species_json_field(mock_get):
     response_mock = MagicMock()
-    response_mock.json.return_value = {"genera": [{"genus": "Pokémon Ratón", "language": {"name": "es"}}, {"genus": "Mouse Pokémon", "language": {"name": "en"}}]}
+    response_mock.content = orjson.dumps({"genera": [{"genus": "Pokémon Ratón", "language": {"name": "es"}}, {"genus": "Mouse Pokémon", "language": {"name": "en"}}]})
     mock_get.return_value = response_mock
     species_data = {"name": "pikachu", "url": "https://pokeapi.co/api/v2/pokemon-species/25/"}
     output = DataExtractor._process_json_field(species_data, "species")
@@ -112,3 +131,151 @@ def test__process_height_json_field():
     height_data = 18.034
     output = DataExtractor._process_json_field(height_data, "height")
     assert output == "5'11\""
+
+@patch('src.data_extractor.HttpClient.get')
+def test_extract_from_url_is_served_from_cache_when_warm(mock_get, tmp_path):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.headers = {"ETag": "W/\"abc\""}
+    mock_response.content = orjson.dumps({"name": "tackle", "power": 40})
+    mock_get.return_value = mock_response
+    DataExtractor.cache = ResponseCache(path=tmp_path / "cache.sqlite")
+    try:
+        first = DataExtractor.extract_from_url("https://pokeapi.co/api/v2/move/33/")
+        second = DataExtractor.extract_from_url("https://pokeapi.co/api/v2/move/33/")
+        assert first == second == {"name": "tackle", "power": 40}
+        assert mock_get.call_count == 1
+        assert DataExtractor.cache.stats()["hits"] == 1
+        assert DataExtractor.cache.stats()["misses"] == 1
+    finally:
+        DataExtractor.cache = None
+
+@patch('src.data_extractor.HttpClient.get')
+def test_stale_cache_entry_is_revalidated_with_etag(mock_get, tmp_path):
+    cache = ResponseCache(path=tmp_path / "cache.sqlite", ttl_seconds=0)
+    cache.put("https://pokeapi.co/api/v2/move/33/", b'{"name": "tackle"}', etag="W/\"abc\"")
+    not_modified = MagicMock()
+    not_modified.status_code = 304
+    mock_get.return_value = not_modified
+    DataExtractor.cache = cache
+    try:
+        data = DataExtractor.extract_from_url("https://pokeapi.co/api/v2/move/33/")
+        assert data == {"name": "tackle"}
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": "W/\"abc\""}
+        assert cache.stats()["revalidations"] == 1
+    finally:
+        DataExtractor.cache = None
+
+@patch('src.data_extractor.HttpClient.get')
+def test_error_answers_without_cached_copy_raise(mock_get):
+    throttled = MagicMock(status_code=429)
+    throttled.raise_for_status.side_effect = requests.HTTPError("429 Client Error: Too Many Requests")
+    mock_get.return_value = throttled
+    with pytest.raises(requests.HTTPError, match="429"):
+        DataExtractor.extract_from_url("https://pokeapi.co/api/v2/move/33/")
+
+def test_response_cache_evicts_least_recently_used_entries(tmp_path):
+    cache = ResponseCache(path=tmp_path / "cache.sqlite", max_bytes=10)
+    cache.put("a", b"123456")
+    cache.put("b", b"123456")
+    assert cache.get("a") is None
+    assert cache.get("b").body == b"123456"
+    assert cache.stats()["evictions"] == 1
+
+def test_response_cache_reads_do_not_write_but_still_count_for_eviction(tmp_path):
+    cache = ResponseCache(path=tmp_path / "cache.sqlite", max_bytes=12)
+    cache.put("a", b"123456")
+    cache.put("b", b"123456")
+    writes = cache._conn.total_changes
+    assert cache.get("a").body == b"123456"
+    assert cache._conn.total_changes == writes
+    cache.put("c", b"123456")
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+@patch('src.data_extractor.DataExtractor._get_json')
+def test_extract_specific_attribute_fetches_shared_sub_resources_once(mock_get_json):
+    species = {"genera": [{"genus": "Flame Pokémon", "language": {"name": "en"}}]}
+    payloads = {
+        "https://pokeapi.co/api/v2/pokemon/charizard": {"species": {"url": "/species/6"}},
+        "/species/6": species,
+    }
+    mock_get_json.side_effect = lambda url, fields=None, priority=None: payloads[url]
+    extractor = DataExtractor(source="https://pokeapi.co/api/v2/pokemon")
+    output = extractor.extract_specific_attribute(["charizard", "charizard"], ["species"])
+    assert [pkmn["species"] for pkmn in output] == ["Flame", "Flame"]
+    assert output[0] is not output[1]
+    assert sorted(call.args[0] for call in mock_get_json.call_args_list) == sorted(payloads)
+
+@patch('src.data_extractor.DataExtractor._get_json')
+def test_extract_specific_attribute_all_streams_every_page(mock_get_json):
+    source = "https://pokeapi.co/api/v2/pokemon"
+    pages = {
+        f"{source}?limit=100&offset=0": {"next": f"{source}?limit=100&offset=100", "results": [{"name": "bulbasaur", "url": "/1/"}]},
+        f"{source}?limit=100&offset=100": {"next": None, "results": [{"name": "ivysaur", "url": "/2/"}, {"name": "missingno", "url": "/0/"}]},
+    }
+    details = {
+        f"{source}/bulbasaur": {"id": 1},
+        f"{source}/ivysaur": {"id": 2},
+        f"{source}/missingno": None,
+    }
+    mock_get_json.side_effect = lambda url, fields=None, priority=None: pages.get(url, details.get(url))
+    extractor = DataExtractor(source=source)
+    records = extractor.extract_specific_attribute("all", ["id"])
+    first = next(records)
+    assert first == {"id": 1, "name": "bulbasaur"}
+    assert f"{source}?limit=100&offset=100" not in [call.args[0] for call in mock_get_json.call_args_list]
+    assert list(records) == [{"id": 2, "name": "ivysaur"}]
+
+@patch('src.data_extractor.HttpClient.get')
+def test_extract_specific_attribute_prunes_unrequested_fields(mock_get):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.content = orjson.dumps({
+        "id": 25,
+        "weight": 60,
+        "game_indices": [{"game_index": 84}] * 100,
+        "moves": [{"move": {"name": "thunder-shock"}, "version_group_details": []}] * 100,
+    })
+    mock_get.return_value = mock_response
+    extractor = DataExtractor(source="https://pokeapi.co/api/v2/pokemon")
+    output = extractor.extract_specific_attribute(["pikachu"], ["id", "weight"])
+    assert output == [{"id": 25, "weight": 6.0, "name": "pikachu"}]
+
+@patch('src.data_extractor.DataExtractor._get_json')
+def test_moves_are_served_from_the_learnset_index(mock_get_json, tmp_path):
+    raw_moves = [
+        {"move": {"name": "thunder-shock", "url": "/move/84/"}, "version_group_details": [{"version_group": {"name": "emerald"}}]},
+        {"move": {"name": "quick-attack", "url": "/move/98/"}, "version_group_details": [{"version_group": {"name": "red-blue"}}]},
+    ]
+    mock_get_json.return_value = {"moves": raw_moves}
+    DataExtractor.learnset_index = LearnsetIndex(path=tmp_path / "learnset.sqlite")
+    emerald = DataExtractor(source="https://pokeapi.co/api/v2/pokemon", game="emerald")
+    assert emerald.extract_specific_attribute(["pikachu"], ["moves"])[0]["moves"] == [{"name": "thunder-shock", "url": "/move/84/"}]
+
+    reopened = LearnsetIndex(path=tmp_path / "learnset.sqlite")
+    assert reopened.get("pikachu", "red-blue") == [{"name": "quick-attack", "url": "/move/98/"}]
+    assert reopened.get("pikachu", "crystal") == []
+    assert reopened.get("raichu", "emerald") is None
+
+@patch('src.data_extractor.HttpClient.get')
+def test_concurrent_requests_for_the_same_url_share_one_fetch(mock_get):
+    release = threading.Event()
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.content = orjson.dumps({"id": 6, "weight": 905})
+
+    def slow_get(url, headers=None):
+        release.wait(timeout=5)
+        return mock_response
+
+    mock_get.side_effect = slow_get
+    extractors = [DataExtractor(source="https://pokeapi.co/api/v2/pokemon") for _ in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(extractor.extract_specific_attribute, ["charizard"], ["id"]) for extractor in extractors]
+        while DataExtractor.in_flight.stats()["shared"] < 3:
+            time.sleep(0.01)
+        release.set()
+        results = [future.result() for future in futures]
+    assert results == [[{"id": 6, "name": "charizard"}]] * 4
+    assert mock_get.call_count == 1
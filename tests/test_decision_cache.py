@@ -0,0 +1,89 @@
+from unittest.mock import patch
+
+from src.battlefield.battle_engine import BattleEngine
+from src.battlefield.battle_pokemon import BattlePokemon
+from src.battlefield.decision_cache import CachedDecision, DecisionCache
+from src.battlefield.status import NVStatus
+
+
+def _pair(roster):
+    return BattlePokemon.from_pokemon_class(roster["pikachu"]), BattlePokemon.from_pokemon_class(roster["squirtle"])
+
+def test_key_buckets_hp_and_ignores_names(roster):
+    cache = DecisionCache(hp_buckets=4)
+    pikachu, squirtle = _pair(roster)
+    key = cache.key(pikachu, squirtle, round_count=1)
+
+    pikachu.name = "pikachu 1"
+    pikachu.current_hp -= 1
+    assert cache.key(pikachu, squirtle, round_count=1) == key
+    pikachu.current_hp = pikachu.stats.hp // 2
+    assert cache.key(pikachu, squirtle, round_count=1) != key
+    assert cache.key(squirtle, pikachu, round_count=1) != key
+
+def test_round_and_history_are_configurable(roster):
+    pikachu, squirtle = _pair(roster)
+    default, loose, strict = DecisionCache(), DecisionCache(include_round=False), DecisionCache(include_history=True)
+
+    assert default.key(pikachu, squirtle, round_count=1) != default.key(pikachu, squirtle, round_count=2)
+    assert loose.key(pikachu, squirtle, round_count=1) == loose.key(pikachu, squirtle, round_count=2)
+    assert strict.key(pikachu, squirtle, 1, history="a") != strict.key(pikachu, squirtle, 1, history="b")
+    key = loose.key(pikachu, squirtle, round_count=1)
+    squirtle.nvstatus = NVStatus.ASLEEP
+    assert loose.key(pikachu, squirtle, round_count=1) != key
+
+def test_lru_eviction_and_metrics():
+    cache = DecisionCache(max_entries=2)
+    cache.put("a", "tackle", "why")
+    cache.put("b", "growl", "why")
+    cache.get("a")
+    cache.put("c", "bite", "why")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == CachedDecision("tackle", "why")
+    assert cache.stats() == {"hits": 2, "persistent_hits": 0, "misses": 1, "hit_rate": 2 / 3, "entries": 2}
+
+def test_persistent_store_survives_restarts(tmp_path):
+    path = tmp_path / "decisions.sqlite"
+    first = DecisionCache(persistent=True, path=path)
+    first.put("key", "thunderbolt", "super effective")
+    first.close()
+
+    second = DecisionCache(persistent=True, path=path)
+    assert second.get("key") == CachedDecision("thunderbolt", "super effective")
+    assert second.stats()["persistent_hits"] == 1
+
+@patch.object(BattleEngine, "bind_model_response_to_move_name_and_explanation")
+def test_engine_reuses_cached_decisions(mock_llm_decision, roster):
+    mock_llm_decision.return_value = CachedDecision("thunderbolt", "strongest move")
+    cache = DecisionCache(include_round=False)
+    for _ in range(2):
+        pikachu, squirtle = _pair(roster)
+        engine = BattleEngine(pikachu, squirtle, llm=object(), decision_cache=cache, seed=0)
+        engine.run_pokemon_turn(pikachu, squirtle)
+
+    assert mock_llm_decision.call_count == 1
+    assert pikachu.moves_used[-1].name == "thunderbolt"
+    assert cache.stats()["hits"] == 1
+
+@patch.object(BattleEngine, "bind_model_response_to_move_name_and_explanation")
+def test_prompt_settings_are_part_of_the_key(mock_llm_decision, roster):
+    mock_llm_decision.return_value = CachedDecision("thunderbolt", "strongest move")
+    cache = DecisionCache(include_round=False)
+    for settings in ({}, {"prompt_layout": "cached"}, {"history_token_budget": 100}):
+        pikachu, squirtle = _pair(roster)
+        BattleEngine(pikachu, squirtle, llm=object(), decision_cache=cache, seed=0, **settings).run_pokemon_turn(pikachu, squirtle)
+
+    assert mock_llm_decision.call_count == 3
+    assert cache.stats()["hits"] == 0
+
+def test_cached_move_outside_the_candidates_is_a_miss(roster):
+    cache = DecisionCache()
+    pikachu, squirtle = _pair(roster)
+    engine = BattleEngine(pikachu, squirtle, llm=object(), decision_cache=cache, seed=0)
+    candidates = [move for move in pikachu.moves if move.name != "thunderbolt"]
+    cache_key, _ = engine.get_cached_decision(pikachu, squirtle, candidates)
+    cache.put(cache_key, "thunderbolt", "strongest move")
+
+    assert engine.get_cached_decision(pikachu, squirtle, candidates) == (cache_key, None)
+    assert engine.get_cached_decision(pikachu, squirtle, pikachu.moves)[1] is None
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from src.pokemon.types import PokemonType
+from src.pokemon.moves.effectiveness import (
+    DUAL_TYPE_TABLE, NO_TYPE, TYPE_CHART, TYPE_MATRIX, TYPE_ORDER, effectiveness, effectiveness_array, type_codes,
+)
+from tests.conftest import make_move
+
+
+def test_type_matrix_matches_type_chart():
+    for attacking in PokemonType:
+        for defending in PokemonType:
+            expected = TYPE_CHART[attacking.value].get(defending.value, 1.0)
+            assert TYPE_MATRIX[attacking.code, defending.code] == expected
+    assert TYPE_ORDER[PokemonType.FAIRY.code] == PokemonType.FAIRY
+
+def test_dual_type_table_multiplies_both_types():
+    ground = PokemonType.GROUND.code
+    assert DUAL_TYPE_TABLE[ground, PokemonType.FIRE.code, PokemonType.STEEL.code] == 4
+    assert DUAL_TYPE_TABLE[ground, PokemonType.FIRE.code, PokemonType.FLYING.code] == 0
+    assert DUAL_TYPE_TABLE[ground, PokemonType.FIRE.code, NO_TYPE] == 2
+    with pytest.raises(ValueError):
+        DUAL_TYPE_TABLE[0, 0, 0] = 3
+
+@pytest.mark.parametrize("defender_types, expected", [
+    (["water"], 2),
+    (["water", "flying"], 4),
+    (["grass", "dragon"], 0.25),
+    (["ground"], 0),
+])
+def test_effectiveness(defender_types, expected):
+    thunderbolt = make_move("thunderbolt", "electric", "special", power=90)
+    assert effectiveness(thunderbolt, [PokemonType(t) for t in defender_types]) == expected
+
+def test_effectiveness_rejects_invalid_type_counts():
+    with pytest.raises(ValueError):
+        type_codes([])
+    with pytest.raises(ValueError):
+        type_codes([PokemonType.FIRE, PokemonType.WATER, PokemonType.GRASS])
+
+def test_effectiveness_array_broadcasts_moves_against_defenders():
+    moves = np.array([PokemonType.ELECTRIC.code, PokemonType.ICE.code])[:, None]
+    defenders = [[PokemonType.WATER, PokemonType.FLYING], [PokemonType.GRASS, PokemonType.DRAGON], [PokemonType.FIRE]]
+    type_1, type_2 = np.array([type_codes(types) for types in defenders]).T
+
+    assert effectiveness_array(moves, type_1, type_2).tolist() == [[4, 0.25, 1], [1, 4, 0.5]]
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.battlefield.async_engine import AsyncBattleEngine
+from src.battlefield.battle_engine import BattleEngine
+from src.battlefield.decision_cache import DecisionCache
+from src.battlefield.hedging import LatencyTracker
+from src.battlefield.policies import greedy_policy
+from tests.conftest import AsyncFakeChatModel, RecordingFakeChatModel
+
+THUNDERBOLT = '{"move": "thunderbolt", "explanation": "Electric beats water"}'
+QUICK_ATTACK = '{"move": "quick attack", "explanation": "Moves first"}'
+
+
+def _decide(engine):
+    started = time.perf_counter()
+    move = engine.choose_move(engine.user_pokemon, engine.foe_pokemon)
+    return move, time.perf_counter() - started
+
+
+def test_hedge_delay_follows_the_observed_p95():
+    tracker = LatencyTracker(min_samples=10, initial_delay=3.0)
+    for latency in range(9):
+        tracker.record(latency / 10)
+    assert tracker.hedge_delay() == 3.0
+
+    for latency in range(9, 100):
+        tracker.record(latency / 10)
+    assert tracker.hedge_delay() == pytest.approx(9.405)
+
+def test_slow_primary_is_hedged_with_the_fallback_model(roster):
+    cache = DecisionCache()
+    engine = BattleEngine(roster["pikachu"], roster["squirtle"], seed=0, llm_timeout=2, hedge_delay=0.05,
+                          llm=FakeListChatModel(responses=[THUNDERBOLT], sleep=0.3),
+                          fallback_llm=FakeListChatModel(responses=[QUICK_ATTACK]), decision_cache=cache)
+    move, elapsed = _decide(engine)
+
+    assert move.name == "quick attack"
+    assert elapsed < 0.5
+    assert engine.hedged_requests == engine.hedge_wins == 1
+    # The fallback model's answer is not what the primary model would say
+    assert cache.stats()["entries"] == 0
+
+def test_failing_primary_is_hedged_right_away(roster):
+    engine = BattleEngine(roster["pikachu"], roster["squirtle"], seed=0, hedge_delay=10, max_decision_retries=0,
+                          llm=FakeListChatModel(responses=["no idea"]),
+                          fallback_llm=FakeListChatModel(responses=[QUICK_ATTACK]))
+    move, elapsed = _decide(engine)
+
+    assert move.name == "quick attack"
+    assert elapsed < 1
+    # The failed primary call still counts towards the hedge delay
+    assert len(engine.latency_tracker) == 1
+
+def test_missed_deadline_falls_back_to_the_local_policy(roster):
+    cache = DecisionCache()
+    engine = BattleEngine(roster["pikachu"], roster["squirtle"], seed=0, llm_timeout=0.1, hedge_delay=0.02,
+                          llm=FakeListChatModel(responses=[QUICK_ATTACK], sleep=0.3),
+                          fallback_llm=FakeListChatModel(responses=[QUICK_ATTACK], sleep=0.3),
+                          fallback_policy=greedy_policy, decision_cache=cache)
+    move, elapsed = _decide(engine)
+
+    assert move.name == "thunderbolt"
+    assert elapsed < 0.5
+    assert engine.local_fallbacks == 1
+    # The abandoned primary call is recorded once, with the time it was given
+    time.sleep(0.3)
+    assert len(engine.latency_tracker) == 1
+    # A fallback is not what the model would have said, so it must not be reused
+    assert cache.stats()["entries"] == 0
+
+def test_missed_deadline_without_fallback_policy_raises(roster):
+    engine = BattleEngine(roster["pikachu"], roster["squirtle"], seed=0, llm_timeout=0.05,
+                          llm=FakeListChatModel(responses=[THUNDERBOLT], sleep=0.3))
+
+    with pytest.raises(TimeoutError):
+        engine.choose_move(engine.user_pokemon, engine.foe_pokemon)
+
+def test_losing_call_is_not_retried(roster):
+    primary = RecordingFakeChatModel(responses=["no idea"], sleep=0.2)
+    engine = BattleEngine(roster["pikachu"], roster["squirtle"], seed=0, hedge_delay=0.05, max_decision_retries=5,
+                          llm=primary, fallback_llm=FakeListChatModel(responses=[QUICK_ATTACK]))
+    move, _ = _decide(engine)
+    time.sleep(0.5)
+
+    assert move.name == "quick attack"
+    assert len(primary.intervals) == 1
+
+def test_no_hedge_past_the_deadline(roster):
+    fallback = RecordingFakeChatModel(responses=[QUICK_ATTACK])
+    engine = BattleEngine(roster["pikachu"], roster["squirtle"], seed=0, llm_timeout=0.1, hedge_delay=0.1,
+                          llm=FakeListChatModel(responses=[QUICK_ATTACK], sleep=0.3), fallback_llm=fallback,
+                          fallback_policy=greedy_policy)
+    move, _ = _decide(engine)
+
+    assert move.name == "thunderbolt"
+    assert engine.hedged_requests == 0 and not fallback.received
+
+def test_simultaneous_fallbacks_are_drawn_on_the_battle_thread(roster):
+    threads = []
+
+    def fallback(attacker, defender, rng):
+        threads.append(threading.current_thread())
+        return greedy_policy(attacker, defender, rng)
+
+    squirtle = roster["squirtle"].model_copy(update={"moves": roster["pikachu"].moves})
+    engine = BattleEngine(roster["pikachu"], squirtle, seed=0, llm_timeout=0.05, max_rounds=2, simultaneous=True,
+                          llm=FakeListChatModel(responses=[THUNDERBOLT], sleep=0.3), fallback_policy=fallback)
+    engine.start_ai_battle()
+
+    assert engine.local_fallbacks == len(threads) == 2 * engine.rounds_played
+    assert set(threads) == {threading.main_thread()}
+
+def test_async_hedging_cancels_the_slow_call(roster):
+    engine = AsyncBattleEngine(roster["pikachu"], roster["squirtle"], seed=0, llm_timeout=2, hedge_delay=0.05,
+                               llm=AsyncFakeChatModel(responses=[THUNDERBOLT], sleep=5),
+                               fallback_llm=AsyncFakeChatModel(responses=[QUICK_ATTACK], sleep=0.01))
+    started = time.perf_counter()
+    move = asyncio.run(engine.achoose_move(engine.user_pokemon, engine.foe_pokemon))
+
+    assert move.name == "quick attack"
+    assert time.perf_counter() - started < 1
+    assert engine.hedge_wins == 1
+
+def test_async_deadline_bounds_every_turn(roster):
+    engine = AsyncBattleEngine(roster["pikachu"], roster["squirtle"], seed=0, llm_timeout=0.05, max_rounds=3,
+                               llm=AsyncFakeChatModel(responses=[THUNDERBOLT], sleep=5),
+                               foe_policy=greedy_policy, fallback_policy=greedy_policy)
+    started = time.perf_counter()
+    asyncio.run(engine.start_ai_battle())
+
+    assert engine.winner is not None
+    assert engine.local_fallbacks == len(engine.user_pokemon.moves_used)
+    assert time.perf_counter() - started < 0.1 * engine.local_fallbacks + 0.5
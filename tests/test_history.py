@@ -0,0 +1,62 @@
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.battlefield.battle_engine import BattleEngine
+from src.battlefield.history import HistoryLog
+from tests.conftest import make_move, make_pokemon
+
+
+def _history(rounds):
+    return {
+        "Round": [f"Round {i}" for i in range(rounds)],
+        "HP": [100 - i for i in range(rounds)],
+        "Status": ["not affected by any condition"] * rounds,
+        "Attacked with": ["N/A"] + ["Tackle"] * (rounds - 1),
+        "Attacked by": ["N/A"] + ["Ember"] * (rounds - 1),
+    }
+
+
+def test_unbudgeted_log_matches_the_full_narrative():
+    history_log = HistoryLog()
+    history = _history(6)
+    for rounds in range(1, 7):
+        history_log.sync({key: values[:rounds] for key, values in history.items()})
+
+    assert history_log.render() == BattleEngine.format_history_for_llm_natural(history)
+
+def test_budgeted_log_keeps_recent_rounds_and_summarizes_the_rest():
+    history_log = HistoryLog(token_budget=80)
+    history_log.sync(_history(20))
+    text = history_log.render()
+
+    assert text.startswith("Rounds 0-")
+    assert "attacked with Tackle x" in text
+    assert text.endswith(" || Round 19:, HP was 81, Status was not affected by any condition, "
+                         "Attacked with was Tackle, Attacked by was Ember.")
+    assert "Round 3:" not in text
+    assert history_log.token_counter(text) <= 80 + history_log.line_tokens[-1]
+
+def test_budgeted_summary_accounts_for_every_folded_round():
+    history_log = HistoryLog(token_budget=60)
+    history = _history(30)
+    for rounds in range(1, 31):
+        history_log.sync({key: values[:rounds] for key, values in history.items()})
+        history_log.render()
+    folded = history_log._first_verbatim
+
+    assert sum(history_log._attacked_with.values()) == folded - 1
+    assert f"Rounds 0-{folded - 1} (summarized): HP went from 100 to {100 - folded + 1}" in history_log.render()
+
+def test_prompt_size_stays_flat_under_a_history_budget():
+    def prompt_tokens(budget):
+        user = make_pokemon("bulbasaur", ["grass"], (45, 49, 49, 65, 65, 45), [make_move("tackle", "normal", power=1)])
+        foe = make_pokemon("charmander", ["fire"], (39, 52, 43, 60, 50, 65), [make_move("tackle", "normal", power=1)])
+        llm = FakeListChatModel(responses=['{"move": "tackle", "explanation": "Only move"}'])
+        engine = BattleEngine(user, foe, llm=llm, max_rounds=30, seed=0, history_token_budget=budget)
+        engine.start_ai_battle()
+        return engine.prompt_tokens
+
+    unbounded, bounded = prompt_tokens(None), prompt_tokens(150)
+
+    assert len(unbounded) == len(bounded) == 60
+    assert unbounded[-1] > unbounded[0] + 500
+    assert max(bounded[20:]) - min(bounded[20:]) < 40
@@ -0,0 +1,38 @@
+from unittest.mock import patch, MagicMock
+
+import pytest
+import requests
+
+from src.data_extraction.http_client import HttpClient
+
+def _response(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+@patch('src.data_extraction.http_client.time.sleep')
+def test_get_retries_transient_errors(mock_sleep):
+    client = HttpClient(max_retries=3)
+    ok = _response(200)
+    with patch.object(client.session, 'get', side_effect=[_response(503), _response(429, {"Retry-After": "2"}), ok]) as mock_get:
+        assert client.get("https://pokeapi.co/api/v2/pokemon/pikachu") is ok
+    assert mock_get.call_count == 3
+    assert mock_get.call_args.kwargs["timeout"] == client.timeout
+    assert mock_sleep.call_args_list[1].args[0] == 2.0
+    assert client.stats()["retries"] == 2
+
+@patch('src.data_extraction.http_client.time.sleep')
+def test_get_gives_up_after_max_retries(mock_sleep):
+    client = HttpClient(max_retries=1)
+    with patch.object(client.session, 'get', side_effect=requests.ConnectionError("boom")):
+        with pytest.raises(requests.ConnectionError):
+            client.get("https://pokeapi.co/api/v2/pokemon/pikachu")
+    assert client.stats()["failures"] == 1
+
+def test_get_does_not_retry_not_found():
+    client = HttpClient()
+    not_found = _response(404)
+    with patch.object(client.session, 'get', return_value=not_found) as mock_get:
+        assert client.get("https://pokeapi.co/api/v2/pokemon/missingno") is not_found
+    assert mock_get.call_count == 1
@@ -0,0 +1,74 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.data_extractor import DataExtractor
+from src.data_extraction.local_store import LocalPokedexStore, build_local_store
+
+def _write(dump_dir, relative, payload):
+    path = dump_dir / relative / "index.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload))
+
+@pytest.fixture
+def pokedex_store(tmp_path):
+    dump_dir = tmp_path / "api" / "v2"
+    _write(dump_dir, "pokemon/25", {
+        "id": 25,
+        "name": "pikachu",
+        "types": [{"slot": 1, "type": {"name": "electric", "url": "/api/v2/type/13/"}}],
+        "stats": [{"base_stat": 35, "stat": {"name": "hp"}}, {"base_stat": 90, "stat": {"name": "speed"}}],
+        "abilities": [{"ability": {"name": "static", "url": "/api/v2/ability/9/"}}],
+        "species": {"name": "pikachu", "url": "/api/v2/pokemon-species/25/"},
+        "cries": {"latest": "https://example.com/25.ogg"},
+        "height": 4,
+        "weight": 60,
+        "base_experience": 112,
+        "sprites": {"other": {"showdown": {"front_default": "front.gif", "back_default": "back.gif"}}},
+        "location_area_encounters": "/api/v2/pokemon/25/encounters",
+        "moves": [
+            {"move": {"name": "thunder-shock", "url": "/api/v2/move/84/"},
+             "version_group_details": [{"version_group": {"name": "emerald"}}]},
+            {"move": {"name": "quick-attack", "url": "/api/v2/move/98/"},
+             "version_group_details": [{"version_group": {"name": "red-blue"}}]},
+        ],
+    })
+    _write(dump_dir, "pokemon/25/encounters", [{"location_area": {"name": "viridian-forest-area"}}])
+    _write(dump_dir, "ability/9", {"id": 9, "name": "static", "effect_entries": [{"effect": "May paralyze.", "language": {"name": "en"}}]})
+    _write(dump_dir, "pokemon-species/25", {"id": 25, "name": "pikachu", "genera": [{"genus": "Mouse Pokémon", "language": {"name": "en"}}]})
+    for move_id, name, move_type in [(84, "thunder-shock", "electric"), (98, "quick-attack", "normal")]:
+        _write(dump_dir, f"move/{move_id}", {
+            "id": move_id, "name": name, "accuracy": 100, "power": 40, "pp": 30, "priority": 0,
+            "type": {"name": move_type}, "damage_class": {"name": "special"},
+            "flavor_text_entries": [{"flavor_text": f"{name} text"}], "stat_changes": [],
+            "meta": {"ailment": {"name": "paralysis"}, "ailment_chance": 10},
+        })
+    store = LocalPokedexStore(build_local_store(dump_dir, tmp_path / "pokedex.sqlite"))
+    yield store
+    store.close()
+
+def test_local_store_returns_normalized_pokemon_with_game_moves(pokedex_store):
+    record = pokedex_store.get_pokemon("pikachu", "emerald")
+    assert record["types"] == ["electric"]
+    assert record["stats"] == {"hp": 35, "speed": 90}
+    assert record["species"] == "Mouse"
+    assert record["abilities"] == {"static": "May paralyze."}
+    assert record["location_area_encounters"] == "Viridian Forest Area"
+    assert [move["name"] for move in record["moves"]] == ["thunder-shock"]
+    assert pokedex_store.get_pokemon(25, "emerald")["height"] == 0.4
+
+@patch('src.data_extractor.HttpClient.get')
+def test_extractor_in_local_store_mode_never_hits_the_network(mock_get, pokedex_store):
+    extractor = DataExtractor(source=pokedex_store)
+    [pikachu] = extractor.extract_specific_attribute(["pikachu"], ["types", "moves"])
+    assert pikachu["types"] == ["electric"]
+    moves = extractor.extract_moves(pikachu["moves"])
+    assert moves["/api/v2/move/84/"]["ailment"] == "paralysis"
+    assert extractor.get_all_pokemon_names() == {"pikachu": "/api/v2/pokemon/25/"}
+    mock_get.assert_not_called()
+
+def test_extractor_streams_all_pokemon_from_local_store(pokedex_store):
+    extractor = DataExtractor(source=pokedex_store, max_workers=1)
+    records = list(extractor.extract_specific_attribute("all", ["types"]))
+    assert records == [{"name": "pikachu", "types": ["electric"]}]
@@ -0,0 +1,30 @@
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic import ValidationError
+
+from src.pokemon.moves.registry import MoveRegistry
+
+TACKLE = {
+    "name": "tackle", "description": "A physical attack.", "type": "normal", "damage_class": "physical",
+    "accuracy": 100, "power": 40, "pp": 35, "priority": 0, "stat_changes": [], "ailment": None, "ailment_chance": 0,
+}
+
+def test_registry_loads_each_move_once_and_shares_instances():
+    data_extractor = MagicMock()
+    data_extractor.extract_moves.return_value = {"/move/33/": TACKLE}
+    registry = MoveRegistry()
+    ref = {"name": "tackle", "url": "/move/33/"}
+
+    first = registry.get_many([ref, ref], data_extractor)["tackle"]
+    second = registry.get_many([ref], data_extractor)["tackle"]
+
+    assert first is second
+    assert first.name == "tackle" and first.power == 40
+    data_extractor.extract_moves.assert_called_once()
+    assert len(registry) == 1
+
+def test_shared_moves_are_immutable():
+    move = MoveRegistry.build_move("tackle", TACKLE)
+    with pytest.raises(ValidationError):
+        move.power = 999
@@ -0,0 +1,79 @@
+from src.battlefield.battle_engine import BattleEngine
+from src.battlefield.battle_pokemon import BattlePokemon
+from src.battlefield.move_screen import MoveScreener
+from src.battlefield.policies import greedy_policy
+from tests.conftest import RecordingFakeChatModel, make_move, make_pokemon
+
+
+def _pair(roster, attacker, defender):
+    return BattlePokemon.from_pokemon_class(roster[attacker]), BattlePokemon.from_pokemon_class(roster[defender])
+
+
+def test_super_effective_move_dominates(roster):
+    pikachu, squirtle = _pair(roster, "pikachu", "squirtle")
+    screened = MoveScreener()(pikachu, squirtle)
+
+    assert screened.move.name == "thunderbolt"
+    assert screened.scores["growl"] == 0
+
+def test_close_moves_go_to_the_llm_as_top_candidates(roster):
+    squirtle, pikachu = _pair(roster, "squirtle", "pikachu")
+    screened = MoveScreener(top_k=2)(squirtle, pikachu)
+
+    assert screened.move is None
+    # Status moves always reach the LLM, next to the best damaging ones
+    assert [move.name for move in screened.candidates] == ["bite", "tackle", "tail whip"]
+
+def test_single_damaging_move_beats_status_moves():
+    attacker = BattlePokemon.from_pokemon_class(make_pokemon("abra", ["psychic"], (25, 20, 15, 105, 55, 90), [
+        make_move("growl", "normal", "status", power=0),
+        make_move("tail whip", "normal", "status", power=0),
+        make_move("confusion", "psychic", "special", power=50),
+        make_move("leer", "normal", "status", power=0),
+    ]))
+    defender = BattlePokemon.from_pokemon_class(make_pokemon("rattata", ["normal"], (30, 56, 35, 25, 35, 72), [
+        make_move("tackle", "normal"),
+    ]))
+
+    assert MoveScreener()(attacker, defender).move.name == "confusion"
+
+def test_likely_knockout_dominates(roster):
+    squirtle, pikachu = _pair(roster, "squirtle", "pikachu")
+    pikachu.current_hp = 5
+
+    assert MoveScreener(margin=100)(squirtle, pikachu).move.name == "bite"
+
+def test_engine_skips_the_llm_on_dominated_turns(roster):
+    screener = MoveScreener()
+    # Any LLM call would fail: every pikachu turn must be answered locally
+    engine = BattleEngine(roster["pikachu"], roster["squirtle"], llm=object(), foe_policy=greedy_policy,
+                          seed=0, move_screener=screener)
+    engine.start_ai_battle()
+
+    assert engine.winner is not None
+    assert screener.stats()["local_fraction"] == 1.0
+    assert screener.stats()["local_decisions"] == len(engine.user_pokemon.moves_used)
+
+def test_llm_only_sees_the_candidates(roster):
+    screener = MoveScreener(top_k=2)
+    llm = RecordingFakeChatModel(responses=['{"move": "bite", "explanation": "Hardest hit"}'])
+    engine = BattleEngine(roster["squirtle"], roster["pikachu"], seed=0, move_screener=screener, llm=llm)
+    move = engine.choose_move(engine.user_pokemon, engine.foe_pokemon)
+    sent = "\n".join(message.content for message in llm.received[0])
+
+    assert move.name == "bite"
+    assert screener.stats()["llm_decisions"] == 1 and screener.stats()["mean_llm_seconds"] > 0
+    assert "name='tackle'" in sent and "name='tail whip'" in sent and "water gun" not in sent
+
+def test_answers_outside_the_candidates_are_asked_again(roster):
+    llm = RecordingFakeChatModel(responses=[
+        '{"move": "water gun", "explanation": "Same type"}',
+        '{"move": "bite", "explanation": "Hardest hit"}',
+    ])
+    engine = BattleEngine(roster["squirtle"], roster["pikachu"], seed=0, move_screener=MoveScreener(top_k=2), llm=llm)
+    move = engine.choose_move(engine.user_pokemon, engine.foe_pokemon)
+    feedback = llm.received[1][-1].content
+
+    assert move.name == "bite"
+    assert engine.decision_retries == 1
+    assert "water gun" in feedback.splitlines()[0] and "water gun" not in feedback.splitlines()[1]
@@ -0,0 +1,66 @@
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from src.battlefield.battle_engine import BattleEngine
+from src.battlefield.history import approximate_tokens
+from src.battlefield.policies import greedy_policy
+
+DECISION = '{"move": "thunderbolt", "explanation": "Electric beats water"}'
+
+
+class PrefixCachingFakeModel(FakeListChatModel):
+    """Fake model reporting usage like a provider with prompt caching: the longest prefix seen before is cached."""
+    seen: list = []
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt = "\n".join(message.content for message in messages)
+        shared = max((_common_prefix(prompt, earlier) for earlier in self.seen), default=0)
+        self.seen.append(prompt)
+        message = AIMessage(content=self.responses[0], usage_metadata={
+            "input_tokens": approximate_tokens(prompt), "output_tokens": 20,
+            "total_tokens": approximate_tokens(prompt) + 20,
+            "input_token_details": {"cache_read": shared // 4},
+        })
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def _common_prefix(first, second):
+    length = 0
+    for a, b in zip(first, second):
+        if a != b:
+            break
+        length += 1
+    return length
+
+
+def _battle(roster, layout):
+    llm = PrefixCachingFakeModel(responses=[DECISION], seen=[])
+    engine = BattleEngine(roster["pikachu"], roster["squirtle"], llm=llm, foe_policy=greedy_policy,
+                          seed=0, prompt_layout=layout)
+    engine.start_ai_battle()
+    return engine
+
+
+def test_cached_layout_keeps_a_stable_prefix(roster):
+    engine = _battle(roster, "cached")
+    first = engine.build_prompt(engine.user_pokemon, engine.foe_pokemon)
+    second = engine.build_prompt(engine.user_pokemon, engine.foe_pokemon)
+
+    assert first["trainer_message"] is second["trainer_message"]
+    assert "thunderbolt" in first["trainer_message"] and "Round 0:" in first["turn_state"]
+
+def test_cached_layout_gets_more_cached_input_tokens(roster):
+    classic, cached = _battle(roster, "classic"), _battle(roster, "cached")
+
+    assert classic.token_usage.summary()["calls"] == len(classic.user_pokemon.moves_used)
+    # Every turn after the first only pays for the state that changed
+    for classic_usage, cached_usage in zip(classic.token_usage.records[1:], cached.token_usage.records[1:]):
+        assert cached_usage.uncached_tokens < 0.6 * classic_usage.uncached_tokens
+    assert cached.token_usage.summary()["cached_share"] > classic.token_usage.summary()["cached_share"]
+
+def test_classic_layout_sends_the_original_prompt(roster):
+    engine = BattleEngine(roster["pikachu"], roster["squirtle"], llm=FakeListChatModel(responses=[DECISION]))
+    prompt = engine.build_prompt(engine.user_pokemon, engine.foe_pokemon)
+
+    assert prompt == {"trainer_message": engine.build_trainer_message(engine.user_pokemon, engine.foe_pokemon), "turn_state": ""}
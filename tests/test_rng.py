@@ -0,0 +1,36 @@
+from src.battlefield.battle_engine import BattleEngine
+from src.battlefield.battle_pokemon import BattlePokemon
+from src.battlefield.rng import BattleRNG
+from src.battlefield.policies import random_policy
+
+
+def test_same_seed_gives_same_stream_across_blocks():
+    first, second = BattleRNG(42, block_size=8), BattleRNG(42, block_size=8)
+    assert [first.random() for _ in range(20)] == [second.random() for _ in range(20)]
+
+def test_spawned_streams_are_independent_and_reproducible():
+    children = BattleRNG(1).spawn(3)
+    draws = [[child.random() for _ in range(5)] for child in children]
+    assert len({tuple(d) for d in draws}) == 3
+    assert [BattleRNG(1).spawn(3)[2].random() for _ in range(2)] == [draws[2][0]] * 2
+
+def test_draw_helpers_stay_in_range():
+    rng = BattleRNG(7)
+    assert all(85 <= rng.uniform(85, 100) < 100 for _ in range(1000))
+    assert {rng.integers(4) for _ in range(1000)} == {0, 1, 2, 3}
+    assert not any(rng.chance(0) for _ in range(100))
+    assert all(rng.chance(1) for _ in range(100))
+
+def _play(roster, seed):
+    battle = BattleEngine(
+        BattlePokemon.from_pokemon_class(roster["pikachu"].model_copy(deep=True)),
+        BattlePokemon.from_pokemon_class(roster["squirtle"].model_copy(deep=True)),
+        policy=random_policy,
+        seed=seed,
+    )
+    battle.start_ai_battle()
+    return battle.user_pokemon.history, battle.foe_pokemon.history
+
+def test_battles_replay_from_their_seed(roster):
+    assert _play(roster, 123) == _play(roster, 123)
+    assert any(_play(roster, 123) != _play(roster, seed) for seed in range(5))
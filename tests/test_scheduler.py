@@ -0,0 +1,137 @@
+import threading
+import time
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from src.data_extractor import DataExtractor
+from src.data_extraction.cache import ResponseCache
+from src.data_extraction.http_client import HttpClient
+from src.data_extraction.scheduler import CircuitOpenError, RequestPriority, RequestScheduler, SchedulerBusyError
+from src.data_extraction.single_flight import SingleFlight
+
+def test_waiting_requests_are_released_by_priority():
+    scheduler = RequestScheduler(rate_per_second=10, burst=1)
+    scheduler.submit(lambda: None)  # drain the bucket
+    order = []
+    threads = [
+        threading.Thread(target=scheduler.submit, args=(lambda p=priority: order.append(p), priority))
+        for priority in (RequestPriority.BACKGROUND, RequestPriority.TOOL_CALL, RequestPriority.INTERACTIVE)
+    ]
+    with scheduler._cond:
+        # Hold the lock so all three enqueue before any token becomes available to them
+        for thread in threads:
+            thread.start()
+        while sum(scheduler._queued.values()) < 3:
+            scheduler._cond.wait(0.01)
+    for thread in threads:
+        thread.join()
+    assert order == [RequestPriority.INTERACTIVE, RequestPriority.TOOL_CALL, RequestPriority.BACKGROUND]
+    assert scheduler.stats()["background"]["submitted"] == 1
+
+def test_full_queue_applies_backpressure():
+    scheduler = RequestScheduler(rate_per_second=0.001, burst=1, max_queue=2, max_wait=None)
+    scheduler.submit(lambda: None)  # drain the bucket
+    blocked = [threading.Thread(target=scheduler.submit, args=(lambda: None, RequestPriority.BACKGROUND))
+               for _ in range(2)]
+    for thread in blocked:
+        thread.start()
+    with scheduler._cond:
+        while scheduler._queued[RequestPriority.BACKGROUND] < 2:
+            scheduler._cond.wait(0.01)
+    started = time.monotonic()
+    with pytest.raises(SchedulerBusyError, match="Too many background"):
+        scheduler.submit(lambda: None, RequestPriority.BACKGROUND)
+    assert time.monotonic() - started < 0.5
+    assert scheduler.stats()["background"]["rejected"] == 1
+    assert scheduler.stats()["background"]["queue_depth"] == 2
+    with scheduler._cond:
+        scheduler.rate_per_second = 1000
+        scheduler._cond.notify_all()
+    for thread in blocked:
+        thread.join()
+
+def test_waiting_longer_than_max_wait_is_rejected():
+    scheduler = RequestScheduler(rate_per_second=0.001, burst=0, max_queue=1, max_wait=0.05)
+    with pytest.raises(SchedulerBusyError, match="Waited more than"):
+        scheduler.submit(lambda: None, RequestPriority.BACKGROUND)
+    assert scheduler.stats()["background"]["rejected"] == 1
+
+def test_circuit_opens_after_consecutive_failures_and_recovers():
+    scheduler = RequestScheduler(failure_threshold=2, reset_timeout=0.05)
+    for _ in range(2):
+        scheduler.submit(lambda: 503, is_failure=lambda status: status >= 500)
+    with pytest.raises(CircuitOpenError):
+        scheduler.submit(lambda: 200)
+    time.sleep(0.06)
+    assert scheduler.submit(lambda: 200) == 200
+    assert scheduler.circuit_state == "closed"
+
+def test_extractor_falls_back_to_stale_cache_when_circuit_is_open(tmp_path, monkeypatch):
+    scheduler = RequestScheduler(failure_threshold=1, reset_timeout=60)
+    scheduler.submit(lambda: None, is_failure=lambda result: True)
+    cache = ResponseCache(path=tmp_path / "cache.sqlite", ttl_seconds=0)
+    cache.put("https://pokeapi.co/api/v2/move/33/", b'{"name": "tackle"}')
+    monkeypatch.setattr(DataExtractor, "cache", cache)
+    monkeypatch.setattr(DataExtractor, "scheduler", scheduler)
+    monkeypatch.setattr(DataExtractor, "in_flight", SingleFlight())
+
+    with patch.object(DataExtractor.http_client.session, 'get') as mock_get:
+        assert DataExtractor.extract_from_url("https://pokeapi.co/api/v2/move/33/") == {"name": "tackle"}
+    mock_get.assert_not_called()
+    assert scheduler.stats()["short_circuited"] == 1
+
+def test_older_request_cannot_settle_the_half_open_trial():
+    scheduler = RequestScheduler(failure_threshold=1, reset_timeout=0.05)
+    old_release, probe_release = threading.Event(), threading.Event()
+    old = threading.Thread(target=scheduler.submit, args=(lambda: old_release.wait(1) and 200,))
+    old.start()
+    while scheduler.stats()["tool_call"]["submitted"] < 1:
+        time.sleep(0.001)
+    scheduler.submit(lambda: 503, is_failure=lambda status: status >= 500)
+    time.sleep(0.06)
+    probe = threading.Thread(target=scheduler.submit, args=(lambda: probe_release.wait(1) and 200,))
+    probe.start()
+    while not scheduler._trial_in_flight:
+        time.sleep(0.001)
+
+    # The request admitted before the circuit opened succeeds while the probe is still out
+    old_release.set()
+    old.join()
+    assert scheduler.circuit_state == "half-open"
+    with pytest.raises(CircuitOpenError):
+        scheduler.submit(lambda: 200)
+
+    probe_release.set()
+    probe.join()
+    assert scheduler.circuit_state == "closed"
+
+def test_request_that_never_ran_does_not_release_the_trial():
+    scheduler = RequestScheduler(failure_threshold=1, reset_timeout=0.01)
+    scheduler.submit(lambda: 503, is_failure=lambda status: status >= 500)
+    time.sleep(0.02)
+    assert scheduler._enter_circuit() is True
+    # e.g. an older request that timed out waiting for a token
+    scheduler._leave_circuit(success=None, trial=False)
+    with pytest.raises(CircuitOpenError):
+        scheduler.submit(lambda: 200)
+    scheduler._leave_circuit(success=False, trial=True)
+    assert scheduler.circuit_state == "open"
+
+@patch('src.data_extraction.http_client.time.sleep')
+def test_every_retry_takes_a_token_and_throttling_counts_as_failure(mock_sleep, monkeypatch):
+    scheduler = RequestScheduler(failure_threshold=2, reset_timeout=60)
+    client = HttpClient(max_retries=3)
+    throttled = MagicMock(status_code=429, headers={})
+    monkeypatch.setattr(DataExtractor, "http_client", client)
+    monkeypatch.setattr(DataExtractor, "scheduler", scheduler)
+    monkeypatch.setattr(DataExtractor, "cache", None)
+    monkeypatch.setattr(DataExtractor, "in_flight", SingleFlight())
+
+    with patch.object(client.session, 'get', return_value=throttled) as mock_get:
+        with pytest.raises(CircuitOpenError):
+            DataExtractor.extract_from_url("https://pokeapi.co/api/v2/move/33/")
+    # Two throttled attempts open the circuit, which stops the third before it reaches PokeAPI
+    assert mock_get.call_count == 2
+    assert scheduler.stats()["tool_call"]["submitted"] == 2
+    assert scheduler.circuit_state == "open"
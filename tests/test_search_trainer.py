@@ -0,0 +1,58 @@
+from src.battlefield.rng import BattleRNG
+from src.battlefield.battle_engine import BattleEngine
+from src.battlefield.battle_pokemon import BattlePokemon
+from src.battlefield.battle_state import USER, BattleState
+from src.battlefield.damage_calc import damage_distribution
+from src.battlefield.policies import get_policy, greedy_policy, random_policy
+from src.battlefield.search_trainer import SearchTrainer, bucket_damage
+from tests.conftest import make_move, make_pokemon
+
+
+def test_bucket_damage_keeps_mass_and_mean(roster):
+    pikachu, squirtle = BattlePokemon.from_pokemon_class(roster["pikachu"]), BattlePokemon.from_pokemon_class(roster["squirtle"])
+    move = make_move("zap", "electric", "special", power=90, accuracy=70)
+    distribution = damage_distribution(pikachu, squirtle, move)
+    outcomes = bucket_damage(distribution, 3)
+
+    assert len(outcomes) == 4 and outcomes[0][0] == 0
+    assert abs(sum(p for _, p in outcomes) - 1) < 1e-9
+    assert abs(sum(d * p for d, p in outcomes) - distribution.mean) < 1e-9
+
+def test_search_prefers_a_sure_knockout_over_higher_expected_damage(roster):
+    sniper = make_pokemon("sniper", ["normal"], (50, 80, 50, 50, 50, 100), [
+        make_move("hyper blast", "normal", power=150, accuracy=50),
+        make_move("tap", "normal", power=20),
+    ])
+    attacker = BattlePokemon.from_pokemon_class(sniper)
+    defender = BattlePokemon.from_pokemon_class(roster["squirtle"])
+    defender.current_hp = 5
+
+    assert greedy_policy(attacker, defender, BattleRNG(0)).name == "hyper blast"
+    assert SearchTrainer()(attacker, defender, BattleRNG(0)).name == "tap"
+
+def test_search_respects_its_budget(roster):
+    state = BattleState.from_battle_pokemon(
+        BattlePokemon.from_pokemon_class(roster["squirtle"]), BattlePokemon.from_pokemon_class(roster["squirtle"])
+    )
+    trainer = SearchTrainer(time_budget=10, max_nodes=200)
+    trainer.choose(state, USER)
+
+    assert trainer.last_search["depth"] >= 1
+    assert trainer.last_search["nodes"] <= 201 or trainer.last_search["depth"] == 1
+    fast = SearchTrainer(time_budget=0.005)
+    fast.choose(state, USER)
+    assert fast.last_search["elapsed"] < 0.05
+
+def test_search_trainer_as_opponent_beats_random_play(roster):
+    wins = 0
+    for seed in range(20):
+        battle = BattleEngine(roster["squirtle"], roster["squirtle"], policy=random_policy,
+                              foe_policy=get_policy("search"), seed=seed, max_rounds=50)
+        battle.start_ai_battle()
+        wins += battle.winner is battle.foe_pokemon
+    assert wins >= 16
+
+def test_named_search_policy_is_built_fresh_for_every_caller():
+    first, second = get_policy("search"), get_policy("search")
+    assert isinstance(first, SearchTrainer) and isinstance(second, SearchTrainer)
+    assert first is not second
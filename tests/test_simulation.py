@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from src.battlefield.battle_engine import BattleEngine
+from src.battlefield.battle_pokemon import BattlePokemon
+from src.battlefield.rng import BattleRNG
+from src.battlefield.policies import expected_damage, get_policy, greedy_policy, policy_names
+from src.battlefield.simulation import run_batch
+from src.battlefield.vectorized import VectorizedBattle, run_vectorized
+
+
+def test_greedy_policy_picks_highest_expected_damage(roster):
+    pikachu = BattlePokemon.from_pokemon_class(roster["pikachu"])
+    squirtle = BattlePokemon.from_pokemon_class(roster["squirtle"])
+
+    assert greedy_policy(pikachu, squirtle, BattleRNG(0)).name == "thunderbolt"
+    assert expected_damage(pikachu, squirtle, pikachu.moves[2]) == 0
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        get_policy("clairvoyant")
+
+def test_engine_requires_llm_or_policy(roster):
+    with pytest.raises(ValueError):
+        BattleEngine(roster["pikachu"], roster["squirtle"])
+
+def test_run_batch_in_process_is_reproducible(roster):
+    kwargs = dict(policy="greedy", battles_per_matchup=30, n_workers=1, seed=7, roster=roster, chunk_size=10)
+    first = run_batch([("pikachu", "squirtle")], **kwargs)[("pikachu", "squirtle")]
+    second = run_batch([("pikachu", "squirtle")], **kwargs)[("pikachu", "squirtle")]
+
+    assert first.battles == 30
+    assert first.user_wins + first.foe_wins + first.draws == 30
+    assert first.summary() == second.summary()
+    assert first.user_hp_curve[0] == 1.0
+    assert len(first.user_hp_curve) == max(first.rounds) + 1
+    # The roster itself is never mutated by the battles
+    assert roster["pikachu"].name == "pikachu"
+
+def test_run_batch_accepts_every_registered_policy(roster):
+    for policy in policy_names():
+        result = run_batch([("pikachu", "squirtle")], policy=policy, battles_per_matchup=2, n_workers=1, seed=0,
+                           roster=roster)[("pikachu", "squirtle")]
+        assert result.battles == 2
+
+def test_run_batch_over_process_pool_matches_in_process(roster):
+    matchups = [("pikachu", "squirtle"), ("squirtle", "squirtle")]
+    kwargs = dict(policy="random", battles_per_matchup=20, seed=3, roster=roster, chunk_size=10)
+    pooled = run_batch(matchups, n_workers=2, **kwargs)
+    local = run_batch(matchups, n_workers=1, **kwargs)
+
+    assert set(pooled) == set(matchups)
+    for matchup in matchups:
+        assert pooled[matchup].summary() == local[matchup].summary()
+
+def test_run_batch_requires_known_pokemon(roster):
+    with pytest.raises(ValueError):
+        run_batch([("pikachu", "mew")], roster=roster, n_workers=1)
+
+@pytest.mark.parametrize("policy", ["random", "greedy"])
+@pytest.mark.parametrize("matchup", [("pikachu", "squirtle"), ("squirtle", "squirtle")])
+def test_vectorized_engine_matches_battle_engine_statistically(roster, policy, matchup):
+    scalar = run_batch([matchup], policy=policy, battles_per_matchup=600, n_workers=1, seed=11, roster=roster)[matchup]
+    vectorized = run_vectorized(roster[matchup[0]], roster[matchup[1]], 6000, policy=policy, seed=11)
+
+    # Binomial standard error of the scalar estimate, with a generous 4-sigma band
+    tolerance = 4 * np.sqrt(max(scalar.user_win_rate * (1 - scalar.user_win_rate), 0.01) / scalar.battles)
+    assert abs(vectorized.user_win_rate - scalar.user_win_rate) < tolerance
+    assert abs(vectorized.mean_rounds - scalar.mean_rounds) < 4 * np.std(scalar.rounds) / np.sqrt(scalar.battles) + 0.05
+    assert np.allclose(vectorized.user_hp_curve[:3], scalar.user_hp_curve[:3], atol=0.05)
+
+def test_vectorized_battles_handle_mixed_matchups_and_draws(roster):
+    battle = VectorizedBattle(
+        [roster["pikachu"], roster["squirtle"]], [roster["squirtle"], roster["squirtle"]], max_rounds=1, seed=0,
+    ).run()
+
+    # Every battle stops after the first round, either won or drawn at the cap
+    assert battle.rounds.tolist() == [1, 1]
+    assert battle.hp_curves().shape == (2, 2, 2)
+    assert (battle.hp_curves()[:, 0] == 1).all()
+
+def test_run_batch_with_vectorized_engine(roster):
+    result = run_batch([("pikachu", "squirtle")], policy="greedy", battles_per_matchup=500, n_workers=1, seed=5,
+                       roster=roster, engine="vectorized")[("pikachu", "squirtle")]
+    assert result.battles == 500
+    assert result.user_win_rate > 0.9
+    with pytest.raises(ValueError):
+        run_batch([("pikachu", "squirtle")], policy=greedy_policy, roster=roster, engine="vectorized")
@@ -1,15 +1,38 @@
 # Battle execution logic
 
+import os
 import streamlit as st
 import logging
 from io import StringIO
 
 from src.pokemon.pokemon import Pokemon
 from src.battlefield.battle_pokemon import BattlePokemon
+from src.data_extractor import DataExtractor
+from src.data_extraction.cache import ResponseCache
+from src.data_extraction.learnset import LearnsetIndex
+from src.data_extraction.scheduler import RequestScheduler
 from src.tools.tools import get_pokemon_attributes, return_loaded_pokemon_data
 from src.battlefield.battle_engine import BattleEngine
+from src.battlefield.decision_cache import DecisionCache
+from src.battlefield.hedging import LatencyTracker
+from src.battlefield.policies import greedy_policy
 from langchain.chat_models import init_chat_model
 
+# PokeAPI data barely changes, so battle loads are served from disk after the first download
+DataExtractor.cache = ResponseCache()
+DataExtractor.learnset_index = LearnsetIndex()
+DataExtractor.scheduler = RequestScheduler()
+# Rematches put the LLM in the same situations again; those decisions are reused across battles, and across
+# restarts too when POKEMON_PERSIST_DECISIONS=1
+PERSIST_DECISIONS = os.environ.get("POKEMON_PERSIST_DECISIONS", "0") == "1"
+decision_cache = DecisionCache(persistent=PERSIST_DECISIONS)
+# A slow completion must not stall the battle: each decision gets a deadline, slow calls are hedged with a
+# fallback model (if configured) and, when nothing answers in time, the greedy policy picks the move
+LLM_TIMEOUT = float(os.environ.get("POKEMON_LLM_TIMEOUT", "20"))
+FALLBACK_LLM_MODEL = os.environ.get("POKEMON_FALLBACK_LLM_MODEL")
+# Shared across battles so the hedge delay tracks the p95 latency of the primary model
+llm_latency = LatencyTracker()
+
 def run_battle(user_pokemon_name, foe_pokemon_name, llm_model):
     """Execute the battle between two Pokémon."""
     st.session_state.battle_in_progress = True
@@ -93,6 +116,7 @@ def run_pokemon_battle(user_pokemon: BattlePokemon, foe_pokemon: BattlePokemon,
     with st.spinner("Initializing LLM..."):
         try:
             llm = init_chat_model(model=llm_model)
+            fallback_llm = init_chat_model(model=FALLBACK_LLM_MODEL) if FALLBACK_LLM_MODEL else None
         except Exception as e:
             st.error(f"❌ Error initializing LLM: {str(e)}")
             st.session_state.battle_in_progress = False
@@ -114,7 +138,12 @@ def run_pokemon_battle(user_pokemon: BattlePokemon, foe_pokemon: BattlePokemon,
             battle_engine = BattleEngine(
                 user_pokemon=user_pokemon,
                 foe_pokemon=foe_pokemon,
-                llm=llm
+                llm=llm,
+                decision_cache=decision_cache,
+                llm_timeout=LLM_TIMEOUT,
+                fallback_llm=fallback_llm,
+                fallback_policy=greedy_policy,
+                latency_tracker=llm_latency,
             )
             battle_engine.start_ai_battle()
             # Store Pokemon in session